@@ -0,0 +1,89 @@
+from collections import namedtuple
+
+CHUNK_SIZE = 65536
+ON_TIME_DAYS = 3
+PERCENTILES = (0.50, 0.90, 0.99)
+
+LeadTimes = namedtuple('LeadTimes', ['supplier_id', 'name', 'shipments', 'mean', 'p50', 'p90', 'p99', 'on_time_rate'])
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("Lead-time analytics need NumPy, install it with 'pip install numpy'.")
+    return numpy
+
+
+def load_lead_times(conn, since=None, until=None, chunk_size=CHUNK_SIZE):
+    """Load (supplier_ids, lead_days) NumPy arrays for shipments with both dates.
+
+    Rows are read in keyset-paged chunks straight into preallocated arrays,
+    so memory stays at two numbers per shipment.
+    """
+    np = _numpy()
+    # Migration 6 keeps dates it could not parse; julianday() is NULL for them
+    where = ("supplier_id IS NOT NULL AND julianday(dispatch_date) IS NOT NULL "
+             "AND julianday(arrival_date) IS NOT NULL AND dispatch_date BETWEEN ? AND ?")
+    bounds = (since or '', until or '9999-12-31')
+    total = conn.execute(f"SELECT COUNT(*) FROM logistics WHERE {where}", bounds).fetchone()[0]
+    suppliers = np.empty(total, dtype=np.int64)
+    leads = np.empty(total, dtype=np.float64)
+    query = (f"SELECT id, supplier_id, julianday(arrival_date) - julianday(dispatch_date) FROM logistics "
+             f"WHERE {where} AND id > ? ORDER BY id LIMIT ?")
+    filled = 0
+    last_id = 0
+    while filled < total:
+        chunk = conn.execute(query, bounds + (last_id, chunk_size)).fetchall()
+        if not chunk:
+            break
+        block = np.array(chunk, dtype=np.float64)
+        end = min(filled + len(block), total)
+        suppliers[filled:end] = block[:end - filled, 1]
+        leads[filled:end] = block[:end - filled, 2]
+        filled = end
+        last_id = int(block[-1, 0])
+    return suppliers[:filled], leads[:filled]
+
+
+def aggregate_lead_times(suppliers, leads, on_time_days=ON_TIME_DAYS):
+    """Vectorized per-supplier count, mean, percentiles and on-time rate.
+
+    Returns a dict of NumPy arrays keyed by 'supplier_id', 'shipments',
+    'mean', 'p50', 'p90', 'p99' and 'on_time_rate'.
+    """
+    np = _numpy()
+    if len(leads) == 0:
+        empty = np.empty(0)
+        return {key: empty for key in ('supplier_id', 'shipments', 'mean', 'p50', 'p90', 'p99', 'on_time_rate')}
+    # Sort by supplier, then lead time, so every group is a sorted slice
+    order = np.lexsort((leads, suppliers))
+    suppliers = suppliers[order]
+    leads = leads[order]
+    ids, starts, counts = np.unique(suppliers, return_index=True, return_counts=True)
+    result = {
+        'supplier_id': ids,
+        'shipments': counts,
+        'mean': np.add.reduceat(leads, starts) / counts,
+        'on_time_rate': np.add.reduceat((leads <= on_time_days).astype(np.float64), starts) / counts,
+    }
+    for q in PERCENTILES:
+        # Linear interpolation between the closest ranks, as numpy.percentile does
+        position = q * (counts - 1)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        lower = leads[starts + low]
+        result[f"p{int(q * 100)}"] = lower + (leads[starts + high] - lower) * (position - low)
+    return result
+
+
+def supplier_lead_times(conn, on_time_days=ON_TIME_DAYS, since=None, until=None):
+    """Return LeadTimes per supplier for shipments dispatched between since and until"""
+    suppliers, leads = load_lead_times(conn, since, until)
+    stats = aggregate_lead_times(suppliers, leads, on_time_days)
+    names = dict(conn.execute("SELECT id, name FROM suppliers"))
+    return [
+        LeadTimes(int(supplier_id), names.get(int(supplier_id)), int(stats['shipments'][i]), float(stats['mean'][i]),
+                  float(stats['p50'][i]), float(stats['p90'][i]), float(stats['p99'][i]), float(stats['on_time_rate'][i]))
+        for i, supplier_id in enumerate(stats['supplier_id'])
+    ]
@@ -0,0 +1,361 @@
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+from database import enable_lookup_cache, get_connection, get_read_connection, transaction
+from items import add_item, delete_item, get_item, iter_price_history, list_items, price_as_of, search_items, update_item
+from logistics import (delete_logistics, get_logistics, list_logistics, list_logistics_arriving_between, record_logistics,
+                       search_logistics, update_logistics)
+from orders import create_order, delete_order, get_order, list_orders, list_orders_between, search_orders, update_order
+from suppliers import add_supplier, delete_supplier, get_supplier, list_suppliers, search_suppliers, update_supplier
+
+# A small HTTP/1.1 JSON service over the domain modules for local clients
+# such as POS terminals. Reads run on a pool of threads, each with its own
+# read-only connection; every write runs on one writer thread owning the only
+# read-write connection, so writes are serialized in process and never wait
+# on each other's locks. The event loop only parses requests and waits.
+
+HOST = '127.0.0.1'
+PORT = 8080
+READERS = 4                 # threads serving reads, one read-only connection each
+MAX_BODY = 1 << 20          # largest request body accepted, in bytes
+METRICS_WINDOW = 1024       # latest requests per route kept for latency percentiles
+
+_local = threading.local()
+
+
+class HTTPError(Exception):
+    """Error answered with an HTTP status and a JSON message"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class RequestMetrics:
+    """Request counts, errors and latency percentiles per route"""
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.window = window
+        self.routes = {}
+
+    def record(self, route, elapsed, status):
+        entry = self.routes.get(route)
+        if entry is None:
+            entry = self.routes[route] = {'count': 0, 'errors': 0, 'total': 0.0,
+                                          'latencies': deque(maxlen=self.window)}
+        entry['count'] += 1
+        entry['errors'] += status >= 400
+        entry['total'] += elapsed
+        entry['latencies'].append(elapsed)
+
+    def report(self):
+        """Return {route: stats} with latencies in milliseconds over the recent window"""
+        report = {}
+        for route, entry in sorted(self.routes.items()):
+            latencies = sorted(entry['latencies'])
+            def percentile(q):
+                return round(latencies[int(q * (len(latencies) - 1))] * 1000, 3)
+            report[route] = {
+                'count': entry['count'],
+                'errors': entry['errors'],
+                'mean_ms': round(entry['total'] / entry['count'] * 1000, 3),
+                'p50_ms': percentile(0.5),
+                'p95_ms': percentile(0.95),
+                'p99_ms': percentile(0.99),
+                'max_ms': round(latencies[-1] * 1000, 3),
+            }
+        return report
+
+
+def _int(params, name, default=None):
+    value = params.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Query parameter '{name}' must be an integer.")
+
+
+def _fields(body, required, optional=()):
+    """Return the values of the named fields of a JSON body, raising ValueError for missing ones"""
+    missing = [name for name in required if body.get(name) is None]
+    if missing:
+        raise ValueError(f"Missing field {', '.join(repr(name) for name in missing)}.")
+    return [body[name] for name in required] + [body.get(name) for name in optional]
+
+
+def _rows(rows):
+    return [row._asdict() for row in rows]
+
+
+def _found(updated, noun, row_id):
+    if not updated:
+        raise HTTPError(404, f"No {noun} with ID '{row_id}'.")
+    return {'id': row_id}
+
+
+def _listing(list_rows):
+    return lambda conn, params, body: _rows(list_rows(conn, _int(params, 'after_id', 0), _int(params, 'limit')))
+
+
+def _search(search_rows, fuzzy=False):
+    def handler(conn, params, body):
+        if not params.get('q'):
+            raise ValueError("Query parameter 'q' is required.")
+        if fuzzy and params.get('fuzzy') in ('1', 'true'):
+            return _rows(search_rows(conn, params['q'], _int(params, 'limit'), fuzzy=True))
+        return _rows(search_rows(conn, params['q'], _int(params, 'limit')))
+    return handler
+
+
+def _between(list_rows, list_between):
+    def handler(conn, params, body):
+        if params.get('start') or params.get('end'):
+            if not (params.get('start') and params.get('end')):
+                raise ValueError("Query parameters 'start' and 'end' go together.")
+            return _rows(list_between(conn, params.get('start'), params.get('end'), _int(params, 'limit')))
+        return _rows(list_rows(conn, _int(params, 'after_id', 0), _int(params, 'limit')))
+    return handler
+
+
+def _get(get_row, noun):
+    def handler(conn, params, body, row_id):
+        row = get_row(conn, row_id)
+        if row is None:
+            raise HTTPError(404, f"No {noun} with ID '{row_id}'.")
+        return row._asdict()
+    return handler
+
+
+def _item_prices(conn, params, body, item_id):
+    if params.get('as_of'):
+        return {'item_id': item_id, 'as_of': params['as_of'], 'price': price_as_of(conn, item_id, params['as_of'])}
+    return _rows(iter_price_history(conn, item_id))
+
+
+def _created(add, required, optional=()):
+    return lambda conn, params, body: (201, {'id': add(conn, *_fields(body, required, optional))})
+
+
+def _replace(update, noun, required, optional=()):
+    def handler(conn, params, body, row_id):
+        return _found(update(conn, row_id, *_fields(body, required, optional)), noun, row_id)
+    return handler
+
+
+def _delete(remove, noun):
+    return lambda conn, params, body, row_id: _found(remove(conn, row_id), noun, row_id)
+
+
+SUPPLIER_FIELDS = (('name',), ('contact_name', 'contact_phone', 'address'))
+ITEM_FIELDS = (('name',), ('price', 'supplier_id'))
+ORDER_FIELDS = (('customer_name',), ('order_date', 'total_amount', 'supplier_id'))
+LOGISTICS_FIELDS = (('order_id',), ('supplier_id', 'dispatch_date', 'arrival_date', 'status'))
+
+# (method, path, 'read' or 'write', handler). {id} matches a row ID passed to
+# the handler after (conn, params, body); a handler returns the JSON payload
+# or (status, payload).
+ROUTES = [
+    ('GET', '/suppliers', 'read', _listing(list_suppliers)),
+    ('GET', '/suppliers/{id}', 'read', _get(get_supplier, 'supplier')),
+    ('GET', '/suppliers/search', 'read', _search(search_suppliers, fuzzy=True)),
+    ('POST', '/suppliers', 'write', _created(add_supplier, *SUPPLIER_FIELDS)),
+    ('PUT', '/suppliers/{id}', 'write', _replace(update_supplier, 'supplier', *SUPPLIER_FIELDS)),
+    ('DELETE', '/suppliers/{id}', 'write',
+     lambda conn, params, body, row_id: _found(delete_supplier(conn, row_id, params.get('policy', 'block')),
+                                               'supplier', row_id)),
+    ('GET', '/items', 'read', _listing(list_items)),
+    ('GET', '/items/{id}', 'read', _get(get_item, 'item')),
+    ('GET', '/items/search', 'read', _search(search_items, fuzzy=True)),
+    ('GET', '/items/{id}/prices', 'read', _item_prices),
+    ('POST', '/items', 'write', _created(add_item, *ITEM_FIELDS)),
+    ('PUT', '/items/{id}', 'write', _replace(update_item, 'item', *ITEM_FIELDS)),
+    ('DELETE', '/items/{id}', 'write', _delete(delete_item, 'item')),
+    ('GET', '/orders', 'read', _between(list_orders, list_orders_between)),
+    ('GET', '/orders/{id}', 'read', _get(get_order, 'order')),
+    ('GET', '/orders/search', 'read', _search(search_orders)),
+    ('POST', '/orders', 'write', _created(create_order, *ORDER_FIELDS)),
+    ('PUT', '/orders/{id}', 'write', _replace(update_order, 'order', ('status',))),
+    ('DELETE', '/orders/{id}', 'write', _delete(delete_order, 'order')),
+    ('GET', '/logistics', 'read', _between(list_logistics, list_logistics_arriving_between)),
+    ('GET', '/logistics/{id}', 'read', _get(get_logistics, 'logistics entry')),
+    ('GET', '/logistics/search', 'read', _search(search_logistics)),
+    ('POST', '/logistics', 'write', _created(record_logistics, *LOGISTICS_FIELDS)),
+    ('PUT', '/logistics/{id}', 'write', _replace(update_logistics, 'logistics entry', ('status',))),
+    ('DELETE', '/logistics/{id}', 'write', _delete(delete_logistics, 'logistics entry')),
+]
+
+_STATUS_TEXT = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                409: 'Conflict', 413: 'Payload Too Large', 431: 'Request Header Fields Too Large',
+                500: 'Internal Server Error'}
+
+
+class APIServer:
+    """HTTP JSON API over one database, see ROUTES"""
+
+    def __init__(self, db_file, readers=READERS):
+        self.db_file = db_file
+        self.metrics = RequestMetrics()
+        self._caches = []
+        self.routes = [(method, re.compile('^' + path.replace('{id}', r'(\d+)') + '$'), path, kind, handler)
+                       for method, path, kind, handler in ROUTES]
+        self._readers = ThreadPoolExecutor(readers, thread_name_prefix='api-read',
+                                           initializer=self._open, initargs=(get_read_connection,))
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix='api-write',
+                                          initializer=self._open, initargs=(get_connection,))
+
+    def _open(self, connect):
+        _local.conn = connect(self.db_file)
+        if connect is get_read_connection:
+            # Repeated lookups by ID skip sqlite until the database changes
+            self._caches.append(enable_lookup_cache(_local.conn))
+
+    def cache_stats(self):
+        """Return the lookup cache counters summed over the reader connections"""
+        caches = list(self._caches)
+        return {'hits': sum(cache.hits for cache in caches), 'misses': sum(cache.misses for cache in caches),
+                'invalidations': sum(cache.invalidations for cache in caches),
+                'entries': sum(len(cache) for cache in caches)}
+
+    @staticmethod
+    def _read(handler, *args):
+        return handler(_local.conn, *args)
+
+    @staticmethod
+    def _write(handler, *args):
+        with transaction(_local.conn) as conn:
+            return handler(conn, *args)
+
+    def close(self):
+        """Finish running requests and stop the reader and writer threads"""
+        self._readers.shutdown()
+        self._writer.shutdown()
+
+    async def handle(self, method, target, body=b''):
+        """Answer one request and return (status, payload)"""
+        url = urlsplit(target)
+        if method == 'GET' and url.path == '/metrics':
+            return 200, {'routes': self.metrics.report(), 'lookup_cache': self.cache_stats()}
+        if method == 'GET' and url.path == '/health':
+            return 200, {'status': 'ok'}
+        started = time.perf_counter()
+        # Requests matching no route share one entry, keeping the metrics bounded
+        route = 'unmatched'
+        try:
+            path, kind, handler, ids = self._match(method, url.path)
+            route = f"{method} {path}"
+            params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            if method in ('POST', 'PUT'):
+                try:
+                    body = json.loads(body or b'{}')
+                except ValueError:
+                    raise HTTPError(400, "Request body is not valid JSON.")
+                if not isinstance(body, dict):
+                    raise HTTPError(400, "Request body must be a JSON object.")
+            executor, run = (self._readers, self._read) if kind == 'read' else (self._writer, self._write)
+            result = await asyncio.get_running_loop().run_in_executor(executor, run, handler, params, body, *ids)
+            status, payload = result if isinstance(result, tuple) else (200, result)
+        except HTTPError as e:
+            status, payload = e.status, {'error': str(e)}
+        except ValueError as e:
+            status, payload = 400, {'error': str(e)}
+        except sqlite3.IntegrityError as e:
+            status, payload = 409, {'error': f"Integrity Error: {e}"}
+        except sqlite3.Error as e:
+            status, payload = 500, {'error': f"Database Error: {e}"}
+        except Exception as e:
+            status, payload = 500, {'error': f"Error: {e}"}
+        self.metrics.record(route, time.perf_counter() - started, status)
+        return status, payload
+
+    def _match(self, method, path):
+        """Return (route path, kind, handler, row IDs) of the route for a request"""
+        allowed = False
+        for route_method, pattern, route_path, kind, handler in self.routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            if route_method == method:
+                return route_path, kind, handler, tuple(int(group) for group in match.groups())
+            allowed = True
+        if allowed:
+            raise HTTPError(405, f"Method {method} not allowed on {path}.")
+        raise HTTPError(404, f"No route for {path}.")
+
+    async def _client(self, reader, writer):
+        # One HTTP/1.1 connection; requests are answered in order and kept alive
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                    if not request_line.strip():
+                        break
+                    headers = {}
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                except ValueError:
+                    # A line longer than the stream limit
+                    await self._respond(writer, 431, {'error': "Request line or header too long."}, False)
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "Malformed request line."}, False)
+                    break
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.upper() == 'HTTP/1.1')
+                length = headers.get('content-length') or '0'
+                if not (length.isascii() and length.isdigit()):
+                    await self._respond(writer, 400, {'error': "Malformed Content-Length."}, False)
+                    break
+                length = int(length)
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {'error': "Request body too large."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self.handle(method.upper(), target, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload, default=str).encode()
+        writer.write(f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def serve(self, host=HOST, port=PORT, ready=None):
+        """Serve until cancelled; ready(server) is called once listening"""
+        server = await asyncio.start_server(self._client, host, port)
+        if ready:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+
+def serve(db_file, host=HOST, port=PORT, readers=READERS, ready=None):
+    """Run the API on host:port until interrupted"""
+    api = APIServer(db_file, readers)
+    try:
+        asyncio.run(api.serve(host, port, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.close()
@@ -0,0 +1,124 @@
+import os
+import sqlite3
+import time
+from collections import namedtuple
+from datetime import datetime
+from database import clear_lookup_cache, get_read_connection
+from migrations import SCHEMA_VERSION, get_schema_version, migrate
+
+# Online backups copy a bounded number of pages per step and pause between
+# steps, so clerks keep reading and writing while a backup runs. The copy is
+# taken from one read snapshot: WAL readers never block writers, and the
+# backup does not restart when other connections commit meanwhile.
+
+BACKUP_PAGES = 256          # pages copied per step
+BACKUP_PAUSE = 0.005        # seconds slept between steps
+
+BackupResult = namedtuple('BackupResult', ['pages', 'bytes', 'seconds'])
+
+
+def backup_path(pattern, now=None):
+    """Fill in {timestamp} in a backup file name, for scheduled backups"""
+    return pattern.replace('{timestamp}', (now or datetime.now()).strftime('%Y%m%d-%H%M%S'))
+
+
+def _copy(source, target, pages, pause, progress):
+    """Copy source into target with the backup API and return a BackupResult"""
+    copied = []
+    def step(status, remaining, total):
+        copied[:] = [total]
+        if progress:
+            progress(total - remaining, total)
+        if remaining and pause:
+            time.sleep(pause)
+    started = time.perf_counter()
+    source.backup(target, pages=pages, progress=step)
+    page_size = source.execute("PRAGMA page_size").fetchone()[0]
+    total = copied[0] if copied else 0
+    return BackupResult(total, total * page_size, time.perf_counter() - started)
+
+
+def backup_database(conn, target, pages=BACKUP_PAGES, pause=BACKUP_PAUSE, progress=None, verify=True):
+    """Copy the database of conn to the file target while it stays in use.
+
+    progress(copied, total) is called after every step. The copy is written
+    next to target and moved into place only once complete (and verified), so
+    target is never left half written. Raises ValueError if it fails
+    verification; orphaned rows of the source are copied as they are.
+    """
+    partial = f"{target}.partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+    destination = sqlite3.connect(partial)
+    started = not conn.in_transaction
+    try:
+        if started:
+            # Hold one read snapshot for the whole copy
+            conn.execute("BEGIN")
+            conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        result = _copy(conn, destination, pages, pause, progress)
+        # A single self-contained file, without -wal and -shm companions
+        destination.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        if started:
+            conn.rollback()
+        destination.close()
+    problems = verify_database(partial) if verify else []
+    if problems:
+        os.remove(partial)
+        raise ValueError(f"Backup failed verification: {'; '.join(problems)}")
+    os.replace(partial, target)
+    return result
+
+
+def verify_database(db_file):
+    """Check a database file and return a list of problems, empty if it is sound.
+
+    Rows whose parent is missing are not problems here, a backup copies them
+    faithfully; see foreign_key_orphans.
+    """
+    try:
+        conn = get_read_connection(db_file)
+    except sqlite3.Error as e:
+        return [str(e)]
+    try:
+        problems = [row[0] for row in conn.execute("PRAGMA integrity_check") if row[0] != 'ok']
+        version = get_schema_version(conn)
+        if version > SCHEMA_VERSION:
+            problems.append(f"Schema version {version} is newer than this program ({SCHEMA_VERSION})")
+        return problems
+    except sqlite3.DatabaseError as e:
+        return [str(e)]
+    finally:
+        conn.close()
+
+
+def foreign_key_orphans(db_file):
+    """Return warnings for rows of a database file that refer to a missing parent row"""
+    conn = get_read_connection(db_file)
+    try:
+        return [f"Row {row_id} of {table} refers to a missing row of {parent}"
+                for table, row_id, parent, _ in conn.execute("PRAGMA foreign_key_check")]
+    finally:
+        conn.close()
+
+
+def restore_database(conn, backup_file, progress=None):
+    """Replace the database of conn with a verified backup and migrate it to the current schema.
+
+    The restore runs in a single step, so other connections wait for it
+    briefly instead of seeing a half restored database. Raises ValueError if
+    the backup fails verification.
+    """
+    problems = verify_database(backup_file)
+    if problems:
+        raise ValueError(f"Backup {backup_file} failed verification: {'; '.join(problems)}")
+    source = get_read_connection(backup_file)
+    try:
+        result = _copy(source, conn, -1, 0, progress)
+    finally:
+        source.close()
+    # Neither data_version nor total_changes moves when the file is swapped under conn
+    clear_lookup_cache(conn)
+    migrate(conn)
+    return result
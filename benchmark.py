@@ -0,0 +1,198 @@
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import click
+from database import WriteBehindQueue, initialize_database, get_connection
+from datagen import populate
+from suppliers import add_supplier, update_supplier, list_suppliers, search_suppliers, delete_supplier
+from orders import create_order, update_order, list_orders, search_orders, delete_order
+from logistics import record_logistics, update_logistics, list_logistics, search_logistics, delete_logistics
+from items import add_item, update_item, list_items, search_items, delete_item
+
+DEFAULT_SCALES = (1000, 10000, 100000)
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.25
+LIST_PAGE = 100
+WRITE_BURST = 100
+CLI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cli.py')
+
+def _bench_delete_supplier(conn, rng, counts):
+    supplier_id = add_supplier(conn, "Bench Supplier", "Bench Contact", "000-000-0000", "1 Bench Street")
+    return lambda: delete_supplier(conn, supplier_id)
+
+def _bench_delete_item(conn, rng, counts):
+    item_id = add_item(conn, "Bench Item", 10.0, 1)
+    return lambda: delete_item(conn, item_id)
+
+def _bench_delete_order(conn, rng, counts):
+    order_id = create_order(conn, "Bench Customer", "2024-06-15", 100.0, 1)
+    return lambda: delete_order(conn, order_id)
+
+def _bench_delete_logistics(conn, rng, counts):
+    logistics_id = record_logistics(conn, 1, 1, "2024-06-16", "2024-06-18", "Pending")
+    return lambda: delete_logistics(conn, logistics_id)
+
+def _bench_create_orders_burst(conn, rng, counts):
+    supplier_ids = [rng.randint(1, counts['suppliers']) for _ in range(WRITE_BURST)]
+    def operation():
+        for supplier_id in supplier_ids:
+            create_order(conn, "Bench Customer", "2024-06-15", 100.0, supplier_id)
+    return operation
+
+def _bench_create_orders_write_behind(conn, rng, counts):
+    supplier_ids = [rng.randint(1, counts['suppliers']) for _ in range(WRITE_BURST)]
+    writer = WriteBehindQueue(conn.execute("PRAGMA database_list").fetchone()[2])
+    def operation():
+        futures = [create_order(writer, "Bench Customer", "2024-06-15", 100.0, supplier_id)
+                   for supplier_id in supplier_ids]
+        writer.close()
+        for future in futures:
+            future.result()
+    return operation
+
+def _bench_cli_cold_start(conn, rng, counts):
+    db_file = conn.execute("PRAGMA database_list").fetchone()[2]
+    command = [sys.executable, CLI_PATH, '--quiet', '--db', db_file, 'suppliers', 'list', '--limit', '1']
+    return lambda: subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+
+# Benchmarked operations. Each entry is (name, prepare) where
+# prepare(conn, rng, counts) does any untimed setup and returns the
+# zero-argument callable that is timed.
+OPERATIONS = [
+    ('add_supplier', lambda conn, rng, counts: lambda: add_supplier(
+        conn, "Bench Supplier", "Bench Contact", "000-000-0000", "1 Bench Street")),
+    ('update_supplier', lambda conn, rng, counts: lambda: update_supplier(
+        conn, rng.randint(1, counts['suppliers']), "Bench Supplier", "Bench Contact", "000-000-0000", "1 Bench Street")),
+    ('search_suppliers', lambda conn, rng, counts: lambda: search_suppliers(conn, "premier", LIST_PAGE)),
+    ('list_suppliers', lambda conn, rng, counts: lambda: list_suppliers(conn, limit=LIST_PAGE)),
+    ('list_suppliers_all', lambda conn, rng, counts: lambda: list_suppliers(conn)),
+    ('delete_supplier', _bench_delete_supplier),
+    ('add_item', lambda conn, rng, counts: lambda: add_item(
+        conn, "Bench Item", 10.0, rng.randint(1, counts['suppliers']))),
+    ('update_item', lambda conn, rng, counts: lambda: update_item(
+        conn, rng.randint(1, counts['items']), "Bench Item", 12.0, rng.randint(1, counts['suppliers']))),
+    ('search_items', lambda conn, rng, counts: lambda: search_items(conn, "jameson 750", LIST_PAGE)),
+    ('list_items', lambda conn, rng, counts: lambda: list_items(conn, limit=LIST_PAGE)),
+    ('list_items_all', lambda conn, rng, counts: lambda: list_items(conn)),
+    ('delete_item', _bench_delete_item),
+    ('create_order', lambda conn, rng, counts: lambda: create_order(
+        conn, "Bench Customer", "2024-06-15", 100.0, rng.randint(1, counts['suppliers']))),
+    ('create_orders_burst', _bench_create_orders_burst),
+    ('create_orders_write_behind', _bench_create_orders_write_behind),
+    ('update_order', lambda conn, rng, counts: lambda: update_order(
+        conn, rng.randint(1, counts['orders']), "Completed")),
+    ('search_orders', lambda conn, rng, counts: lambda: search_orders(conn, "otieno", LIST_PAGE)),
+    ('list_orders', lambda conn, rng, counts: lambda: list_orders(conn, limit=LIST_PAGE)),
+    ('list_orders_all', lambda conn, rng, counts: lambda: list_orders(conn)),
+    ('delete_order', _bench_delete_order),
+    ('record_logistics', lambda conn, rng, counts: lambda: record_logistics(
+        conn, rng.randint(1, counts['orders']), rng.randint(1, counts['suppliers']), "2024-06-16", "2024-06-18", "Pending")),
+    ('update_logistics', lambda conn, rng, counts: lambda: update_logistics(
+        conn, rng.randint(1, counts['logistics']), "Delivered")),
+    ('search_logistics', lambda conn, rng, counts: lambda: search_logistics(conn, "transit", LIST_PAGE)),
+    ('list_logistics', lambda conn, rng, counts: lambda: list_logistics(conn, limit=LIST_PAGE)),
+    ('list_logistics_all', lambda conn, rng, counts: lambda: list_logistics(conn)),
+    ('delete_logistics', _bench_delete_logistics),
+    ('cli_cold_start', _bench_cli_cold_start),
+]
+
+
+def time_operation(prepare, conn, rng, counts, repeat):
+    """Return the wall-clock timings in seconds of repeat runs of an operation"""
+    timings = []
+    for _ in range(repeat):
+        operation = prepare(conn, rng, counts)
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_scale(scale, repeat=DEFAULT_REPEAT, seed=0, operations=None, workdir=None):
+    """Benchmark every operation against a fresh database at one scale point"""
+    selected = [op for op in OPERATIONS if not operations or op[0] in operations]
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        db_file = os.path.join(tmp, 'bench.db')
+        initialize_database(db_file)
+        conn = get_connection(db_file)
+        try:
+            start = time.perf_counter()
+            counts = populate(conn, scale, seed)
+            elapsed = time.perf_counter() - start
+            results = [{'scale': scale, 'operation': 'populate', 'runs': 1, 'median_s': elapsed, 'min_s': elapsed}]
+            rng = random.Random(seed)
+            for name, prepare in selected:
+                timings = time_operation(prepare, conn, rng, counts, repeat)
+                results.append({'scale': scale, 'operation': name, 'runs': repeat,
+                                'median_s': statistics.median(timings), 'min_s': min(timings)})
+        finally:
+            conn.close()
+    return results
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, repeat=DEFAULT_REPEAT, seed=0, operations=None, progress=None):
+    """Run every scale point and return a machine-readable report"""
+    results = []
+    for scale in scales:
+        for result in run_scale(scale, repeat, seed, operations):
+            results.append(result)
+            if progress:
+                progress(result)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Return (operation, scale, baseline_s, current_s) for results slower than baseline by more than tolerance"""
+    reference = {(r['operation'], r['scale']): r['median_s'] for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        key = (result['operation'], result['scale'])
+        if key in reference and result['median_s'] > reference[key] * (1 + tolerance):
+            regressions.append((result['operation'], result['scale'], reference[key], result['median_s']))
+    return regressions
+
+
+@click.command()
+@click.option('--scales', default=','.join(map(str, DEFAULT_SCALES)), show_default=True,
+              help='Comma-separated scale points (number of orders).')
+@click.option('--repeat', default=DEFAULT_REPEAT, show_default=True, type=click.IntRange(min=1), help='Runs per operation.')
+@click.option('--seed', default=0, show_default=True, help='Random seed for the generated data.')
+@click.option('--operation', 'operations', multiple=True, help='Only run these operations (repeatable).')
+@click.option('--output', type=click.Path(dir_okay=False), help='Write the JSON report to this file.')
+@click.option('--baseline', type=click.Path(exists=True, dir_okay=False), help='Report to compare against.')
+@click.option('--tolerance', default=DEFAULT_TOLERANCE, show_default=True, help='Allowed slowdown before a regression is reported.')
+def main(scales, repeat, seed, operations, output, baseline, tolerance):
+    """Benchmark the CRUD, search and list functions at several scale points"""
+    scales = [int(scale) for scale in scales.split(',') if scale]
+    report = run_benchmarks(scales, repeat, seed, operations,
+                            lambda r: click.echo(f"{r['scale']:>10} {r['operation']:<28} {r['median_s'] * 1000:10.3f} ms"))
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if baseline:
+        with open(baseline) as f:
+            regressions = compare(report, json.load(f), tolerance)
+        for operation, scale, before, after in regressions:
+            click.echo(f"REGRESSION {operation} at {scale}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
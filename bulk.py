@@ -0,0 +1,31 @@
+from collections import namedtuple
+from database import iter_query
+from rows import ROW_TYPES, columns
+
+# Rows shown in the preview of a set-based update or delete
+PREVIEW_ROWS = 10
+
+Preview = namedtuple('Preview', ['count', 'rows'])
+
+
+def where_clause(filters):
+    """Build (where, params) ANDing the conditions of the filters whose value is not None.
+
+    filters is a sequence of (condition, value) pairs such as
+    ('supplier_id = ?', 3).
+    """
+    conditions = []
+    params = []
+    for condition, value in filters:
+        if value is None:
+            continue
+        conditions.append(condition)
+        params.append(value)
+    return ' AND '.join(conditions) or '1', tuple(params)
+
+
+def preview(conn, table, where, params=(), limit=PREVIEW_ROWS):
+    """Count the rows of a table matching where and return them with the first few"""
+    count = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params).fetchone()[0]
+    query = f"SELECT {columns(ROW_TYPES[table])} FROM {table} WHERE {where} ORDER BY id LIMIT ?"
+    return Preview(count, list(iter_query(conn, query, params + (limit,), row_type=ROW_TYPES[table])))
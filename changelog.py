@@ -0,0 +1,83 @@
+import json
+from database import execute_query, iter_query, transaction
+from migrations import CHANGELOG_TABLES
+from rows import ROW_TYPES, columns
+
+# Every write to a table in CHANGELOG_TABLES appends (seq, table, row id,
+# operation) to the changelog through triggers. A consumer remembers the last
+# seq it has applied and asks for the changes after it. Only the latest change
+# of each row is exported, together with the row as it is now.
+
+def latest_seq(conn):
+    """Return the last sequence number handed out, 0 if none"""
+    # From sqlite_sequence, as compaction may have removed the newest entry
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changelog'").fetchone()
+    return row[0] if row else 0
+
+def compaction_horizon(conn):
+    """Return the seq up to which deletes were dropped; exports must start at or after it"""
+    row = conn.execute("SELECT value FROM sync_state WHERE name = 'horizon'").fetchone()
+    return row[0] if row else 0
+
+def iter_changes(conn, since=0, limit=None):
+    """Stream (seq, table, row_id, operation, row) for rows changed after since, oldest first.
+
+    row is the current row as a dict, or None for deleted rows. Raises
+    ValueError if deletes after since have been compacted away.
+    """
+    horizon = compaction_horizon(conn)
+    if since < horizon:
+        raise ValueError(f"Changes up to seq {horizon} were compacted, export from seq {horizon} or later.")
+    query = ("SELECT seq, table_name, row_id, operation FROM changelog c WHERE seq > ? "
+             "AND seq = (SELECT MAX(seq) FROM changelog WHERE table_name = c.table_name AND row_id = c.row_id) "
+             "ORDER BY seq LIMIT ?")
+    lookups = {table: f"SELECT {columns(ROW_TYPES[table])} FROM {table} WHERE id = ?" for table in CHANGELOG_TABLES}
+    for seq, table, row_id, operation in iter_query(conn, query, (since, limit if limit else -1)):
+        row = None
+        if operation != 'delete':
+            values = conn.execute(lookups[table], (row_id,)).fetchone()
+            row = ROW_TYPES[table]._make(values)._asdict() if values else None
+        yield seq, table, row_id, operation, row
+
+def export_changes(conn, out, since=0, limit=None):
+    """Write the changes after since to a file as JSONL and return (count, last_seq).
+
+    The export reads one consistent snapshot, so last_seq is safe to use as
+    the next since even while other processes keep writing.
+    """
+    count = 0
+    last_seq = since
+    started = not conn.in_transaction
+    if started:
+        conn.execute("BEGIN")
+    try:
+        for seq, table, row_id, operation, row in iter_changes(conn, since, limit):
+            out.write(json.dumps({'seq': seq, 'table': table, 'id': row_id, 'op': operation, 'row': row}) + '\n')
+            count += 1
+            last_seq = seq
+        if not limit or count < limit:
+            # Later entries were all superseded; skip past them next time
+            last_seq = max(last_seq, latest_seq(conn))
+    finally:
+        if started:
+            conn.rollback()
+    return count, last_seq
+
+def compact_changelog(conn, before_seq, drop_deletes=False):
+    """Delete changelog entries up to before_seq that a later entry of the same row supersedes.
+
+    With drop_deletes the remaining deletes up to before_seq are removed as
+    well, and exports from before that point are refused from then on.
+    Returns the number of entries removed.
+    """
+    with transaction(conn):
+        before_seq = min(before_seq, latest_seq(conn))
+        removed = execute_query(conn, "DELETE FROM changelog WHERE seq <= ? AND seq < (SELECT MAX(seq) FROM changelog l "
+                                      "WHERE l.table_name = changelog.table_name AND l.row_id = changelog.row_id)",
+                                (before_seq,)).rowcount
+        if drop_deletes:
+            removed += execute_query(conn, "DELETE FROM changelog WHERE seq <= ? AND operation = 'delete'",
+                                     (before_seq,)).rowcount
+            execute_query(conn, "INSERT INTO sync_state (name, value) VALUES ('horizon', ?) "
+                                "ON CONFLICT (name) DO UPDATE SET value = MAX(value, excluded.value)", (before_seq,))
+    return removed
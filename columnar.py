@@ -0,0 +1,187 @@
+import json
+import os
+import shutil
+import sys
+import uuid
+from array import array
+from collections import namedtuple
+from datetime import date, datetime, timezone
+from database import FETCH_SIZE, iter_query
+from migrations import get_schema_version
+from rows import ROW_TYPES, columns
+
+# Columnar snapshots write every column of a table to its own file of
+# fixed-width little-endian values, described by manifest.json. Analysts
+# memory-map the files into NumPy arrays, so repeated scans read the page
+# cache directly instead of going through sqlite and Python tuples.
+#
+# Every export goes to a new export-* directory and the manifest is swapped
+# to point at it, so files that readers have mapped are never rewritten.
+#
+#   int    '<i8', NULL as -1 (ids and foreign keys are positive)
+#   float  '<f8', NULL as NaN
+#   date   '<M8[D]' days since 1970-01-01, NULL or unparsable as NaT
+#   text   '<i4' codes into a dictionary in <column>.dict.json, NULL as -1
+
+FORMAT_VERSION = 2
+MANIFEST = 'manifest.json'
+EXPORT_PREFIX = 'export-'
+
+# Column kinds of the exported tables, in row type order
+COLUMNAR_TABLES = {
+    'orders': {'id': 'int', 'customer_name': 'text', 'order_date': 'date', 'total_amount': 'float',
+               'supplier_id': 'int', 'status': 'text'},
+    'logistics': {'id': 'int', 'order_id': 'int', 'supplier_id': 'int', 'dispatch_date': 'date',
+                  'arrival_date': 'date', 'status': 'text'},
+}
+
+_DTYPES = {'int': '<i8', 'float': '<f8', 'date': '<M8[D]', 'text': '<i4'}
+_TYPECODES = {'int': 'q', 'float': 'd', 'date': 'q', 'text': 'i'}
+_NAT = -2 ** 63
+_EPOCH = date(1970, 1, 1).toordinal()
+
+ColumnarTable = namedtuple('ColumnarTable', ['rows', 'columns', 'dictionaries'])
+
+
+def _days(value):
+    try:
+        return date.fromisoformat(value[:10]).toordinal() - _EPOCH
+    except (TypeError, ValueError):
+        return _NAT
+
+
+class _ColumnWriter:
+    """Buffers one column and appends it to its file in fixed-width chunks"""
+
+    def __init__(self, path, kind):
+        self.kind = kind
+        self.file = open(path, 'wb')
+        self.values = array(_TYPECODES[kind])
+        self.codes = {}
+
+    def append(self, value):
+        if self.kind == 'int':
+            self.values.append(-1 if value is None else int(value))
+        elif self.kind == 'float':
+            self.values.append(float('nan') if value is None else float(value))
+        elif self.kind == 'date':
+            self.values.append(_days(value))
+        elif value is None:
+            self.values.append(-1)
+        else:
+            self.values.append(self.codes.setdefault(value, len(self.codes)))
+
+    def flush(self):
+        if sys.byteorder == 'big':
+            self.values.byteswap()
+        self.values.tofile(self.file)
+        del self.values[:]
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def _manifest_export(out_dir):
+    """Return the export directory named by the manifest in out_dir, or None"""
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding='utf-8') as f:
+            return json.load(f).get('export')
+    except (OSError, ValueError):
+        return None
+
+
+def export_columnar(conn, out_dir, tables=tuple(COLUMNAR_TABLES), chunk_size=FETCH_SIZE):
+    """Write tables as column files plus a manifest into out_dir and return {table: rows}.
+
+    All tables come from one read snapshot, written to a new export directory.
+    The manifest is written last and replaced atomically, so a reader never
+    sees a half written snapshot described as complete. The export the old
+    manifest named is kept for readers that just opened it; older ones are
+    removed.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    created = datetime.now(timezone.utc)
+    export = f"{EXPORT_PREFIX}{created:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+    manifest = {'format': FORMAT_VERSION, 'schema_version': get_schema_version(conn),
+                'created_at': created.isoformat(timespec='seconds'), 'export': export, 'tables': {}}
+    started = not conn.in_transaction
+    if started:
+        conn.execute("BEGIN")
+    try:
+        for table in tables:
+            kinds = COLUMNAR_TABLES[table]
+            os.makedirs(os.path.join(out_dir, export, table))
+            writers = [_ColumnWriter(os.path.join(out_dir, export, table, f"{column}.bin"), kind)
+                       for column, kind in kinds.items()]
+            rows = 0
+            try:
+                query = f"SELECT {columns(ROW_TYPES[table])} FROM {table} ORDER BY id"
+                for row in iter_query(conn, query, size=chunk_size):
+                    for writer, value in zip(writers, row):
+                        writer.append(value)
+                    rows += 1
+                    if rows % chunk_size == 0:
+                        for writer in writers:
+                            writer.flush()
+            finally:
+                for writer in writers:
+                    writer.close()
+            specs = {}
+            for (column, kind), writer in zip(kinds.items(), writers):
+                specs[column] = {'kind': kind, 'dtype': _DTYPES[kind], 'file': f"{export}/{table}/{column}.bin"}
+                if kind == 'text':
+                    specs[column]['dictionary'] = f"{export}/{table}/{column}.dict.json"
+                    with open(os.path.join(out_dir, specs[column]['dictionary']), 'w', encoding='utf-8') as f:
+                        json.dump(list(writer.codes), f)
+            manifest['tables'][table] = {'rows': rows, 'columns': specs}
+    except BaseException:
+        shutil.rmtree(os.path.join(out_dir, export), ignore_errors=True)
+        raise
+    finally:
+        if started:
+            conn.rollback()
+    previous = _manifest_export(out_dir)
+    partial = os.path.join(out_dir, f"{MANIFEST}.partial")
+    with open(partial, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(partial, os.path.join(out_dir, MANIFEST))
+    for name in os.listdir(out_dir):
+        if name.startswith(EXPORT_PREFIX) and name not in (export, previous):
+            shutil.rmtree(os.path.join(out_dir, name), ignore_errors=True)
+    return {table: entry['rows'] for table, entry in manifest['tables'].items()}
+
+
+def load_columnar(out_dir, tables=None):
+    """Memory-map an exported snapshot and return {table: ColumnarTable} of read-only NumPy arrays.
+
+    Text columns come back as int32 codes; dictionaries[column][code] is the
+    text. Nothing is copied: pages are read from disk as the arrays are used.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise RuntimeError("Reading columnar snapshots needs NumPy, install it with 'pip install numpy'.")
+    with open(os.path.join(out_dir, MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest['format'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format {manifest['format']}.")
+    loaded = {}
+    for table, entry in manifest['tables'].items():
+        if tables is not None and table not in tables:
+            continue
+        arrays = {}
+        for column, spec in entry['columns'].items():
+            dtype = np.dtype(spec['dtype'])
+            if entry['rows']:
+                arrays[column] = np.memmap(os.path.join(out_dir, spec['file']), dtype=dtype, mode='r',
+                                           shape=(entry['rows'],))
+            else:
+                arrays[column] = np.empty(0, dtype=dtype)
+        dictionaries = {}
+        for column, spec in entry['columns'].items():
+            if 'dictionary' in spec:
+                with open(os.path.join(out_dir, spec['dictionary']), encoding='utf-8') as f:
+                    dictionaries[column] = json.load(f)
+        loaded[table] = ColumnarTable(entry['rows'], arrays, dictionaries)
+    return loaded
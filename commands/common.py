@@ -0,0 +1,168 @@
+import sqlite3
+from functools import update_wrapper
+import click
+from database import execute_query_fetchall, execute_query_fetchone
+from dates import normalize_date, normalize_timestamp
+from importer import DEFAULT_BATCH_SIZE, import_file, rows_per_second
+
+# Decorator passing the shared connection as the first argument of a command,
+# reporting database errors as command failures
+def pass_conn(f):
+    @click.pass_context
+    def new_func(ctx, *args, **kwargs):
+        conn = ctx.obj.connection
+        try:
+            return ctx.invoke(f, conn, *args, **kwargs)
+        except sqlite3.Error as e:
+            # The shell and run keep the connection, so never leave it holding the write lock
+            if not conn.deferred_commits:
+                conn.rollback()
+            if isinstance(e, sqlite3.IntegrityError):
+                raise click.ClickException(f"Integrity Error: {e}")
+            raise click.ClickException(f"Database Error: {e}")
+    return update_wrapper(new_func, f)
+
+# Parameter type normalizing dates to YYYY-MM-DD
+class DateType(click.ParamType):
+    name = 'date'
+
+    def convert(self, value, param, ctx):
+        try:
+            return normalize_date(value)
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+
+DATE = DateType()
+
+class TimestampType(click.ParamType):
+    name = 'timestamp'
+
+    def convert(self, value, param, ctx):
+        try:
+            return normalize_timestamp(value)
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+
+TIMESTAMP = TimestampType()
+
+# Options shared by the list commands for keyset pagination
+def page_options(f):
+    f = click.option('--limit', type=click.IntRange(min=1), help='Maximum number of rows to show.')(f)
+    f = click.option('--after-id', type=int, default=0, help='Only show rows with an ID greater than this.')(f)
+    return f
+
+# Helper function to echo rows as they are streamed from the database
+def echo_rows(rows, heading, empty_message, format_row, limit=None):
+    count = 0
+    last_id = None
+    for row in rows:
+        if count == 0:
+            click.echo(heading)
+        click.echo(format_row(row))
+        count += 1
+        last_id = row[0]
+    if count == 0:
+        click.echo(empty_message)
+    elif limit and count == limit:
+        click.echo(f"More rows may follow, continue with --after-id {last_id}.")
+
+# Options shared by the set-based update commands
+def bulk_options(f):
+    f = click.option('--yes', is_flag=True, help='Do not ask for confirmation.')(f)
+    f = click.option('--dry-run', is_flag=True, help='Only show the rows that would change.')(f)
+    return f
+
+# Helper function to show the preview of a set-based change and ask whether to go ahead
+def confirm_preview(preview, noun, format_row, dry_run, yes):
+    if not preview.count:
+        click.echo(f"No {noun} match.")
+        return False
+    click.echo(f"{preview.count} {noun} match:")
+    for row in preview.rows:
+        click.echo(f"  {format_row(row)}")
+    if preview.count > len(preview.rows):
+        click.echo(f"  ... and {preview.count - len(preview.rows)} more.")
+    if dry_run:
+        return False
+    return yes or click.confirm("Apply the change?", abort=True)
+
+PICKER_PAGE_SIZE = 10
+
+# Helper function to fetch one page of picker options whose label starts with prefix,
+# served from the lookup cache while the database is unchanged
+def fetch_picker_page(conn, table, column, prefix='', after=None, page_size=PICKER_PAGE_SIZE):
+    pattern = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    query = f"SELECT id, {column} FROM {table} WHERE {column} LIKE ? ESCAPE '\\'"
+    params = [pattern]
+    if after is not None:
+        query += f" AND ({column} COLLATE NOCASE, id) > (?, ?)"
+        params.extend(after)
+    query += f" ORDER BY {column} COLLATE NOCASE, id LIMIT ?"
+    params.append(page_size + 1)
+    rows = execute_query_fetchall(conn, query, params, cached=True)
+    return rows[:page_size], len(rows) > page_size
+
+# Helper function to pick a row by ID or by typing the start of its name, one page at a time
+def prompt_with_picker(conn, table, column, prompt_message):
+    prefix = ''
+    after = None
+    while True:
+        options, more = fetch_picker_page(conn, table, column, prefix, after)
+        if options:
+            for option in options:
+                click.echo(f"{option[0]} - {option[1]}")
+            if more:
+                click.echo("(press Enter for more)")
+        else:
+            click.echo("No matches.")
+
+        answer = click.prompt(f"{prompt_message} [ID, start of name, or Cancel]", default='', show_default=False).strip()
+        if not answer:
+            # Next page, or back to the first page after the last one
+            after = (options[-1][1], options[-1][0]) if options and more else None
+            continue
+        if answer.lower() == 'cancel':
+            return None
+
+        # Accept a bare ID or the "ID - Name" form of a listed option
+        option_id = answer.split(' - ', 1)[0].strip()
+        if option_id.isdigit():
+            if execute_query_fetchone(conn, f"SELECT 1 FROM {table} WHERE id = ?", (int(option_id),), cached=True):
+                return int(option_id)
+            click.echo(f"Error: No entry with ID {option_id}. Please select a valid option.")
+            continue
+
+        prefix = answer
+        after = None
+
+# Helper function to select a supplier by ID or name
+def select_supplier(conn):
+    if not execute_query_fetchone(conn, "SELECT 1 FROM suppliers LIMIT 1", cached=True):
+        click.echo("No suppliers available. Please add a supplier first.")
+        return None
+    return prompt_with_picker(conn, 'suppliers', 'name', "Select Supplier (ID - Name):")
+
+# Helper function to select an order by ID or customer name
+def select_order(conn):
+    if not execute_query_fetchone(conn, "SELECT 1 FROM orders LIMIT 1", cached=True):
+        click.echo("No orders available. Please create an order first.")
+        return None
+    return prompt_with_picker(conn, 'orders', 'customer_name', "Select Order (ID - Customer Name):")
+
+# Bulk import commands, one per group
+def add_import_command(group, table):
+    @group.command('import')
+    @click.argument('file', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), help='Input format (guessed from the extension by default).')
+    @click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True, type=click.IntRange(min=1), help='Rows per transaction.')
+    @click.option('--rejects', type=click.Path(dir_okay=False), help='File for rejected rows (defaults to FILE.rejects.jsonl).')
+    @pass_conn
+    def import_(conn, file, fmt, batch_size, rejects):
+        """Bulk import rows from a CSV or JSONL file"""
+        rejects = rejects or file + '.rejects.jsonl'
+        result = import_file(conn, table, file, fmt, batch_size, rejects)
+        click.echo(f"Imported {result.inserted} {table} rows in {result.seconds:.2f}s "
+                   f"({rows_per_second(result):.0f} rows/sec).")
+        if result.rejected:
+            click.echo(f"Rejected {result.rejected} rows, see '{rejects}'.")
+    return import_
@@ -0,0 +1,103 @@
+import click
+from backup import (BACKUP_PAGES, BACKUP_PAUSE, backup_database, backup_path, foreign_key_orphans, restore_database,
+                    verify_database)
+from migrations import get_schema_version, migrate, plan_migration
+from commands.common import pass_conn
+
+# Helper function returning a backup progress callback echoing every tenth of the way
+def echo_progress():
+    shown = [-1]
+    def progress(copied, total):
+        tenth = copied * 10 // total if total else 10
+        if tenth > shown[0]:
+            shown[0] = tenth
+            click.echo(f"  {tenth * 10}% ({copied}/{total} pages)", err=True)
+    return progress
+
+# Helper function to format the size and throughput of a backup or restore
+def format_result(result):
+    megabytes = result.bytes / 1e6
+    rate = megabytes / result.seconds if result.seconds else 0
+    return f"{result.pages} pages ({megabytes:.1f} MB) in {result.seconds:.2f} s ({rate:.1f} MB/s)"
+
+# Database Commands
+@click.group()
+def db():
+    """Manage the Database"""
+    pass
+
+@db.command('migrate')
+@click.option('--dry-run', is_flag=True, help='Show the migration plan and query plans without changing the database.')
+@pass_conn
+def migrate_(conn, dry_run):
+    """Upgrade the database schema"""
+    version = get_schema_version(conn)
+    if not dry_run:
+        applied = migrate(conn)
+        if not applied:
+            click.echo(f"Schema is up to date (version {version}).")
+        for migration_version, description, _ in applied:
+            click.echo(f"Applied migration {migration_version}: {description}")
+        return
+
+    pending, before, after = plan_migration(conn)
+    if not pending:
+        click.echo(f"Schema is up to date (version {version}).")
+    else:
+        click.echo(f"Schema version {version} -> {pending[-1][0]}:")
+        for migration_version, description, steps in pending:
+            click.echo(f"  {migration_version}: {description}")
+            for step in steps:
+                text = step.__doc__ if callable(step) else step
+                click.echo(f"      {' '.join(text.split())}")
+    click.echo("Query plans (before -> after):")
+    for name in before:
+        click.echo(f"  {name}:")
+        for line in before[name]:
+            click.echo(f"    before: {line}")
+        for line in after[name]:
+            click.echo(f"    after:  {line}")
+
+@db.command()
+@click.argument('target', type=click.Path(dir_okay=False))
+@click.option('--pages', default=BACKUP_PAGES, show_default=True, type=click.IntRange(min=1),
+              help='Pages copied per step.')
+@click.option('--pause', default=BACKUP_PAUSE, show_default=True, type=click.FloatRange(min=0),
+              help='Seconds to pause between steps.')
+@click.option('--no-verify', is_flag=True, help='Skip the integrity check of the copy.')
+@pass_conn
+def backup(conn, target, pages, pause, no_verify):
+    """Back up the database while it stays in use ({timestamp} in TARGET is filled in)"""
+    target = backup_path(target)
+    try:
+        result = backup_database(conn, target, pages, pause, echo_progress(), verify=not no_verify)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Backed up {format_result(result)} to {target}.")
+
+@db.command()
+@click.argument('db_file', type=click.Path(exists=True, dir_okay=False))
+def verify(db_file):
+    """Check a database or backup file for corruption"""
+    problems = verify_database(db_file)
+    for problem in problems:
+        click.echo(problem)
+    if problems:
+        raise click.ClickException(f"{db_file} failed verification.")
+    for warning in foreign_key_orphans(db_file):
+        click.echo(f"Warning: {warning}")
+    click.echo(f"{db_file} is sound.")
+
+@db.command()
+@click.argument('backup_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--yes', is_flag=True, help='Do not ask for confirmation.')
+@pass_conn
+def restore(conn, backup_file, yes):
+    """Replace the database with a verified backup"""
+    if not yes:
+        click.confirm(f"Replace the current database with {backup_file}?", abort=True)
+    try:
+        result = restore_database(conn, backup_file, echo_progress())
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Restored {format_result(result)} from {backup_file}.")
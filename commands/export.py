@@ -0,0 +1,24 @@
+import time
+import click
+from columnar import COLUMNAR_TABLES, export_columnar
+from commands.common import pass_conn
+
+# Export Commands
+@click.group()
+def export():
+    """Export Snapshots for Analytics"""
+    pass
+
+@export.command()
+@click.argument('out_dir', type=click.Path(file_okay=False))
+@click.option('--table', 'tables', multiple=True, type=click.Choice(list(COLUMNAR_TABLES)),
+              help='Table to export (repeatable, default all).')
+@pass_conn
+def columnar(conn, out_dir, tables):
+    """Write tables as fixed-width column files for memory-mapped NumPy reads"""
+    started = time.perf_counter()
+    counts = export_columnar(conn, out_dir, tables or tuple(COLUMNAR_TABLES))
+    seconds = time.perf_counter() - started
+    for table, rows in counts.items():
+        click.echo(f"Exported {rows} {table} rows.")
+    click.echo(f"Wrote {out_dir} in {seconds:.2f}s.")
@@ -0,0 +1,92 @@
+import click
+from inventory import (receive_stock, adjust_stock, reserve_stock, release_stock, stock_on_hand, iter_stock_levels,
+                       iter_stock_movements, take_snapshot, verify_stock)
+from commands.common import echo_rows, page_options, pass_conn
+
+# Inventory Commands
+@click.group()
+def inventory():
+    """Manage Stock"""
+    pass
+
+@inventory.command()
+@click.option('--item_id', prompt='Item ID', type=int, help='ID of the item received.')
+@click.option('--quantity', prompt='Quantity', type=click.IntRange(min=1), help='Number of units received.')
+@click.option('--note', help='Free-text note, e.g. a delivery reference.')
+@pass_conn
+def receive(conn, item_id, quantity, note):
+    """Record received stock"""
+    receive_stock(conn, item_id, quantity, note)
+    click.echo(f"Received {quantity} of item '{item_id}', {stock_on_hand(conn, item_id)} on hand.")
+
+@inventory.command()
+@click.option('--item_id', prompt='Item ID', type=int, help='ID of the item to correct.')
+@click.option('--quantity', prompt='Quantity', type=int, help='Signed number of units to add or remove.')
+@click.option('--note', help='Reason for the correction.')
+@pass_conn
+def adjust(conn, item_id, quantity, note):
+    """Correct the stock of an item"""
+    try:
+        adjust_stock(conn, item_id, quantity, note)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Adjusted item '{item_id}' by {quantity}, {stock_on_hand(conn, item_id)} on hand.")
+
+@inventory.command()
+@click.option('--order_id', prompt='Order ID', type=int, help='ID of the order to reserve stock for.')
+@click.option('--line', 'lines', required=True, multiple=True, type=(int, click.IntRange(min=1)),
+              metavar='ITEM_ID QUANTITY', help='Item and quantity to reserve, may be repeated.')
+@pass_conn
+def reserve(conn, order_id, lines):
+    """Reserve stock for an order, all lines or none"""
+    try:
+        reserve_stock(conn, order_id, lines)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Reserved {len(lines)} lines for order '{order_id}'.")
+
+@inventory.command()
+@click.option('--order_id', prompt='Order ID', type=int, help='ID of the order to release stock for.')
+@pass_conn
+def release(conn, order_id):
+    """Return the stock reserved for an order"""
+    released = release_stock(conn, order_id)
+    click.echo(f"Released stock of {released} items for order '{order_id}'.")
+
+@inventory.command('on-hand')
+@page_options
+@pass_conn
+def on_hand(conn, after_id, limit):
+    """List the stock on hand per item"""
+    echo_rows(iter_stock_levels(conn, after_id, limit), "Stock on Hand:", "No items found.",
+              lambda row: f"ID: {row.item_id}, Name: {row.name}, On hand: {row.quantity}", limit)
+
+@inventory.command()
+@click.argument('item_id', type=int)
+@page_options
+@pass_conn
+def history(conn, item_id, after_id, limit):
+    """List the stock movements of ITEM_ID"""
+    echo_rows(iter_stock_movements(conn, item_id, after_id, limit), f"Stock Movements of Item {item_id}:",
+              "No stock movements found.",
+              lambda row: f"ID: {row.id}, {row.created_at}, {row.reason} {row.quantity:+d}"
+                          + (f", Order ID: {row.order_id}" if row.order_id else '')
+                          + (f", Note: {row.note}" if row.note else ''), limit)
+
+@inventory.command()
+@pass_conn
+def snapshot(conn):
+    """Snapshot the stock on hand of every item"""
+    snapshot_id = take_snapshot(conn)
+    click.echo(f"Snapshot '{snapshot_id}' taken.")
+
+@inventory.command()
+@pass_conn
+def verify(conn):
+    """Check the stock on hand against the latest snapshot and the ledger since"""
+    differences = verify_stock(conn)
+    for item_id, on_hand_quantity, replayed in differences:
+        click.echo(f"Item {item_id}: on hand {on_hand_quantity}, ledger {replayed}")
+    if differences:
+        raise click.ClickException(f"{len(differences)} items differ.")
+    click.echo("Stock on hand matches the ledger.")
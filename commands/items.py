@@ -0,0 +1,94 @@
+import click
+from items import (add_item, update_item, reprice_items, iter_price_history, price_as_of, iter_items, iter_search_items,
+                   delete_item)
+from commands.common import TIMESTAMP, add_import_command, bulk_options, confirm_preview, echo_rows, page_options, pass_conn, select_supplier
+
+# Helper function to format one row for the list and search commands
+def format_item(row):
+    return f"ID: {row.id}, Name: {row.name}"
+
+# Item Commands
+@click.group()
+def items():
+    """Manage Items"""
+    pass
+
+@items.command()
+@click.option('--name', prompt='Item name', help='Name of the item.')
+@click.option('--price', prompt='Item price', type=float, help='Price of the item.')
+@pass_conn
+def add(conn, name, price):
+    """Add a new item"""
+    supplier_id = select_supplier(conn)
+    if supplier_id:
+        item_id = add_item(conn, name, price, supplier_id)
+        click.echo(f"Item '{name}' added successfully with ID '{item_id}'.")
+
+@items.command()
+@page_options
+@pass_conn
+def list(conn, after_id, limit):
+    """List all items"""
+    echo_rows(iter_items(conn, after_id, limit), "List of Items:", "No items found.",
+              format_item, limit)
+
+@items.command()
+@click.argument('keyword')
+@click.option('--limit', type=click.IntRange(min=1), help='Maximum number of matches to show.')
+@click.option('--fuzzy', is_flag=True, help='Also match misspelt names, most similar first.')
+@pass_conn
+def search(conn, keyword, limit, fuzzy):
+    """Search items"""
+    echo_rows(iter_search_items(conn, keyword, limit, fuzzy), f"Items matching '{keyword}':", "No items found.", format_item)
+
+@items.command()
+@click.option('--item_id', prompt='Cloth ID', type=int, help='ID of the item to update.')
+@click.option('--name', prompt='Item name', help='Name of the item.')
+@click.option('--price', prompt='Item price', type=float, help='Price of the item.')
+@pass_conn
+def update(conn, item_id, name, price):
+    """Update an item"""
+    supplier_id = select_supplier(conn)
+    if supplier_id:
+        if not update_item(conn, item_id, name, price, supplier_id):
+            raise click.ClickException(f"No item with ID '{item_id}'.")
+        click.echo(f"Item with ID '{item_id}' updated successfully.")
+
+@items.command()
+@click.argument('item_id', type=int)
+@click.option('--as-of', type=TIMESTAMP, help='Only show the price in effect then (UTC; a date means its end).')
+@pass_conn
+def prices(conn, item_id, as_of):
+    """Show the price history of an item"""
+    if as_of:
+        price = price_as_of(conn, item_id, as_of)
+        if price is None:
+            raise click.ClickException(f"No price recorded for item '{item_id}' as of {as_of}.")
+        click.echo(f"Price of item '{item_id}' as of {as_of}: {price}")
+        return
+    echo_rows(iter_price_history(conn, item_id), f"Price history of item '{item_id}':", "No prices recorded.",
+              lambda row: f"From {row.effective_from}: {row.price}")
+
+@items.command()
+@click.option('--supplier_id', required=True, type=int, help='ID of the supplier whose items are repriced.')
+@click.option('--percent', required=True, type=click.FloatRange(min=-100, min_open=True),
+              help='Price change in percent, negative for a discount.')
+@bulk_options
+@pass_conn
+def reprice(conn, supplier_id, percent, dry_run, yes):
+    """Change the price of every item of a supplier by a percentage"""
+    preview = reprice_items(conn, supplier_id, percent, dry_run=True)
+    if confirm_preview(preview, "items", lambda row: f"{format_item(row)}, Price: {row.price}", dry_run, yes):
+        count = reprice_items(conn, supplier_id, percent)
+        click.echo(f"Repriced {count} items by {percent:+g}%.")
+
+@items.command()
+@click.option('--item_id', prompt='Item ID', type=int, help='ID of the item to delete.')
+@pass_conn
+def delete(conn, item_id):
+    """Delete an item"""
+    if not delete_item(conn, item_id):
+        raise click.ClickException(f"No item with ID '{item_id}'.")
+    click.echo(f"Item with ID '{item_id}' deleted successfully.")
+
+add_import_command(items, 'items')
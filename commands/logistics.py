@@ -0,0 +1,107 @@
+import click
+from analytics import ON_TIME_DAYS, supplier_lead_times
+from logistics import (record_logistics, update_logistics, update_order_logistics, iter_logistics, iter_logistics_arriving_between,
+                       iter_search_logistics, delete_logistics)
+from commands.common import DATE, add_import_command, bulk_options, confirm_preview, echo_rows, page_options, pass_conn, select_order, select_supplier
+
+# Helper function to format one row for the list and search commands
+def format_logistics(row):
+    return f"ID: {row.id}, Order ID: {row.order_id}"
+
+# Logistics Commands
+@click.group()
+def logistics():
+    """Manage Logistics"""
+    pass
+
+@logistics.command()
+@click.option('--dispatch_date', prompt='Dispatch date', type=DATE, help='Date of dispatch (YYYY-MM-DD).')
+@click.option('--arrival_date', prompt='Arrival date', type=DATE, help='Date of arrival (YYYY-MM-DD).')
+@click.option('--status', prompt='Status', help='Status of the logistics.')
+@pass_conn
+def record(conn, dispatch_date, arrival_date, status):
+    """Record logistics details"""
+    order_id = select_order(conn)
+    supplier_id = select_supplier(conn)
+    if order_id and supplier_id:
+        logistics_id = record_logistics(conn, order_id, supplier_id, dispatch_date, arrival_date, status)
+        click.echo(f"Logistics recorded successfully with ID '{logistics_id}'.")
+
+@logistics.command()
+@page_options
+@pass_conn
+def list(conn, after_id, limit):
+    """List all logistics entries"""
+    echo_rows(iter_logistics(conn, after_id, limit), "List of Logistics Entries:", "No logistics entries found.",
+              format_logistics, limit)
+
+@logistics.command('arriving-between')
+@click.argument('start', type=DATE)
+@click.argument('end', type=DATE)
+@click.option('--limit', type=click.IntRange(min=1), help='Maximum number of shipments to show.')
+@pass_conn
+def arriving_between(conn, start, end, limit):
+    """List shipments arriving between START and END (inclusive)"""
+    echo_rows(iter_logistics_arriving_between(conn, start, end, limit), f"Shipments arriving from {start} to {end}:",
+              "No logistics entries found.",
+              lambda row: f"ID: {row.id}, Order ID: {row.order_id}, Arrival: {row.arrival_date}, Status: {row.status}")
+
+@logistics.command()
+@click.option('--on-time-days', default=ON_TIME_DAYS, show_default=True, type=click.FloatRange(min=0),
+              help='Shipments arriving within this many days of dispatch count as on time.')
+@click.option('--since', type=DATE, help='Only shipments dispatched on or after this date.')
+@click.option('--until', type=DATE, help='Only shipments dispatched on or before this date.')
+@pass_conn
+def leadtimes(conn, on_time_days, since, until):
+    """Lead-time statistics per supplier"""
+    try:
+        rows = supplier_lead_times(conn, on_time_days, since, until)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    echo_rows(rows, "Lead Times by Supplier (days):", "No shipments with dispatch and arrival dates found.",
+              lambda row: f"ID: {row.supplier_id}, Name: {row.name}, Shipments: {row.shipments}, "
+                          f"Mean: {row.mean:.2f}, P50: {row.p50:.2f}, P90: {row.p90:.2f}, P99: {row.p99:.2f}, "
+                          f"On time: {row.on_time_rate:.1%}")
+
+@logistics.command()
+@click.argument('keyword')
+@click.option('--limit', type=click.IntRange(min=1), help='Maximum number of matches to show.')
+@pass_conn
+def search(conn, keyword, limit):
+    """Search logistics entries"""
+    echo_rows(iter_search_logistics(conn, keyword, limit), f"Logistics entries matching '{keyword}':",
+              "No logistics entries found.", format_logistics)
+
+@logistics.command()
+@click.option('--logistics_id', prompt='Logistics ID', type=int, help='ID of the logistics to update.')
+@click.option('--status', prompt='Status', help='Status of the logistics.')
+@pass_conn
+def update(conn, logistics_id, status):
+    """Update logistics details"""
+    if not update_logistics(conn, logistics_id, status):
+        raise click.ClickException(f"No logistics entry with ID '{logistics_id}'.")
+    click.echo(f"Logistics with ID '{logistics_id}' updated successfully.")
+
+@logistics.command('set-status')
+@click.option('--order_id', required=True, type=int, help='ID of the order whose shipments are updated.')
+@click.option('--status', required=True, help='New status of the shipments.')
+@click.option('--from-status', help='Only shipments currently in this status.')
+@bulk_options
+@pass_conn
+def set_status(conn, order_id, status, from_status, dry_run, yes):
+    """Set the status of every shipment of an order"""
+    preview = update_order_logistics(conn, order_id, status, from_status, dry_run=True)
+    if confirm_preview(preview, "shipments", lambda row: f"{format_logistics(row)}, Status: {row.status}", dry_run, yes):
+        count = update_order_logistics(conn, order_id, status, from_status)
+        click.echo(f"Set the status of {count} shipments to '{status}'.")
+
+@logistics.command()
+@click.option('--logistics_id', prompt='Logistics ID', type=int, help='ID of the logistics to delete.')
+@pass_conn
+def delete(conn, logistics_id):
+    """Delete logistics entry"""
+    if not delete_logistics(conn, logistics_id):
+        raise click.ClickException(f"No logistics entry with ID '{logistics_id}'.")
+    click.echo(f"Logistics with ID '{logistics_id}' deleted successfully.")
+
+add_import_command(logistics, 'logistics')
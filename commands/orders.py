@@ -0,0 +1,88 @@
+import click
+from orders import create_order, update_order, update_orders_status, iter_orders, iter_orders_between, iter_search_orders, delete_order
+from commands.common import DATE, add_import_command, bulk_options, confirm_preview, echo_rows, page_options, pass_conn, select_supplier
+
+# Helper function to format one row for the list and search commands
+def format_order(row):
+    return f"ID: {row.id}, Customer Name: {row.customer_name}"
+
+# Order Commands
+@click.group()
+def orders():
+    """Manage Orders"""
+    pass
+
+@orders.command()
+@click.option('--customer_name', prompt='Customer name', help='Name of the customer.')
+@click.option('--order_date', prompt='Order date', type=DATE, help='Date of the order (YYYY-MM-DD).')
+@click.option('--total_amount', prompt='Total amount', type=float, help='Total amount of the order.')
+@pass_conn
+def create(conn, customer_name, order_date, total_amount):
+    """Create a new order"""
+    supplier_id = select_supplier(conn)
+    if supplier_id:
+        order_id = create_order(conn, customer_name, order_date, total_amount, supplier_id)
+        click.echo(f"Order for '{customer_name}' created successfully with ID '{order_id}'.")
+
+@orders.command()
+@page_options
+@pass_conn
+def list(conn, after_id, limit):
+    """List all orders"""
+    echo_rows(iter_orders(conn, after_id, limit), "List of Orders:", "No orders found.",
+              format_order, limit)
+
+@orders.command()
+@click.argument('start', type=DATE)
+@click.argument('end', type=DATE)
+@click.option('--limit', type=click.IntRange(min=1), help='Maximum number of orders to show.')
+@pass_conn
+def between(conn, start, end, limit):
+    """List orders placed between START and END (inclusive)"""
+    echo_rows(iter_orders_between(conn, start, end, limit), f"Orders from {start} to {end}:", "No orders found.",
+              lambda row: f"ID: {row.id}, Date: {row.order_date}, Customer Name: {row.customer_name}, Total: {row.total_amount}")
+
+@orders.command()
+@click.argument('keyword')
+@click.option('--limit', type=click.IntRange(min=1), help='Maximum number of matches to show.')
+@pass_conn
+def search(conn, keyword, limit):
+    """Search orders"""
+    echo_rows(iter_search_orders(conn, keyword, limit), f"Orders matching '{keyword}':", "No orders found.", format_order)
+
+@orders.command()
+@click.option('--order_id', prompt='Order ID', type=int, help='ID of the order to update.')
+@click.option('--status', prompt='Order status', help='Status of the order.')
+@pass_conn
+def update(conn, order_id, status):
+    """Update an order"""
+    if not update_order(conn, order_id, status):
+        raise click.ClickException(f"No order with ID '{order_id}'.")
+    click.echo(f"Order with ID '{order_id}' updated successfully.")
+
+@orders.command('set-status')
+@click.option('--status', required=True, help='New status of the orders.')
+@click.option('--supplier_id', type=int, help='Only orders from this supplier.')
+@click.option('--start', type=DATE, help='Only orders placed on or after this date.')
+@click.option('--end', type=DATE, help='Only orders placed on or before this date.')
+@click.option('--from-status', help='Only orders currently in this status.')
+@bulk_options
+@pass_conn
+def set_status(conn, status, supplier_id, start, end, from_status, dry_run, yes):
+    """Set the status of every matching order"""
+    filters = dict(supplier_id=supplier_id, start=start, end=end, current_status=from_status)
+    preview = update_orders_status(conn, status, dry_run=True, **filters)
+    if confirm_preview(preview, "orders", lambda row: f"{format_order(row)}, Status: {row.status}", dry_run, yes):
+        count = update_orders_status(conn, status, **filters)
+        click.echo(f"Set the status of {count} orders to '{status}'.")
+
+@orders.command()
+@click.option('--order_id', prompt='Order ID', type=int, help='ID of the order to delete.')
+@pass_conn
+def delete(conn, order_id):
+    """Delete an order"""
+    if not delete_order(conn, order_id):
+        raise click.ClickException(f"No order with ID '{order_id}'.")
+    click.echo(f"Order with ID '{order_id}' deleted successfully.")
+
+add_import_command(orders, 'orders')
@@ -0,0 +1,43 @@
+import click
+from reporting import iter_daily_sales, iter_supplier_revenue, rebuild_rollups, verify_rollups
+from commands.common import DATE, echo_rows, pass_conn
+
+# Report Commands
+@click.group()
+def reports():
+    """Sales Reports"""
+    pass
+
+@reports.command('supplier-revenue')
+@click.option('--limit', type=click.IntRange(min=1), help='Only show the top suppliers.')
+@pass_conn
+def supplier_revenue(conn, limit):
+    """Revenue and order count per supplier"""
+    echo_rows(iter_supplier_revenue(conn, limit), "Revenue by Supplier:", "No orders found.",
+              lambda row: f"ID: {row.supplier_id}, Name: {row.name}, Orders: {row.order_count}, Revenue: {row.revenue:.2f}")
+
+@reports.command('daily-sales')
+@click.option('--start', type=DATE, help='First day to show.')
+@click.option('--end', type=DATE, help='Last day to show.')
+@pass_conn
+def daily_sales(conn, start, end):
+    """Order volume and revenue per day"""
+    echo_rows(iter_daily_sales(conn, start, end), "Daily Sales:", "No orders found.",
+              lambda row: f"Date: {row.order_date}, Orders: {row.order_count}, Revenue: {row.revenue:.2f}")
+
+@reports.command()
+@click.option('--check', is_flag=True, help='Only verify the rollups, exiting with an error if they differ.')
+@pass_conn
+def rebuild(conn, check):
+    """Verify the rollups against a full recompute and rebuild them"""
+    differences = verify_rollups(conn)
+    for table, key, rollup, recomputed in differences:
+        click.echo(f"{table} {key}: rollup {rollup}, recomputed {recomputed}")
+    if not differences:
+        click.echo("Rollups match a full recompute.")
+    if check:
+        if differences:
+            raise click.ClickException(f"{len(differences)} rollup rows differ.")
+        return
+    rebuild_rollups(conn)
+    click.echo("Rollups rebuilt.")
@@ -0,0 +1,16 @@
+import click
+from api import HOST, PORT, READERS, serve as serve_api
+
+@click.command()
+@click.option('--host', default=HOST, show_default=True, help='Address to listen on.')
+@click.option('--port', default=PORT, show_default=True, type=click.IntRange(min=0, max=65535), help='Port to listen on.')
+@click.option('--readers', default=READERS, show_default=True, type=click.IntRange(min=1),
+              help='Threads serving reads, each with its own read-only connection.')
+@click.pass_context
+def serve(ctx, host, port, readers):
+    """Serve the JSON HTTP API until interrupted"""
+    db_file = ctx.obj.db_file
+    def ready(server):
+        address = server.sockets[0].getsockname()
+        click.echo(f"Serving {db_file} on http://{address[0]}:{address[1]} (Ctrl+C to stop).")
+    serve_api(db_file, host, port, readers, ready)
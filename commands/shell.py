@@ -0,0 +1,83 @@
+import shlex
+import sqlite3
+import time
+import click
+from database import transaction
+
+EXIT_COMMANDS = ('exit', 'quit')
+
+# Helper function to run one command line against the shared connection
+def run_line(ctx, line):
+    try:
+        args = shlex.split(line, comments=True)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        return False
+    if not args:
+        return True
+    root = ctx.find_root()
+    try:
+        # Reusing ctx.obj keeps the connection and its statement cache open
+        result = root.command.main(['--quiet'] + args, prog_name=root.info_name,
+                                   standalone_mode=False, obj=ctx.obj)
+        return not isinstance(result, int) or result == 0
+    except click.ClickException as e:
+        e.show()
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+    except sqlite3.Error as e:
+        click.echo(f"SQLite error occurred: {e}", err=True)
+    return False
+
+# Interactive shell
+@click.command()
+@click.pass_context
+def shell(ctx):
+    """Run commands interactively on one connection"""
+    click.echo("Type commands without the 'cli.py' prefix, 'help' for a list, or 'exit' to leave.")
+    while True:
+        try:
+            line = input('liquor> ')
+        except (EOFError, KeyboardInterrupt):
+            click.echo()
+            return
+        if line.strip() in EXIT_COMMANDS:
+            return
+        if line.strip() == 'help':
+            line = '--help'
+        run_line(ctx, line)
+
+# Batch script mode
+@click.command()
+@click.argument('script', type=click.File('r'))
+@click.option('--transaction', 'single_transaction', is_flag=True,
+              help='Run the whole script in one transaction, rolled back if a command fails.')
+@click.option('--keep-going', is_flag=True, help='Continue after a failing command (not with --transaction).')
+@click.pass_context
+def run(ctx, script, single_transaction, keep_going):
+    """Run the commands in SCRIPT, one per line"""
+    if single_transaction and keep_going:
+        raise click.UsageError("--keep-going cannot be combined with --transaction.")
+    conn = ctx.obj.connection
+    start = time.perf_counter()
+    count = 0
+    failed = 0
+
+    def run_script():
+        nonlocal count, failed
+        for line_num, line in enumerate(script, 1):
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            count += 1
+            if not run_line(ctx, line):
+                failed += 1
+                if not keep_going:
+                    raise click.ClickException(f"Command on line {line_num} failed: {line.strip()}")
+
+    if single_transaction:
+        with transaction(conn):
+            run_script()
+    else:
+        run_script()
+    click.echo(f"Ran {count} commands in {time.perf_counter() - start:.2f}s"
+               + (f", {failed} failed." if failed else "."), err=True)
@@ -0,0 +1,76 @@
+from functools import update_wrapper
+import click
+from stores import ROW_TYPES, iter_store_daily_sales, iter_store_rows, iter_store_search, store_executor, store_supplier_revenue
+from commands.common import DATE, echo_rows
+from commands.items import format_item
+from commands.logistics import format_logistics
+from commands.orders import format_order
+from commands.suppliers import format_supplier
+
+FORMATTERS = {'suppliers': format_supplier, 'items': format_item, 'orders': format_order, 'logistics': format_logistics}
+
+TABLE = click.Choice(sorted(ROW_TYPES))
+
+# Decorator passing the shard executor and the store databases to a command
+def pass_stores(f):
+    @click.pass_context
+    def new_func(ctx, *args, **kwargs):
+        executor, stores = ctx.meta['stores']
+        return ctx.invoke(f, executor, stores, *args, **kwargs)
+    return update_wrapper(new_func, f)
+
+# Helper function to format a row prefixed with the store it came from
+def format_store_row(table):
+    format_row = FORMATTERS[table]
+    return lambda pair: f"Store: {pair[0]}, {format_row(pair[1])}"
+
+# Multi-store Commands
+@click.group()
+@click.option('--store', 'stores', required=True, multiple=True, envvar='LIQUOR_SUPPLY_STORES',
+              type=click.Path(exists=True, dir_okay=False), help='Store database to include, may be repeated.')
+@click.option('--workers', type=click.IntRange(min=1),
+              help='Worker processes querying the stores (defaults to one per store, up to the CPU count).')
+@click.pass_context
+def stores(ctx, stores, workers):
+    """Query Several Store Databases at Once"""
+    stores = tuple(dict.fromkeys(stores))
+    ctx.meta['stores'] = (ctx.with_resource(store_executor(stores, workers)), stores)
+
+@stores.command()
+@click.argument('table', type=TABLE)
+@click.option('--limit', type=click.IntRange(min=1), help='Maximum number of rows to show.')
+@pass_stores
+def list(executor, stores, table, limit):
+    """List the rows of TABLE in every store, by ID"""
+    echo_rows(iter_store_rows(executor, stores, table, limit), f"{table.capitalize()} in {len(stores)} stores:",
+              f"No {table} found.", format_store_row(table))
+
+@stores.command()
+@click.argument('table', type=TABLE)
+@click.argument('keyword')
+@click.option('--limit', type=click.IntRange(min=1), help='Maximum number of matches to show.')
+@pass_stores
+def search(executor, stores, table, keyword, limit):
+    """Search TABLE in every store, best matches first"""
+    echo_rows(iter_store_search(executor, stores, table, keyword, limit),
+              f"{table.capitalize()} matching '{keyword}' in {len(stores)} stores:", f"No {table} found.",
+              format_store_row(table))
+
+@stores.command('supplier-revenue')
+@click.option('--limit', type=click.IntRange(min=1), help='Only show the top suppliers.')
+@pass_stores
+def supplier_revenue(executor, stores, limit):
+    """Revenue and order count per supplier name over every store"""
+    echo_rows(store_supplier_revenue(executor, stores, limit), f"Revenue by Supplier in {len(stores)} stores:",
+              "No orders found.",
+              lambda row: f"Name: {row.name}, Orders: {row.order_count}, Revenue: {row.revenue:.2f}")
+
+@stores.command('daily-sales')
+@click.option('--start', type=DATE, help='First day to show.')
+@click.option('--end', type=DATE, help='Last day to show.')
+@pass_stores
+def daily_sales(executor, stores, start, end):
+    """Order volume and revenue per day over every store"""
+    echo_rows(iter_store_daily_sales(executor, stores, start, end), f"Daily Sales in {len(stores)} stores:",
+              "No orders found.",
+              lambda row: f"Date: {row.order_date}, Orders: {row.order_count}, Revenue: {row.revenue:.2f}")
@@ -0,0 +1,93 @@
+import click
+from suppliers import (DELETE_POLICIES, add_supplier, update_supplier, iter_suppliers, iter_search_suppliers,
+                       delete_supplier, preview_dependents)
+from commands.common import add_import_command, echo_rows, page_options, pass_conn
+from commands.items import format_item
+from commands.logistics import format_logistics
+from commands.orders import format_order
+
+# Helper function to format one row for the list and search commands
+def format_supplier(row):
+    return f"ID: {row.id}, Name: {row.name}"
+
+# Formatters for the rows a delete would touch
+DEPENDENT_FORMATS = {'items': format_item, 'orders': format_order, 'logistics': format_logistics}
+
+# Supplier Commands
+@click.group()
+def suppliers():
+    """Manage Suppliers"""
+    pass
+
+@suppliers.command()
+@click.option('--name', prompt='Supplier name', help='Name of the supplier.')
+@click.option('--contact_name', prompt='Contact name', help='Name of the contact person.')
+@click.option('--contact_phone', prompt='Contact phone', help='Contact phone number.')
+@click.option('--address', prompt='Address', help='Address of the supplier.')
+@pass_conn
+def add(conn, name, contact_name, contact_phone, address):
+    """Add a new supplier"""
+    supplier_id = add_supplier(conn, name, contact_name, contact_phone, address)
+    click.echo(f"Supplier '{name}' added successfully with ID '{supplier_id}'.")
+
+@suppliers.command()
+@page_options
+@pass_conn
+def list(conn, after_id, limit):
+    """List all suppliers"""
+    echo_rows(iter_suppliers(conn, after_id, limit), "List of Suppliers:", "No suppliers found.",
+              format_supplier, limit)
+
+@suppliers.command()
+@click.argument('keyword')
+@click.option('--limit', type=click.IntRange(min=1), help='Maximum number of matches to show.')
+@click.option('--fuzzy', is_flag=True, help='Also match misspelt names, most similar first.')
+@pass_conn
+def search(conn, keyword, limit, fuzzy):
+    """Search suppliers"""
+    echo_rows(iter_search_suppliers(conn, keyword, limit, fuzzy), f"Suppliers matching '{keyword}':", "No suppliers found.",
+              format_supplier)
+
+@suppliers.command()
+@click.option('--supplier_id', prompt='Supplier ID', type=int, help='ID of the supplier to update.')
+@click.option('--name', prompt='Supplier name', help='Name of the supplier.')
+@click.option('--contact_name', prompt='Contact name', help='Name of the contact person.')
+@click.option('--contact_phone', prompt='Contact phone', help='Contact phone number.')
+@click.option('--address', prompt='Address', help='Address of the supplier.')
+@pass_conn
+def update(conn, supplier_id, name, contact_name, contact_phone, address):
+    """Update a supplier"""
+    if not update_supplier(conn, supplier_id, name, contact_name, contact_phone, address):
+        raise click.ClickException(f"No supplier with ID '{supplier_id}'.")
+    click.echo(f"Supplier '{name}' updated successfully.")
+
+@suppliers.command()
+@click.option('--supplier_id', prompt='Supplier ID', type=int, help='ID of the supplier to delete.')
+@click.option('--policy', type=click.Choice(DELETE_POLICIES), default='block', show_default=True,
+              help="What to do with the supplier's items, orders and shipments: refuse, delete them, "
+                   "or keep them without a supplier.")
+@click.option('--yes', is_flag=True, help='Do not ask for confirmation.')
+@pass_conn
+def delete(conn, supplier_id, policy, yes):
+    """Delete a supplier"""
+    dependents = {table: found for table, found in preview_dependents(conn, supplier_id, policy).items() if found.count}
+    if dependents and policy != 'block':
+        action = "Delete" if policy == 'cascade' else "Detach"
+        click.echo(f"{action} " + ', '.join(f"{found.count} {table}" for table, found in dependents.items()) + ":")
+        for table, found in dependents.items():
+            click.echo(f"  {table}:")
+            for row in found.rows:
+                click.echo(f"    {DEPENDENT_FORMATS[table](row)}")
+            if found.count > len(found.rows):
+                click.echo(f"    ... and {found.count - len(found.rows)} more.")
+        if not yes:
+            click.confirm("Apply the change?", abort=True)
+    try:
+        deleted = delete_supplier(conn, supplier_id, policy)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    if not deleted:
+        raise click.ClickException(f"No supplier with ID '{supplier_id}'.")
+    click.echo(f"Supplier with ID '{supplier_id}' deleted successfully.")
+
+add_import_command(suppliers, 'suppliers')
@@ -0,0 +1,41 @@
+import click
+from changelog import compact_changelog, compaction_horizon, export_changes, latest_seq
+from commands.common import pass_conn
+
+# Sync Commands
+@click.group()
+def sync():
+    """Export Changes to Other Systems"""
+    pass
+
+@sync.command()
+@click.option('--since', default=0, show_default=True, type=click.IntRange(min=0),
+              help='Only export changes after this changelog sequence number.')
+@click.option('--limit', type=click.IntRange(min=1), help='Maximum number of changes to export.')
+@click.option('--output', type=click.File('w'), default='-', help='File to write the JSONL to (default stdout).')
+@pass_conn
+def export(conn, since, limit, output):
+    """Stream the rows changed since --since as JSONL"""
+    try:
+        count, last_seq = export_changes(conn, output, since, limit)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Exported {count} changes, continue with --since {last_seq}.", err=True)
+
+@sync.command()
+@click.option('--before', required=True, type=click.IntRange(min=0),
+              help='Compact changelog entries up to and including this sequence number.')
+@click.option('--drop-deletes', is_flag=True,
+              help='Also drop deletes up to --before; exports from earlier sequence numbers are refused afterwards.')
+@pass_conn
+def compact(conn, before, drop_deletes):
+    """Remove superseded changelog entries"""
+    removed = compact_changelog(conn, before, drop_deletes)
+    click.echo(f"Removed {removed} changelog entries.")
+
+@sync.command()
+@pass_conn
+def status(conn):
+    """Show the changelog position and size"""
+    entries = conn.execute("SELECT COUNT(*) FROM changelog").fetchone()[0]
+    click.echo(f"Latest seq: {latest_seq(conn)}, entries: {entries}, compacted up to: {compaction_horizon(conn)}")
@@ -1,95 +1,432 @@
+import atexit
+import pathlib
+import queue
 import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+from contextlib import contextmanager
+from migrations import migrate
+from rows import row_factory
 
 DB_FILE = 'liquor_supply.db'
 
+# Connection tuning
+BUSY_TIMEOUT = 5.0          # seconds sqlite waits on a locked database
+CACHED_STATEMENTS = 256     # prepared statements kept per connection
+LOCK_RETRIES = 5            # retries after the busy timeout is exhausted
+RETRY_BACKOFF = 0.05        # initial backoff in seconds, doubled per retry
+FETCH_SIZE = 500            # rows fetched per round trip when streaming
+SLOW_QUERY_MS = 100         # default threshold of the slow-query log
+
+# Write-behind queue
+WRITE_DELAY = 0.005         # seconds a write may wait for others to share its commit
+WRITE_BATCH = 500           # most writes per group commit
+WRITE_QUEUE_SIZE = 10000    # pending writes before submit() blocks
+
+# Lookup cache
+LOOKUP_CACHE_SIZE = 1024    # query results kept per connection
+LOOKUP_CACHE_ROWS = 1000    # longer results are not cached
+
 def initialize_database(db_file):
-    conn = sqlite3.connect(db_file)
-    c = conn.cursor()
-
-    
-    c.execute("""
-    CREATE TABLE IF NOT EXISTS suppliers (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        contact_name TEXT,
-        contact_phone TEXT,
-        address TEXT
-    )
-    """)
-
-    
-    c.execute("""
-    CREATE TABLE IF NOT EXISTS items (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        price REAL,
-        supplier_id INTEGER,
-        FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
-    )
-    """)
-
-    
-    c.execute("""
-    CREATE TABLE IF NOT EXISTS orders (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        customer_name TEXT NOT NULL,
-        order_date TEXT,
-        total_amount REAL,
-        supplier_id INTEGER,
-        FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
-    )
-    """)
-
-   
-    c.execute("""
-    CREATE TABLE IF NOT EXISTS logistics (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        order_id INTEGER,
-        supplier_id INTEGER,
-        dispatch_date TEXT,
-        arrival_date TEXT,
-        status TEXT,
-        FOREIGN KEY (order_id) REFERENCES orders (id),
-        FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
-    )
-    """)
+    """Create or upgrade the schema in a database file or an open connection"""
+    owns_connection = not isinstance(db_file, sqlite3.Connection)
+    conn = sqlite3.connect(db_file) if owns_connection else db_file
+    try:
+        return migrate(conn)
+    finally:
+        if owns_connection:
+            conn.close()
 
-    conn.commit()
-    conn.close()
+def configure_connection(conn):
+    """Apply WAL journaling, relaxed fsync, busy timeout and foreign keys"""
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT * 1000)}")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+class Connection(sqlite3.Connection):
+    """sqlite3 connection whose commits can be deferred to group statements into one transaction"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.deferred_commits = 0
+        self.lookup_cache = None
+
+    def commit(self):
+        if not self.deferred_commits:
+            super().commit()
+
+    def rollback(self):
+        super().rollback()
+        clear_lookup_cache(self)
 
 def get_connection(db_file):
-    return sqlite3.connect(db_file)
+    """Open a tuned connection to the database"""
+    conn = sqlite3.connect(db_file, timeout=BUSY_TIMEOUT, cached_statements=CACHED_STATEMENTS, factory=Connection)
+    return configure_connection(conn)
 
-def execute_query(conn, query, params=()):
+def get_read_connection(db_file):
+    """Open a read-only connection to an existing database"""
+    uri = f"{pathlib.Path(db_file).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT, cached_statements=CACHED_STATEMENTS,
+                           factory=Connection)
+    conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT * 1000)}")
+    return conn
+
+class LookupCache:
+    """LRU cache of small query results for one connection, emptied whenever the database changes.
+
+    Before every lookup it reads PRAGMA data_version, which moves when another
+    connection or process commits, and the connection's total_changes, which
+    moves with its own writes. Neither moves on a rollback, so results read
+    inside an open transaction are not stored, and Connection.rollback,
+    transaction() and restore_database empty the cache.
+    """
+
+    def __init__(self, conn, max_size=LOOKUP_CACHE_SIZE):
+        self.conn = conn
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._version = None
+
+    def _check_version(self):
+        version = (self.conn.execute("PRAGMA data_version").fetchone()[0], self.conn.total_changes)
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self._version = version
+
+    def get(self, key, load):
+        """Return the cached result for key, calling load() on a miss"""
+        self._check_version()
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        result = load()
+        # Uncommitted rows would outlive a rollback
+        if self.conn.in_transaction:
+            return result
+        if not isinstance(result, list) or len(result) <= LOOKUP_CACHE_ROWS:
+            self._entries[key] = result
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        self._entries.clear()
+        self._version = None
+
+    def __len__(self):
+        return len(self._entries)
+
+def clear_lookup_cache(conn):
+    """Empty the lookup cache of a connection, if it has one"""
+    cache = getattr(conn, 'lookup_cache', None)
+    if cache is not None:
+        cache.clear()
+
+def enable_lookup_cache(conn, max_size=LOOKUP_CACHE_SIZE):
+    """Give a connection a lookup cache, used by reads made with cached=True, and return it"""
+    conn.lookup_cache = LookupCache(conn, max_size)
+    return conn.lookup_cache
+
+@contextmanager
+def transaction(conn):
+    """Run a block in one write transaction, deferring the commits made inside it.
+
+    The transaction takes the write lock up front so statements inside the
+    block never wait on other writers, and is rolled back if the block raises.
+    Nested blocks run in a savepoint of the outer transaction, so a nested
+    block that raises undoes its own statements and leaves the outer ones.
+    """
+    if conn.deferred_commits:
+        savepoint = f"nested_{conn.deferred_commits}"
+        conn.execute(f"SAVEPOINT {savepoint}")
+        conn.deferred_commits += 1
+        try:
+            yield conn
+        except BaseException:
+            # Some errors already rolled the whole transaction back
+            if conn.in_transaction:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            clear_lookup_cache(conn)
+            raise
+        finally:
+            conn.deferred_commits -= 1
+        conn.execute(f"RELEASE {savepoint}")
+        return
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    conn.deferred_commits = 1
     try:
+        yield conn
+    except BaseException:
+        conn.deferred_commits = 0
+        conn.rollback()
+        clear_lookup_cache(conn)
+        raise
+    conn.deferred_commits = 0
+    conn.commit()
+
+class ConnectionManager:
+    """Owns the single long-lived connection used by a process"""
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._conn = None
+
+    @property
+    def connection(self):
+        """The shared connection, opened on first use"""
+        if self._conn is None:
+            self._conn = get_connection(self.db_file)
+            enable_lookup_cache(self._conn)
+        return self._conn
+
+    def close(self):
+        """Commit outstanding work and close the connection"""
+        if self._conn is None:
+            return
+        try:
+            self._conn.commit()
+            self._conn.execute("PRAGMA optimize")
+        finally:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self._conn is not None:
+            self._conn.rollback()
+        self.close()
+
+WriteResult = namedtuple('WriteResult', ['rowcount', 'lastrowid'])
+
+class WriteBehindQueue:
+    """Background writer that merges queued statements into group commits.
+
+    submit() returns a Future resolved with a WriteResult once the commit
+    holding the write is durable, or with the sqlite3.Error that the statement
+    or its commit raised. Writes wait at most max_delay seconds for others to
+    join their commit. close() flushes everything still queued, and is also
+    run at interpreter exit.
+    """
+
+    def __init__(self, db_file, max_delay=WRITE_DELAY, max_batch=WRITE_BATCH, max_pending=WRITE_QUEUE_SIZE):
+        self.db_file = db_file
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.commits = 0
+        self.writes = 0
+        self._queue = queue.Queue(max_pending)
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, query, params=()):
+        """Queue a write and return a Future of its WriteResult"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Write-behind queue is closed.")
+            # Blocks while the queue is full, pushing back on the callers
+            self._queue.put((future, query, params))
+        return future
+
+    def close(self):
+        """Flush queued writes, then stop the writer thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        conn = get_connection(self.db_file)
+        try:
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + self.max_delay
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                self._commit_batch(conn, batch)
+            # Writes queued behind the stop marker by racing submitters
+            while not self._queue.empty():
+                item = self._queue.get()
+                if item is not None:
+                    self._commit_batch(conn, [item])
+        finally:
+            conn.close()
+
+    def _commit_batch(self, conn, batch):
+        batch = [item for item in batch if item[0].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        done = []
+        try:
+            run_with_retry(lambda: conn.execute("BEGIN IMMEDIATE"))
+            for future, query, params in batch:
+                # One savepoint per write so a failing statement leaves the rest of the group intact
+                conn.execute("SAVEPOINT write_behind")
+                try:
+                    start = time.perf_counter()
+                    c = conn.execute(query, params)
+                    if _query_hooks:
+                        _notify(conn, query, params, time.perf_counter() - start, c.rowcount)
+                    done.append((future, WriteResult(c.rowcount, c.lastrowid)))
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO write_behind")
+                    future.set_exception(e)
+                finally:
+                    conn.execute("RELEASE write_behind")
+            conn.commit()
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            for future, _, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.commits += 1
+        self.writes += len(done)
+        for future, result in done:
+            future.set_result(result)
+
+def is_busy_error(error):
+    """True if an OperationalError means the database is locked or busy"""
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+def run_with_retry(operation, on_busy=None):
+    """Run operation(), retrying with exponential backoff while the database is locked"""
+    for attempt in range(LOCK_RETRIES + 1):
+        try:
+            return operation()
+        except sqlite3.OperationalError as e:
+            if attempt == LOCK_RETRIES or not is_busy_error(e):
+                raise
+            if on_busy:
+                on_busy()
+            time.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+# Query hooks are called as hook(conn, query, params, elapsed, rows) after every
+# statement run through the execute_query helpers; rows is the number of rows
+# returned or changed.
+_query_hooks = []
+
+def add_query_hook(hook):
+    """Register a callable notified after every statement"""
+    _query_hooks.append(hook)
+
+def remove_query_hook(hook):
+    """Unregister a query hook"""
+    if hook in _query_hooks:
+        _query_hooks.remove(hook)
+
+def _notify(conn, query, params, elapsed, rows):
+    for hook in _query_hooks:
+        hook(conn, query, params, elapsed, rows)
+
+def execute_query(conn, query, params=()):
+    """Run a write statement, commit it and return its cursor"""
+    def operation():
         c = conn.cursor()
         c.execute(query, params)
         conn.commit()
-        return True
-    except sqlite3.IntegrityError as e:
-        print(f"Integrity Error: {e}")
-        return False
-    except sqlite3.Error as e:
-        print(f"Database Error: {e}")
-        return False
-
-def execute_query_fetchall(conn, query, params=()):
+        return c
+    start = time.perf_counter()
     try:
-        c = conn.cursor()
-        c.execute(query, params)
-        rows = c.fetchall()
-        return rows
-    except sqlite3.Error as e:
-        print(f"Database Error: {e}")
-        return []
+        c = run_with_retry(operation, on_busy=conn.rollback)
+    except sqlite3.Error:
+        # A failed write must not leave its transaction, and the write lock, open
+        if not getattr(conn, 'deferred_commits', 0):
+            conn.rollback()
+        raise
+    if _query_hooks:
+        _notify(conn, query, params, time.perf_counter() - start, c.rowcount)
+    return c
+
+def execute_query_fetchall(conn, query, params=(), cached=False):
+    cache = getattr(conn, 'lookup_cache', None) if cached else None
+    if cache is not None:
+        return cache.get((query, tuple(params), 'all'), lambda: execute_query_fetchall(conn, query, params))
+    start = time.perf_counter()
+    rows = run_with_retry(lambda: conn.execute(query, params).fetchall())
+    if _query_hooks:
+        _notify(conn, query, params, time.perf_counter() - start, len(rows))
+    return rows
 
-def execute_query_fetchone(conn, query, params=()):
+def execute_query_fetchone(conn, query, params=(), cached=False):
+    cache = getattr(conn, 'lookup_cache', None) if cached else None
+    if cache is not None:
+        return cache.get((query, tuple(params), 'one'), lambda: execute_query_fetchone(conn, query, params))
+    start = time.perf_counter()
+    row = run_with_retry(lambda: conn.execute(query, params).fetchone())
+    if _query_hooks:
+        _notify(conn, query, params, time.perf_counter() - start, 0 if row is None else 1)
+    return row
+
+def iter_query(conn, query, params=(), size=FETCH_SIZE, row_type=None):
+    """Stream rows from a query in chunks of size rows, as row_type instances if given"""
+    # Only time spent inside sqlite counts towards the hooks, not the consumer's
+    elapsed = 0.0
+    count = 0
+    failed = False
     try:
-        c = conn.cursor()
-        c.execute(query, params)
-        row = c.fetchone()
-        return row
-    except sqlite3.Error as e:
-        print(f"Database Error: {e}")
-        return None
+        start = time.perf_counter()
+        c = run_with_retry(lambda: conn.execute(query, params))
+        if row_type is not None:
+            c.row_factory = row_factory(row_type)
+        while True:
+            rows = c.fetchmany(size)
+            elapsed += time.perf_counter() - start
+            if not rows:
+                break
+            count += len(rows)
+            yield from rows
+            start = time.perf_counter()
+    except sqlite3.Error:
+        failed = True
+        raise
+    finally:
+        # Also reached when the consumer stops early
+        if _query_hooks and not failed:
+            _notify(conn, query, params, elapsed, count)
 
+def keyset_page(query, after_id=0, limit=None, params=()):
+    """Add keyset pagination on id to a query without a WHERE clause"""
+    query = f"{query} WHERE id > ? ORDER BY id LIMIT ?"
+    return query, tuple(params) + (after_id or 0, limit if limit else -1)
@@ -0,0 +1,113 @@
+import random
+from datetime import date, timedelta
+import click
+from database import initialize_database, get_connection
+
+# Vocabulary for realistic names
+BRANDS = ['Jameson', 'Smirnoff', 'Absolut', 'Johnnie Walker', 'Jack Daniels', 'Bacardi', 'Captain Morgan',
+          'Hennessy', 'Gordons', 'Tanqueray', 'Glenfiddich', 'Jose Cuervo', 'Patron', 'Baileys',
+          'Grey Goose', 'Bombay Sapphire', 'Chivas Regal', 'Famous Grouse', 'Malibu', 'Martell']
+CATEGORIES = ['Irish Whiskey', 'Vodka', 'Scotch Whisky', 'Bourbon', 'White Rum', 'Spiced Rum', 'Cognac',
+              'London Dry Gin', 'Single Malt', 'Tequila', 'Cream Liqueur', 'Red Wine', 'White Wine', 'Lager']
+SIZES = ['200ml', '350ml', '500ml', '750ml', '1L', '1.75L']
+SUPPLIER_WORDS = ['ABC', 'XYZ', 'Premier', 'Coastal', 'Highland', 'Metro', 'United', 'Golden', 'Royal', 'Summit']
+SUPPLIER_KINDS = ['Liquors', 'Distributors', 'Wines & Spirits', 'Beverages', 'Imports', 'Trading']
+FIRST_NAMES = ['John', 'Jane', 'Aisha', 'Peter', 'Grace', 'David', 'Mary', 'Brian', 'Faith', 'Kevin']
+LAST_NAMES = ['Doe', 'Smith', 'Otieno', 'Kamau', 'Wanjiru', 'Brown', 'Mwangi', 'Njoroge', 'Achieng', 'Kiptoo']
+STREETS = ['Main Street', 'Elm Street', 'Moi Avenue', 'Kenyatta Avenue', 'River Road', 'Ngong Road']
+VENUES = ['Bar & Grill', 'Lounge', 'Pub', 'Restaurant', 'Hotel', 'Club', 'Bistro']
+STATUSES = ['Pending', 'Dispatched', 'In transit', 'Delivered', 'Delayed', 'Cancelled']
+
+START_DATE = date(2024, 1, 1)
+BATCH_SIZE = 10000
+
+
+def scale_counts(scale):
+    """Row counts per table for a scale point (the number of orders)"""
+    return {
+        'suppliers': max(5, scale // 200),
+        'items': max(10, scale // 2),
+        'orders': scale,
+        'logistics': scale,
+    }
+
+
+def generate_suppliers(rng, count):
+    """Yield (name, contact_name, contact_phone, address) rows"""
+    for i in range(count):
+        name = f"{rng.choice(SUPPLIER_WORDS)} {rng.choice(SUPPLIER_KINDS)} {i + 1}"
+        contact = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        phone = f"{rng.randint(100, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+        address = f"{rng.randint(1, 999)} {rng.choice(STREETS)}"
+        yield name, contact, phone, address
+
+
+def generate_items(rng, count, suppliers):
+    """Yield (name, price, supplier_id) rows"""
+    for _ in range(count):
+        name = f"{rng.choice(BRANDS)} {rng.choice(CATEGORIES)} {rng.choice(SIZES)}"
+        price = round(rng.lognormvariate(3.5, 0.6), 2)
+        yield name, price, rng.randint(1, suppliers)
+
+
+def generate_orders(rng, count, suppliers, days=365):
+    """Yield (customer_name, order_date, total_amount, supplier_id) rows"""
+    for _ in range(count):
+        customer = f"{rng.choice(LAST_NAMES)} {rng.choice(VENUES)}"
+        order_date = (START_DATE + timedelta(days=rng.randrange(days))).isoformat()
+        total = round(rng.lognormvariate(6, 1), 2)
+        yield customer, order_date, total, rng.randint(1, suppliers)
+
+
+def generate_logistics(rng, count, orders, suppliers, days=365):
+    """Yield (order_id, supplier_id, dispatch_date, arrival_date, status) rows"""
+    for _ in range(count):
+        dispatch = START_DATE + timedelta(days=rng.randrange(days))
+        arrival = dispatch + timedelta(days=max(1, int(rng.gammavariate(2, 2))))
+        yield (rng.randint(1, orders), rng.randint(1, suppliers), dispatch.isoformat(),
+               arrival.isoformat(), rng.choice(STATUSES))
+
+
+def _insert(conn, query, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.executemany(query, batch)
+            batch = []
+    if batch:
+        conn.executemany(query, batch)
+    conn.commit()
+
+
+def populate(conn, scale, seed=0):
+    """Fill an empty database with deterministic data for a scale point"""
+    rng = random.Random(seed)
+    counts = scale_counts(scale)
+    _insert(conn, "INSERT INTO suppliers (name, contact_name, contact_phone, address) VALUES (?, ?, ?, ?)",
+            generate_suppliers(rng, counts['suppliers']))
+    _insert(conn, "INSERT INTO items (name, price, supplier_id) VALUES (?, ?, ?)",
+            generate_items(rng, counts['items'], counts['suppliers']))
+    _insert(conn, "INSERT INTO orders (customer_name, order_date, total_amount, supplier_id) VALUES (?, ?, ?, ?)",
+            generate_orders(rng, counts['orders'], counts['suppliers']))
+    _insert(conn, "INSERT INTO logistics (order_id, supplier_id, dispatch_date, arrival_date, status) "
+                  "VALUES (?, ?, ?, ?, ?)",
+            generate_logistics(rng, counts['logistics'], counts['orders'], counts['suppliers']))
+    return counts
+
+
+@click.command()
+@click.argument('db_file', type=click.Path(dir_okay=False))
+@click.option('--scale', default=1000, show_default=True, type=click.IntRange(min=1), help='Number of orders to generate.')
+@click.option('--seed', default=0, show_default=True, help='Random seed.')
+def main(db_file, scale, seed):
+    """Fill DB_FILE with synthetic suppliers, items, orders and shipments"""
+    initialize_database(db_file)
+    conn = get_connection(db_file)
+    counts = populate(conn, scale, seed)
+    conn.close()
+    click.echo(', '.join(f"{count} {table}" for table, count in counts.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import re
+from datetime import date, datetime, timedelta, timezone
+
+# Accepted input formats besides ISO-8601, tried in order. Day-first is
+# assumed for numeric dates with the year last.
+DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%d %b %Y', '%d %B %Y', '%b %d %Y', '%B %d %Y')
+
+_RELATIVE_DAYS = {'today': 0, 'yesterday': -1, 'tomorrow': 1}
+_DAYS_AGO = re.compile(r'^(\d+) days? ago$')
+_IN_DAYS = re.compile(r'^in (\d+) days?$')
+_ISO_DATETIME = re.compile(r'^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}.*)?$')
+
+# A bare date given where a timestamp is expected stands for the end of that day
+END_OF_DAY = ' 23:59:59.999'
+
+
+def parse_date(value, today=None):
+    """Parse a date in any accepted format and return a datetime.date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = ' '.join(str(value).replace(',', ' ').split())
+    lowered = text.lower()
+    today = today or date.today()
+    if lowered in _RELATIVE_DAYS:
+        return today + timedelta(days=_RELATIVE_DAYS[lowered])
+    match = _DAYS_AGO.match(lowered) or _IN_DAYS.match(lowered)
+    if match:
+        days = int(match.group(1))
+        return today + timedelta(days=-days if match.re is _DAYS_AGO else days)
+    if _ISO_DATETIME.match(text):
+        try:
+            # ISO dates, optionally with a time part which is dropped
+            return date.fromisoformat(text[:10])
+        except ValueError:
+            pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: {value!r}")
+
+
+def normalize_date(value, today=None):
+    """Return a date as an ISO-8601 'YYYY-MM-DD' string, or None for empty values"""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    return parse_date(value, today).isoformat()
+
+
+def normalize_timestamp(value, today=None):
+    """Return a UTC timestamp as 'YYYY-MM-DD HH:MM:SS.SSS', the format the ledger tables store.
+
+    A bare date, in any accepted format, means the end of that day.
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(sep=' ', timespec='milliseconds')
+    if isinstance(value, str) and _ISO_DATETIME.match(value.strip()) and len(value.strip()) > 10:
+        try:
+            return normalize_timestamp(datetime.fromisoformat(value.strip()))
+        except ValueError:
+            raise ValueError(f"Unrecognized timestamp: {value!r}")
+    return normalize_date(value, today) + END_OF_DAY
@@ -0,0 +1,191 @@
+import csv
+import json
+import os
+import sqlite3
+import time
+from collections import namedtuple
+from dates import normalize_date
+
+# Column specs per table: (column, converter, required)
+IMPORT_SPECS = {
+    'suppliers': (
+        ('name', str, True),
+        ('contact_name', str, False),
+        ('contact_phone', str, False),
+        ('address', str, False),
+    ),
+    'items': (
+        ('name', str, True),
+        ('price', float, False),
+        ('supplier_id', int, False),
+    ),
+    'orders': (
+        ('customer_name', str, True),
+        ('order_date', normalize_date, False),
+        ('total_amount', float, False),
+        ('supplier_id', int, False),
+    ),
+    'logistics': (
+        ('order_id', int, True),
+        ('supplier_id', int, False),
+        ('dispatch_date', normalize_date, False),
+        ('arrival_date', normalize_date, False),
+        ('status', str, False),
+    ),
+}
+
+DEFAULT_BATCH_SIZE = 1000
+
+ImportResult = namedtuple('ImportResult', ['inserted', 'rejected', 'seconds'])
+
+
+def rows_per_second(result):
+    """Throughput of an import result"""
+    if result.seconds <= 0:
+        return float(result.inserted)
+    return result.inserted / result.seconds
+
+
+def detect_format(path):
+    """Guess the input format from the file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.jsonl', '.ndjson', '.json'):
+        return 'jsonl'
+    return 'csv'
+
+
+def read_rows(path, fmt=None):
+    """Stream (line_number, row_dict) pairs from a CSV or JSONL file"""
+    fmt = fmt or detect_format(path)
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield line_num, ValueError(f"Invalid JSON: {e}")
+                    continue
+                if not isinstance(row, dict):
+                    row = ValueError("Expected a JSON object")
+                yield line_num, row
+
+
+def validate_row(table, row):
+    """Convert a raw row to a parameter tuple, raising ValueError if invalid"""
+    params = []
+    for column, type_, required in IMPORT_SPECS[table]:
+        value = row.get(column)
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == '':
+            if required:
+                raise ValueError(f"Missing required field '{column}'")
+            params.append(None)
+            continue
+        try:
+            params.append(type_(value))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid value for '{column}': {value!r}")
+    return tuple(params)
+
+
+def _insert_batch(conn, query, batch, reject):
+    """Write one batch in a single transaction, isolating rows that break a constraint.
+
+    Inside an enclosing transaction the batch is only released into it, and
+    the caller commits. Errors other than constraint failures (a locked
+    database, a full disk) undo the batch and propagate.
+    """
+    # A savepoint rather than a rollback, so an enclosing transaction survives
+    outer = conn.in_transaction
+    conn.execute("SAVEPOINT import_batch")
+    try:
+        try:
+            conn.executemany(query, [params for _, _, params in batch])
+            inserted = len(batch)
+        except sqlite3.IntegrityError:
+            conn.execute("ROLLBACK TO import_batch")
+            inserted = 0
+            for line_num, row, params in batch:
+                try:
+                    conn.execute(query, params)
+                    inserted += 1
+                except sqlite3.IntegrityError as e:
+                    reject(line_num, row, str(e))
+    except sqlite3.Error:
+        # Some errors already rolled the whole transaction back
+        if conn.in_transaction:
+            conn.execute("ROLLBACK TO import_batch")
+            conn.execute("RELEASE import_batch")
+        raise
+    conn.execute("RELEASE import_batch")
+    if not outer:
+        conn.commit()
+    return inserted
+
+
+def import_rows(conn, table, rows, batch_size=DEFAULT_BATCH_SIZE, reject=None, progress=None):
+    """Validate and insert rows into a table in batched transactions.
+
+    rows is an iterable of (line_number, row_dict) pairs as produced by
+    read_rows. Invalid rows are passed to reject(line_number, row, error)
+    instead of aborting the load.
+    """
+    columns = [column for column, _, _ in IMPORT_SPECS[table]]
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    rejected = 0
+
+    def on_reject(line_num, row, error):
+        nonlocal rejected
+        rejected += 1
+        if reject:
+            reject(line_num, row, error)
+
+    start = time.perf_counter()
+    inserted = 0
+    batch = []
+    for line_num, row in rows:
+        if isinstance(row, Exception):
+            on_reject(line_num, None, str(row))
+            continue
+        try:
+            batch.append((line_num, row, validate_row(table, row)))
+        except ValueError as e:
+            on_reject(line_num, row, str(e))
+            continue
+        if len(batch) >= batch_size:
+            inserted += _insert_batch(conn, query, batch, on_reject)
+            batch = []
+            if progress:
+                progress(inserted, rejected)
+    if batch:
+        inserted += _insert_batch(conn, query, batch, on_reject)
+        if progress:
+            progress(inserted, rejected)
+    return ImportResult(inserted, rejected, time.perf_counter() - start)
+
+
+def import_file(conn, table, path, fmt=None, batch_size=DEFAULT_BATCH_SIZE, rejects_path=None, progress=None):
+    """Import a CSV/JSONL file, writing rejected rows to a JSONL side file"""
+    if rejects_path is None:
+        rejects_path = path + '.rejects.jsonl'
+    rejects_file = None
+
+    def reject(line_num, row, error):
+        nonlocal rejects_file
+        if rejects_file is None:
+            rejects_file = open(rejects_path, 'w', encoding='utf-8')
+        rejects_file.write(json.dumps({'line': line_num, 'error': error, 'row': row}) + '\n')
+
+    try:
+        return import_rows(conn, table, read_rows(path, fmt), batch_size, reject, progress)
+    finally:
+        if rejects_file is not None:
+            rejects_file.close()
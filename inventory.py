@@ -0,0 +1,128 @@
+from database import execute_query, execute_query_fetchone, iter_query, keyset_page, transaction
+from rows import StockLevel, StockMovement, columns
+
+# Stock is an append-only ledger of signed movements in stock_movements.
+# stock_on_hand holds the running total per item, maintained by a trigger,
+# so current stock is a single-row lookup. stock_snapshots copy stock_on_hand
+# at a ledger position so history is replayed from the nearest snapshot
+# rather than from the first movement.
+
+def _add_movement(conn, item_id, quantity, reason, order_id=None, note=None):
+    query = "INSERT INTO stock_movements (item_id, order_id, quantity, reason, note) VALUES (?, ?, ?, ?, ?)"
+    return execute_query(conn, query, (item_id, order_id, quantity, reason, note)).lastrowid
+
+def _take_movement(conn, item_id, quantity, reason, order_id=None, note=None):
+    # A single conditional insert, so the availability check and the decrement
+    # cannot be split by another writer
+    query = ("INSERT INTO stock_movements (item_id, order_id, quantity, reason, note) "
+             "SELECT item_id, ?, -?, ?, ? FROM stock_on_hand WHERE item_id = ? AND quantity >= ?")
+    c = execute_query(conn, query, (order_id, quantity, reason, note, item_id, quantity))
+    if not c.rowcount:
+        raise ValueError(f"Only {stock_on_hand(conn, item_id)} of item {item_id} in stock, {quantity} requested.")
+    return c.lastrowid
+
+def receive_stock(conn, item_id, quantity, note=None):
+    """Add received stock of an item and return the movement ID"""
+    if quantity <= 0:
+        raise ValueError("Received quantity must be positive.")
+    return _add_movement(conn, item_id, quantity, 'receive', note=note)
+
+def adjust_stock(conn, item_id, quantity, note=None):
+    """Correct the stock of an item by a signed quantity and return the movement ID.
+
+    Raises ValueError if the stock would go below zero.
+    """
+    if quantity == 0:
+        raise ValueError("Adjustment quantity must not be zero.")
+    if quantity < 0:
+        return _take_movement(conn, item_id, -quantity, 'adjust', note=note)
+    return _add_movement(conn, item_id, quantity, 'adjust', note=note)
+
+def stock_on_hand(conn, item_id):
+    """Return the current stock of an item"""
+    row = execute_query_fetchone(conn, "SELECT quantity FROM stock_on_hand WHERE item_id = ?", (item_id,))
+    return row[0] if row else 0
+
+def reserve_stock(conn, order_id, lines):
+    """Reserve stock for an order, all lines or none, and return the movement IDs.
+
+    lines is an iterable of (item_id, quantity) pairs. The reservation runs
+    in one write transaction and raises ValueError for the first line that
+    is short, rolling back the lines before it.
+    """
+    movement_ids = []
+    with transaction(conn):
+        for item_id, quantity in lines:
+            if quantity <= 0:
+                raise ValueError("Reserved quantity must be positive.")
+            movement_ids.append(_take_movement(conn, item_id, quantity, 'reserve', order_id))
+    return movement_ids
+
+def release_stock(conn, order_id):
+    """Return the stock still reserved for an order and the number of items released"""
+    query = ("SELECT item_id, -SUM(quantity) FROM stock_movements WHERE order_id = ? "
+             "AND reason IN ('reserve', 'release') GROUP BY item_id HAVING SUM(quantity) < 0")
+    with transaction(conn):
+        reserved = conn.execute(query, (order_id,)).fetchall()
+        for item_id, quantity in reserved:
+            _add_movement(conn, item_id, quantity, 'release', order_id)
+    return len(reserved)
+
+def iter_stock_levels(conn, after_id=0, limit=None):
+    """Stream StockLevel rows for every item in item id order"""
+    query = ("SELECT id AS item_id, name, COALESCE((SELECT quantity FROM stock_on_hand WHERE item_id = items.id), 0) "
+             "AS quantity FROM items")
+    query, params = keyset_page(query, after_id, limit)
+    return iter_query(conn, query, params, row_type=StockLevel)
+
+def iter_stock_movements(conn, item_id, after_id=0, limit=None):
+    """Stream the ledger of an item, oldest movement first"""
+    query = (f"SELECT {columns(StockMovement)} FROM stock_movements WHERE item_id = ? AND id > ? "
+             f"ORDER BY id LIMIT ?")
+    return iter_query(conn, query, (item_id, after_id or 0, limit if limit else -1), row_type=StockMovement)
+
+def take_snapshot(conn):
+    """Copy stock_on_hand into a new snapshot and return its ID"""
+    with transaction(conn):
+        last_movement_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM stock_movements").fetchone()[0]
+        snapshot_id = execute_query(conn, "INSERT INTO stock_snapshots (last_movement_id) VALUES (?)",
+                                    (last_movement_id,)).lastrowid
+        conn.execute("INSERT INTO stock_snapshot_items (snapshot_id, item_id, quantity) "
+                     "SELECT ?, item_id, quantity FROM stock_on_hand WHERE quantity != 0", (snapshot_id,))
+    return snapshot_id
+
+def _latest_snapshot(conn, movement_id=None):
+    row = conn.execute("SELECT id, last_movement_id FROM stock_snapshots WHERE last_movement_id <= ? "
+                       "ORDER BY last_movement_id DESC, id DESC LIMIT 1",
+                       (movement_id if movement_id is not None else 2 ** 63 - 1,)).fetchone()
+    return row if row else (None, 0)
+
+def stock_as_of(conn, item_id, movement_id):
+    """Stock of an item just after a ledger position, replayed from the nearest snapshot"""
+    snapshot_id, start = _latest_snapshot(conn, movement_id)
+    base = 0
+    if snapshot_id is not None:
+        row = conn.execute("SELECT quantity FROM stock_snapshot_items WHERE snapshot_id = ? AND item_id = ?",
+                           (snapshot_id, item_id)).fetchone()
+        base = row[0] if row else 0
+    replayed = conn.execute("SELECT COALESCE(SUM(quantity), 0) FROM stock_movements "
+                            "WHERE item_id = ? AND id > ? AND id <= ?", (item_id, start, movement_id)).fetchone()[0]
+    return base + replayed
+
+def verify_stock(conn):
+    """Compare stock_on_hand with the latest snapshot plus the movements since.
+
+    Returns (item_id, on_hand, replayed) for every item that differs.
+    """
+    snapshot_id, start = _latest_snapshot(conn)
+    expected = {}
+    if snapshot_id is not None:
+        expected.update(conn.execute("SELECT item_id, quantity FROM stock_snapshot_items WHERE snapshot_id = ?",
+                                     (snapshot_id,)))
+    for item_id, quantity in conn.execute("SELECT item_id, SUM(quantity) FROM stock_movements WHERE id > ? "
+                                          "GROUP BY item_id", (start,)):
+        expected[item_id] = expected.get(item_id, 0) + quantity
+    actual = dict(conn.execute("SELECT item_id, quantity FROM stock_on_hand"))
+    return [(item_id, actual.get(item_id, 0), expected.get(item_id, 0))
+            for item_id in sorted(set(expected) | set(actual))
+            if actual.get(item_id, 0) != expected.get(item_id, 0)]
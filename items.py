@@ -1,44 +1,103 @@
-from database import execute_query, execute_query_fetchall
+from bulk import preview
+from database import execute_query, execute_query_fetchall, execute_query_fetchone, iter_query, keyset_page
+from dates import END_OF_DAY, normalize_timestamp
+from rows import Item, PricePoint, columns
+from search import build_fuzzy_search, build_search
 
 def add_item(conn, name, price, supplier_id):
-    """Add a new item"""
+    """Add a new item and return its ID"""
     query = "INSERT INTO items (name, price, supplier_id) VALUES (?, ?, ?)"
     params = (name, price, supplier_id)
-    if execute_query(conn, query, params):
-        print("Item added successfully.")
-    else:
-        print("Failed to add item.")
+    return execute_query(conn, query, params).lastrowid
 
 def update_item(conn, item_id, name, price, supplier_id):
-    """Update an item"""
+    """Update an item, returning False if it does not exist"""
     query = "UPDATE items SET name = ?, price = ?, supplier_id = ? WHERE id = ?"
     params = (name, price, supplier_id, item_id)
-    if execute_query(conn, query, params):
-        print(f"Item with ID '{item_id}' updated successfully.")
-    else:
-        print(f"Failed to update item with ID '{item_id}'.")
-
-def list_items(conn):
-    """List all items"""
-    query = "SELECT * FROM items"
-    items = execute_query_fetchall(conn, query)
-    for item in items:
-        print(item)
-
-def search_items(conn, keyword):
-    """Search items by keyword"""
-    query = "SELECT * FROM items WHERE name LIKE ?"
-    params = (f"%{keyword}%",)
-    items = execute_query_fetchall(conn, query, params)
-    for item in items:
-        print(item)
+    return execute_query(conn, query, params).rowcount > 0
+
+def reprice_items(conn, supplier_id, percent, dry_run=False):
+    """Change the price of every item of a supplier by percent in one statement.
+
+    Returns the number of items repriced, or with dry_run a Preview of them.
+    """
+    where, params = "supplier_id = ? AND price IS NOT NULL", (supplier_id,)
+    if dry_run:
+        return preview(conn, 'items', where, params)
+    query = f"UPDATE items SET price = ROUND(price * (100 + ?) / 100.0, 2) WHERE {where}"
+    return execute_query(conn, query, (percent,) + params).rowcount
+
+def get_item(conn, item_id):
+    """Return an item by ID, or None if it does not exist"""
+    query = f"SELECT {columns(Item)} FROM items WHERE id = ?"
+    row = execute_query_fetchone(conn, query, (item_id,), cached=True)
+    return Item._make(row) if row else None
+
+def iter_items(conn, after_id=0, limit=None):
+    """Stream items in id order, starting after after_id"""
+    query, params = keyset_page(f"SELECT {columns(Item)} FROM items", after_id, limit)
+    return iter_query(conn, query, params, row_type=Item)
+
+def list_items(conn, after_id=0, limit=None):
+    """Return all items as a list"""
+    return list(iter_items(conn, after_id, limit))
+
+def iter_search_items(conn, keyword, limit=None, fuzzy=False):
+    """Stream items matching keyword, best matches first; fuzzy matches misspelt names by trigrams"""
+    build = build_fuzzy_search if fuzzy else build_search
+    query, params = build(conn, 'items', keyword, limit, columns(Item))
+    return iter_query(conn, query, params, row_type=Item)
+
+def search_items(conn, keyword, limit=None, fuzzy=False):
+    """Return the items matching keyword as a list"""
+    return list(iter_search_items(conn, keyword, limit, fuzzy))
+
+# Item IDs looked up per statement by prices_as_of and order_prices
+PRICE_LOOKUP_BATCH = 500
+
+# Price in effect at a timestamp: the latest change at or before it, one index seek per item
+_PRICE_AS_OF = ("SELECT price FROM item_prices WHERE item_id = {item} AND effective_from <= {as_of} "
+                "ORDER BY effective_from DESC, id DESC LIMIT 1")
+
+def iter_price_history(conn, item_id):
+    """Stream the price changes of an item, oldest first"""
+    query = f"SELECT {columns(PricePoint)} FROM item_prices WHERE item_id = ? ORDER BY effective_from, id"
+    return iter_query(conn, query, (item_id,), row_type=PricePoint)
+
+def price_as_of(conn, item_id, as_of):
+    """Return the price of an item at a timestamp (a bare date means the end of that day), None if unknown"""
+    row = execute_query_fetchone(conn, _PRICE_AS_OF.format(item='?', as_of='?'), (item_id, normalize_timestamp(as_of)))
+    return row[0] if row else None
+
+def prices_as_of(conn, item_ids, as_of):
+    """Return {item_id: price} at a timestamp for many items, None for items without a price then"""
+    as_of = normalize_timestamp(as_of)
+    item_ids = list(dict.fromkeys(item_ids))
+    prices = {}
+    for start in range(0, len(item_ids), PRICE_LOOKUP_BATCH):
+        batch = item_ids[start:start + PRICE_LOOKUP_BATCH]
+        values = ', '.join('(?)' for _ in batch)
+        query = (f"WITH ids(item_id) AS (VALUES {values}) "
+                 f"SELECT item_id, ({_PRICE_AS_OF.format(item='ids.item_id', as_of='?')}) FROM ids")
+        prices.update(execute_query_fetchall(conn, query, batch + [as_of]))
+    return prices
+
+def order_prices(conn, order_ids):
+    """Return {(order_id, item_id): price} for the items reserved for each order, as of its order date"""
+    order_ids = list(dict.fromkeys(order_ids))
+    prices = {}
+    for start in range(0, len(order_ids), PRICE_LOOKUP_BATCH):
+        batch = order_ids[start:start + PRICE_LOOKUP_BATCH]
+        placeholders = ', '.join('?' for _ in batch)
+        price = _PRICE_AS_OF.format(item='lines.item_id', as_of=f"lines.order_date || '{END_OF_DAY}'")
+        query = (f"WITH lines AS (SELECT DISTINCT m.order_id, m.item_id, o.order_date FROM orders o "
+                 f"JOIN stock_movements m ON m.order_id = o.id AND m.reason = 'reserve' WHERE o.id IN ({placeholders})) "
+                 f"SELECT order_id, item_id, ({price}) FROM lines")
+        prices.update(((order_id, item_id), value) for order_id, item_id, value in execute_query_fetchall(conn, query, batch))
+    return prices
 
 def delete_item(conn, item_id):
-    """Delete an item"""
+    """Delete an item, returning False if it does not exist"""
     query = "DELETE FROM items WHERE id = ?"
     params = (item_id,)
-    if execute_query(conn, query, params):
-        print(f"Item with ID '{item_id}' deleted successfully.")
-    else:
-        print(f"Failed to delete item with ID '{item_id}'.")
-
+    return execute_query(conn, query, params).rowcount > 0
@@ -1,44 +1,82 @@
-from database import execute_query, execute_query_fetchall
+from bulk import preview, where_clause
+from database import WriteBehindQueue, execute_query, execute_query_fetchone, iter_query, keyset_page
+from rows import Logistics, columns
+from search import build_search
+from dates import normalize_date
 
 def record_logistics(conn, order_id, supplier_id, dispatch_date, arrival_date, status):
-    """Record logistics details"""
+    """Record logistics details and return the entry ID, raising ValueError for an invalid date.
+
+    Given a WriteBehindQueue instead of a connection, returns a Future of the
+    WriteResult, whose lastrowid is the ID once the batch commits.
+    """
+    dispatch_date = normalize_date(dispatch_date)
+    arrival_date = normalize_date(arrival_date)
     query = "INSERT INTO logistics (order_id, supplier_id, dispatch_date, arrival_date, status) VALUES (?, ?, ?, ?, ?)"
     params = (order_id, supplier_id, dispatch_date, arrival_date, status)
-    if execute_query(conn, query, params):
-        print("Logistics recorded successfully.")
-    else:
-        print("Failed to record logistics.")
+    if isinstance(conn, WriteBehindQueue):
+        return conn.submit(query, params)
+    return execute_query(conn, query, params).lastrowid
 
 def update_logistics(conn, logistics_id, status):
-    """Update logistics details"""
+    """Update logistics details, returning False if the entry does not exist.
+
+    Given a WriteBehindQueue instead of a connection, returns a Future of the
+    WriteResult; a rowcount of 0 means the entry did not exist.
+    """
     query = "UPDATE logistics SET status = ? WHERE id = ?"
     params = (status, logistics_id)
-    if execute_query(conn, query, params):
-        print("Logistics updated successfully.")
-    else:
-        print("Failed to update logistics.")
-
-def list_logistics(conn):
-    """List all logistics entries"""
-    query = "SELECT * FROM logistics"
-    logistics_entries = execute_query_fetchall(conn, query)
-    for entry in logistics_entries:
-        print(entry)
-
-def search_logistics(conn, keyword):
-    """Search logistics entries by keyword"""
-    query = "SELECT * FROM logistics WHERE status LIKE ?"
-    params = (f"%{keyword}%",)
-    logistics_entries = execute_query_fetchall(conn, query, params)
-    for entry in logistics_entries:
-        print(entry)
+    if isinstance(conn, WriteBehindQueue):
+        return conn.submit(query, params)
+    return execute_query(conn, query, params).rowcount > 0
+
+def update_order_logistics(conn, order_id, status, current_status=None, dry_run=False):
+    """Set the status of every shipment of an order in one statement.
+
+    Returns the number of shipments updated, or with dry_run a Preview of them.
+    """
+    where, params = where_clause([("order_id = ?", order_id), ("status = ?", current_status)])
+    if dry_run:
+        return preview(conn, 'logistics', where, params)
+    return execute_query(conn, f"UPDATE logistics SET status = ? WHERE {where}", (status,) + params).rowcount
+
+def get_logistics(conn, logistics_id):
+    """Return a logistics entry by ID, or None if it does not exist"""
+    query = f"SELECT {columns(Logistics)} FROM logistics WHERE id = ?"
+    row = execute_query_fetchone(conn, query, (logistics_id,), cached=True)
+    return Logistics._make(row) if row else None
+
+def iter_logistics(conn, after_id=0, limit=None):
+    """Stream logistics entries in id order, starting after after_id"""
+    query, params = keyset_page(f"SELECT {columns(Logistics)} FROM logistics", after_id, limit)
+    return iter_query(conn, query, params, row_type=Logistics)
+
+def list_logistics(conn, after_id=0, limit=None):
+    """Return all logistics entries as a list"""
+    return list(iter_logistics(conn, after_id, limit))
+
+def iter_logistics_arriving_between(conn, start, end, limit=None):
+    """Stream shipments arriving between two dates (inclusive), earliest first"""
+    query = (f"SELECT {columns(Logistics)} FROM logistics WHERE arrival_date BETWEEN ? AND ? "
+             f"ORDER BY arrival_date, id LIMIT ?")
+    params = (normalize_date(start), normalize_date(end), limit if limit else -1)
+    return iter_query(conn, query, params, row_type=Logistics)
+
+def list_logistics_arriving_between(conn, start, end, limit=None):
+    """Return the shipments arriving between two dates as a list"""
+    return list(iter_logistics_arriving_between(conn, start, end, limit))
+
+def iter_search_logistics(conn, keyword, limit=None):
+    """Stream logistics entries matching keyword, best matches first"""
+    query, params = build_search(conn, 'logistics', keyword, limit, columns(Logistics))
+    return iter_query(conn, query, params, row_type=Logistics)
+
+def search_logistics(conn, keyword, limit=None):
+    """Return the logistics entries matching keyword as a list"""
+    return list(iter_search_logistics(conn, keyword, limit))
 
 def delete_logistics(conn, logistics_id):
-    """Delete logistics entry"""
+    """Delete logistics entry, returning False if it does not exist"""
     query = "DELETE FROM logistics WHERE id = ?"
     params = (logistics_id,)
-    if execute_query(conn, query, params):
-        print("Logistics entry deleted successfully.")
-    else:
-        print("Failed to delete logistics entry.")
-
+    return execute_query(conn, query, params).rowcount > 0
@@ -0,0 +1,479 @@
+import sqlite3
+from dates import normalize_date
+
+# Full-text indexed columns per table, see create_search_indexes
+SEARCH_COLUMNS = {
+    'suppliers': ('name', 'contact_name'),
+    'items': ('name',),
+    'orders': ('customer_name',),
+    'logistics': ('status',),
+}
+
+
+def fts5_available(conn):
+    """True if the sqlite library was built with FTS5"""
+    options = [row[0] for row in conn.execute("PRAGMA compile_options")]
+    return 'ENABLE_FTS5' in options
+
+
+# Schema version of the migration creating the search indexes
+SEARCH_INDEX_VERSION = 4
+
+
+def create_search_indexes(conn):
+    """Create FTS5 shadow tables kept in sync by triggers (skipped without FTS5)"""
+    if not fts5_available(conn):
+        return
+    for table, columns in SEARCH_COLUMNS.items():
+        fts = f"{table}_fts"
+        cols = ', '.join(columns)
+        new_cols = ', '.join(f"new.{column}" for column in columns)
+        old_cols = ', '.join(f"old.{column}" for column in columns)
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                     f"{cols}, content='{table}', content_rowid='id', prefix='2 3')")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN "
+                     f"INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols}); END")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN "
+                     f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {cols} ON {table} BEGIN "
+                     f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+                     f"INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols}); END")
+        conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def search_indexes_missing(conn):
+    """True if the search index migration ran without FTS5 but this sqlite has it"""
+    if get_schema_version(conn) < SEARCH_INDEX_VERSION:
+        return False
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return any(f"{table}_fts" not in existing for table in SEARCH_COLUMNS) and fts5_available(conn)
+
+
+# Date columns stored as ISO-8601 'YYYY-MM-DD' text, see normalize_dates
+DATE_COLUMNS = {
+    'orders': ('order_date',),
+    'logistics': ('dispatch_date', 'arrival_date'),
+}
+
+
+def normalize_dates(conn):
+    """Rewrite parseable dates as YYYY-MM-DD and reject non-ISO dates on future writes"""
+    for table, columns in DATE_COLUMNS.items():
+        for column in columns:
+            rows = conn.execute(f"SELECT id, {column} FROM {table} "
+                                f"WHERE {column} IS NOT NULL AND date({column}) IS NOT {column}").fetchall()
+            updates = []
+            for row_id, value in rows:
+                try:
+                    updates.append((normalize_date(value), row_id))
+                except ValueError:
+                    # Left as is; such rows simply never match a date range
+                    continue
+            conn.executemany(f"UPDATE {table} SET {column} = ? WHERE id = ?", updates)
+            check = (f"NEW.{column} IS NOT NULL AND date(NEW.{column}) IS NOT NEW.{column} "
+                     f"BEGIN SELECT RAISE(ABORT, '{table}.{column} must be a YYYY-MM-DD date'); END")
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_{column}_insert_check "
+                         f"BEFORE INSERT ON {table} WHEN {check}")
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_{column}_update_check "
+                         f"BEFORE UPDATE OF {column} ON {table} WHEN {check}")
+
+
+# Statements recomputing the reporting rollups from the orders table
+ROLLUP_REBUILD = [
+    "DELETE FROM supplier_revenue",
+    """
+    INSERT INTO supplier_revenue (supplier_id, order_count, revenue)
+    SELECT supplier_id, COUNT(*), COALESCE(SUM(total_amount), 0) FROM orders
+    WHERE supplier_id IS NOT NULL GROUP BY supplier_id
+    """,
+    "DELETE FROM daily_sales",
+    """
+    INSERT INTO daily_sales (order_date, order_count, revenue)
+    SELECT order_date, COUNT(*), COALESCE(SUM(total_amount), 0) FROM orders
+    WHERE order_date IS NOT NULL GROUP BY order_date
+    """,
+]
+
+# (rollup table, key column) pairs maintained from orders
+ROLLUPS = (('supplier_revenue', 'supplier_id'), ('daily_sales', 'order_date'))
+
+
+def create_rollups(conn):
+    """Create per-supplier and per-day order rollups kept current by triggers on orders"""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS supplier_revenue (
+        supplier_id INTEGER PRIMARY KEY,
+        order_count INTEGER NOT NULL,
+        revenue REAL NOT NULL
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS daily_sales (
+        order_date TEXT PRIMARY KEY,
+        order_count INTEGER NOT NULL,
+        revenue REAL NOT NULL
+    ) WITHOUT ROWID
+    """)
+    for table, key in ROLLUPS:
+        add = (f"INSERT INTO {table} ({key}, order_count, revenue) "
+               f"SELECT NEW.{key}, 1, COALESCE(NEW.total_amount, 0) WHERE NEW.{key} IS NOT NULL "
+               f"ON CONFLICT ({key}) DO UPDATE SET order_count = order_count + 1, revenue = revenue + excluded.revenue;")
+        remove = (f"UPDATE {table} SET order_count = order_count - 1, revenue = revenue - COALESCE(OLD.total_amount, 0) "
+                  f"WHERE {key} = OLD.{key}; "
+                  f"DELETE FROM {table} WHERE {key} = OLD.{key} AND order_count <= 0;")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS orders_{table}_insert AFTER INSERT ON orders BEGIN {add} END")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS orders_{table}_delete AFTER DELETE ON orders BEGIN {remove} END")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS orders_{table}_update "
+                     f"AFTER UPDATE OF {key}, total_amount ON orders BEGIN {remove} {add} END")
+    for statement in ROLLUP_REBUILD:
+        conn.execute(statement)
+
+
+# Tables whose changes are recorded in the changelog, see create_changelog
+CHANGELOG_TABLES = ('suppliers', 'items', 'orders', 'logistics')
+
+
+def create_changelog(conn):
+    """Create the change-data-capture changelog, fed by triggers and seeded with the existing rows"""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS changelog (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        operation TEXT NOT NULL CHECK (operation IN ('insert', 'update', 'delete')),
+        changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_changelog_row ON changelog (table_name, row_id, seq)")
+    # Compaction horizons and other sync bookkeeping
+    conn.execute("CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    for table in CHANGELOG_TABLES:
+        for operation, event, row in (('insert', 'INSERT', 'NEW'), ('update', 'UPDATE', 'NEW'), ('delete', 'DELETE', 'OLD')):
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_changelog_{operation} AFTER {event} ON {table} BEGIN "
+                         f"INSERT INTO changelog (table_name, row_id, operation) VALUES ('{table}', {row}.id, '{operation}'); END")
+        conn.execute(f"INSERT INTO changelog (table_name, row_id, operation) SELECT '{table}', id, 'insert' FROM {table} "
+                     f"ORDER BY id")
+
+
+# Name columns with a trigram index for fuzzy search, see create_trigram_indexes
+TRIGRAM_COLUMNS = {
+    'suppliers': 'name',
+    'items': 'name',
+}
+
+# Names are indexed up to this many trigrams (characters + 1)
+MAX_TRIGRAMS = 200
+
+
+def trigrams_sql(value):
+    """Return SQL selecting the distinct trigrams of an SQL expression, lowercased and padded.
+
+    Pure SQL over trigram_positions, as triggers cannot use recursive CTEs;
+    search uses the same expression so both sides split names alike.
+    """
+    padded = f"('  ' || lower(trim({value})) || ' ')"
+    return (f"SELECT DISTINCT substr({padded}, n, 3) AS trigram FROM trigram_positions "
+            f"WHERE n <= length({padded}) - 2")
+
+
+def create_trigram_indexes(conn):
+    """Create the inverted trigram index over TRIGRAM_COLUMNS, kept in sync by triggers"""
+    conn.execute("CREATE TABLE IF NOT EXISTS trigram_positions (n INTEGER PRIMARY KEY)")
+    conn.execute(f"WITH RECURSIVE p(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM p WHERE n < {MAX_TRIGRAMS}) "
+                 f"INSERT OR IGNORE INTO trigram_positions SELECT n FROM p")
+    # One posting per (trigram, row); a lookup reads only the postings of the searched trigrams
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS name_trigrams (
+        table_name TEXT NOT NULL,
+        trigram TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        PRIMARY KEY (table_name, trigram, row_id)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS name_trigram_counts (
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        trigrams INTEGER NOT NULL,
+        PRIMARY KEY (table_name, row_id)
+    ) WITHOUT ROWID
+    """)
+    for table, column in TRIGRAM_COLUMNS.items():
+        add = (f"INSERT INTO name_trigrams (table_name, trigram, row_id) "
+               f"SELECT '{table}', trigram, NEW.id FROM ({trigrams_sql(f'NEW.{column}')}); "
+               f"INSERT INTO name_trigram_counts (table_name, row_id, trigrams) "
+               f"SELECT '{table}', NEW.id, COUNT(*) FROM ({trigrams_sql(f'NEW.{column}')});")
+        remove = (f"DELETE FROM name_trigrams WHERE table_name = '{table}' AND trigram IN "
+                  f"({trigrams_sql(f'OLD.{column}')}) AND row_id = OLD.id; "
+                  f"DELETE FROM name_trigram_counts WHERE table_name = '{table}' AND row_id = OLD.id;")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_trigrams_insert AFTER INSERT ON {table} BEGIN {add} END")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_trigrams_delete AFTER DELETE ON {table} BEGIN {remove} END")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_trigrams_update AFTER UPDATE OF {column} ON {table} "
+                     f"BEGIN {remove} {add} END")
+        padded = f"('  ' || lower(trim({column})) || ' ')"
+        conn.execute(f"INSERT INTO name_trigrams (table_name, trigram, row_id) "
+                     f"SELECT DISTINCT '{table}', substr({padded}, n, 3), id FROM {table} "
+                     f"JOIN trigram_positions ON n <= length({padded}) - 2")
+        conn.execute(f"INSERT INTO name_trigram_counts (table_name, row_id, trigrams) "
+                     f"SELECT '{table}', row_id, COUNT(*) FROM name_trigrams WHERE table_name = '{table}' "
+                     f"GROUP BY row_id")
+
+
+# Ordered schema migrations. The database's PRAGMA user_version records the
+# last migration applied; each entry is (version, description, steps) where a
+# step is an SQL statement or a callable taking the connection.
+MIGRATIONS = [
+    (1, "create base tables", [
+        """
+        CREATE TABLE IF NOT EXISTS suppliers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            contact_name TEXT,
+            contact_phone TEXT,
+            address TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            price REAL,
+            supplier_id INTEGER,
+            FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            customer_name TEXT NOT NULL,
+            order_date TEXT,
+            total_amount REAL,
+            supplier_id INTEGER,
+            FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS logistics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER,
+            supplier_id INTEGER,
+            dispatch_date TEXT,
+            arrival_date TEXT,
+            status TEXT,
+            FOREIGN KEY (order_id) REFERENCES orders (id),
+            FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
+        )
+        """,
+    ]),
+    (2, "add orders.status", [
+        "ALTER TABLE orders ADD COLUMN status TEXT",
+    ]),
+    (3, "index foreign keys, dates and statuses", [
+        "CREATE INDEX IF NOT EXISTS idx_items_supplier_id ON items (supplier_id)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_supplier_id ON orders (supplier_id)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_order_date ON orders (order_date)",
+        "CREATE INDEX IF NOT EXISTS idx_logistics_order_id ON logistics (order_id)",
+        "CREATE INDEX IF NOT EXISTS idx_logistics_supplier_id ON logistics (supplier_id)",
+        "CREATE INDEX IF NOT EXISTS idx_logistics_status ON logistics (status)",
+    ]),
+    (4, "full-text search indexes", [
+        create_search_indexes,
+    ]),
+    (5, "index names for the supplier and order pickers", [
+        "CREATE INDEX IF NOT EXISTS idx_suppliers_name ON suppliers (name COLLATE NOCASE)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_customer_name ON orders (customer_name COLLATE NOCASE)",
+    ]),
+    (6, "normalize dates and index shipment dates", [
+        normalize_dates,
+        "CREATE INDEX IF NOT EXISTS idx_logistics_arrival_date ON logistics (arrival_date)",
+        "CREATE INDEX IF NOT EXISTS idx_logistics_dispatch_date ON logistics (dispatch_date)",
+    ]),
+    (7, "supplier revenue and daily sales rollups", [
+        create_rollups,
+    ]),
+    (8, "inventory ledger, stock on hand and snapshots", [
+        """
+        CREATE TABLE IF NOT EXISTS stock_movements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_id INTEGER NOT NULL,
+            order_id INTEGER,
+            quantity INTEGER NOT NULL CHECK (quantity != 0),
+            reason TEXT NOT NULL CHECK (reason IN ('receive', 'adjust', 'reserve', 'release')),
+            note TEXT,
+            created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+            FOREIGN KEY (item_id) REFERENCES items (id),
+            FOREIGN KEY (order_id) REFERENCES orders (id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_stock_movements_item_id ON stock_movements (item_id, id)",
+        "CREATE INDEX IF NOT EXISTS idx_stock_movements_order_id ON stock_movements (order_id)",
+        # The ledger is append-only; corrections are new 'adjust' movements
+        "CREATE TRIGGER IF NOT EXISTS stock_movements_no_update BEFORE UPDATE ON stock_movements "
+        "BEGIN SELECT RAISE(ABORT, 'stock_movements is append-only'); END",
+        "CREATE TRIGGER IF NOT EXISTS stock_movements_no_delete BEFORE DELETE ON stock_movements "
+        "BEGIN SELECT RAISE(ABORT, 'stock_movements is append-only'); END",
+        """
+        CREATE TABLE IF NOT EXISTS stock_on_hand (
+            item_id INTEGER PRIMARY KEY,
+            quantity INTEGER NOT NULL CHECK (quantity >= 0),
+            last_movement_id INTEGER NOT NULL,
+            FOREIGN KEY (item_id) REFERENCES items (id)
+        )
+        """,
+        # A movement taking stock below zero fails the CHECK and is rolled back with its statement
+        # (not an UPSERT, whose CHECK would see the bare negative quantity of the movement)
+        "CREATE TRIGGER IF NOT EXISTS stock_movements_on_hand AFTER INSERT ON stock_movements BEGIN "
+        "UPDATE stock_on_hand SET quantity = quantity + NEW.quantity, last_movement_id = NEW.id "
+        "WHERE item_id = NEW.item_id; "
+        "INSERT INTO stock_on_hand (item_id, quantity, last_movement_id) SELECT NEW.item_id, NEW.quantity, NEW.id "
+        "WHERE NOT EXISTS (SELECT 1 FROM stock_on_hand WHERE item_id = NEW.item_id); END",
+        """
+        CREATE TABLE IF NOT EXISTS stock_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            taken_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+            last_movement_id INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS stock_snapshot_items (
+            snapshot_id INTEGER NOT NULL,
+            item_id INTEGER NOT NULL,
+            quantity INTEGER NOT NULL,
+            PRIMARY KEY (snapshot_id, item_id),
+            FOREIGN KEY (snapshot_id) REFERENCES stock_snapshots (id)
+        ) WITHOUT ROWID
+        """,
+    ]),
+    (9, "change-data-capture changelog", [
+        create_changelog,
+    ]),
+    (10, "trigram indexes for fuzzy name search", [
+        create_trigram_indexes,
+    ]),
+    (11, "item price history", [
+        """
+        CREATE TABLE IF NOT EXISTS item_prices (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_id INTEGER NOT NULL,
+            price REAL,
+            effective_from TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+            FOREIGN KEY (item_id) REFERENCES items (id) ON DELETE CASCADE
+        )
+        """,
+        # An as-of lookup is one descending seek per item
+        "CREATE INDEX IF NOT EXISTS idx_item_prices_item_id ON item_prices (item_id, effective_from)",
+        "CREATE TRIGGER IF NOT EXISTS items_price_insert AFTER INSERT ON items WHEN NEW.price IS NOT NULL BEGIN "
+        "INSERT INTO item_prices (item_id, price) VALUES (NEW.id, NEW.price); END",
+        "CREATE TRIGGER IF NOT EXISTS items_price_update AFTER UPDATE OF price ON items "
+        "WHEN NEW.price IS NOT OLD.price BEGIN "
+        "INSERT INTO item_prices (item_id, price) VALUES (NEW.id, NEW.price); END",
+        # Earlier prices are unknown, so the current one is taken to have always applied
+        "INSERT INTO item_prices (item_id, price, effective_from) "
+        "SELECT id, price, '0001-01-01 00:00:00.000' FROM items WHERE price IS NOT NULL",
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Queries whose plans are shown by `db migrate --dry-run`
+HOT_QUERIES = [
+    ("items by supplier", "SELECT * FROM items WHERE supplier_id = ?", (1,)),
+    ("orders by supplier", "SELECT * FROM orders WHERE supplier_id = ?", (1,)),
+    ("orders by date range", "SELECT * FROM orders WHERE order_date BETWEEN ? AND ?", ('2024-01-01', '2024-01-31')),
+    ("logistics by order", "SELECT * FROM logistics WHERE order_id = ?", (1,)),
+    ("shipments arriving in a date range", "SELECT * FROM logistics WHERE arrival_date BETWEEN ? AND ? "
+     "ORDER BY arrival_date, id", ('2024-06-01', '2024-06-07')),
+    ("logistics by status", "SELECT * FROM logistics WHERE status = ?", ('In transit',)),
+    ("items full-text search", "SELECT items.* FROM items_fts JOIN items ON items.id = items_fts.rowid "
+     "WHERE items_fts MATCH ? ORDER BY rank", ('"jameson"* "750"*',)),
+    ("fuzzy name search postings of a trigram",
+     "SELECT row_id FROM name_trigrams WHERE table_name = ? AND trigram = ?", ('items', 'jam')),
+    ("price of an item as of a timestamp",
+     "SELECT price FROM item_prices WHERE item_id = ? AND effective_from <= ? "
+     "ORDER BY effective_from DESC, id DESC LIMIT 1", (1, '2024-06-01 23:59:59.999')),
+    ("stock movements of an item since a snapshot",
+     "SELECT COALESCE(SUM(quantity), 0) FROM stock_movements WHERE item_id = ? AND id > ?", (1, 0)),
+    ("orders joined to shipments",
+     "SELECT o.id, l.status FROM orders o JOIN logistics l ON l.order_id = o.id WHERE o.supplier_id = ?", (1,)),
+]
+
+
+def get_schema_version(conn):
+    """Return the schema version stored in PRAGMA user_version"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(conn):
+    """Return the migrations not yet applied to the database"""
+    version = get_schema_version(conn)
+    return [migration for migration in MIGRATIONS if migration[0] > version]
+
+
+def _apply(conn, migrations):
+    for version, _, steps in migrations:
+        for step in steps:
+            if callable(step):
+                step(conn)
+            else:
+                conn.execute(step)
+        conn.execute(f"PRAGMA user_version = {version}")
+
+
+def migrate(conn):
+    """Apply pending migrations in one transaction and return them.
+
+    Search indexes skipped for lack of FTS5 are built as soon as a sqlite
+    with FTS5 opens the database.
+    """
+    pending = pending_migrations(conn)
+    if not pending and not search_indexes_missing(conn):
+        return []
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-read inside the write lock in case another process migrated first
+        pending = pending_migrations(conn)
+        _apply(conn, pending)
+        if search_indexes_missing(conn):
+            create_search_indexes(conn)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return pending
+
+
+def explain(conn, query, params=()):
+    """Return the EXPLAIN QUERY PLAN details for a query"""
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+
+def _explain_hot_queries(conn):
+    plans = {}
+    for name, query, params in HOT_QUERIES:
+        try:
+            plans[name] = explain(conn, query, params)
+        except sqlite3.Error as e:
+            plans[name] = [f"error: {e}"]
+    return plans
+
+
+def plan_migration(conn):
+    """Dry-run pending migrations and return (pending, plans_before, plans_after).
+
+    The migrations are applied inside a transaction that is rolled back, so
+    the query plans after the upgrade can be shown without changing the
+    database.
+    """
+    pending = pending_migrations(conn)
+    before = _explain_hot_queries(conn)
+    if not pending:
+        return pending, before, before
+    conn.commit()
+    conn.execute("BEGIN")
+    try:
+        _apply(conn, pending)
+        after = _explain_hot_queries(conn)
+    finally:
+        conn.rollback()
+    return pending, before, after
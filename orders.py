@@ -1,44 +1,86 @@
-from database import execute_query, execute_query_fetchall
+from bulk import preview, where_clause
+from database import WriteBehindQueue, execute_query, execute_query_fetchone, iter_query, keyset_page
+from rows import Order, columns
+from search import build_search
+from dates import normalize_date
 
 def create_order(conn, customer_name, order_date, total_amount, supplier_id):
-    """Create a new order"""
+    """Create a new order and return its ID, raising ValueError for an invalid date.
+
+    Given a WriteBehindQueue instead of a connection, returns a Future of the
+    WriteResult, whose lastrowid is the ID once the batch commits.
+    """
+    order_date = normalize_date(order_date)
     query = "INSERT INTO orders (customer_name, order_date, total_amount, supplier_id) VALUES (?, ?, ?, ?)"
     params = (customer_name, order_date, total_amount, supplier_id)
-    if execute_query(conn, query, params):
-        print("Order created successfully.")
-    else:
-        print("Failed to create order.")
+    if isinstance(conn, WriteBehindQueue):
+        return conn.submit(query, params)
+    return execute_query(conn, query, params).lastrowid
 
 def update_order(conn, order_id, status):
-    """Update an order"""
+    """Update an order, returning False if it does not exist.
+
+    Given a WriteBehindQueue instead of a connection, returns a Future of the
+    WriteResult; a rowcount of 0 means the order did not exist.
+    """
     query = "UPDATE orders SET status = ? WHERE id = ?"
     params = (status, order_id)
-    if execute_query(conn, query, params):
-        print("Order updated successfully.")
-    else:
-        print("Failed to update order.")
-
-def list_orders(conn):
-    """List all orders"""
-    query = "SELECT * FROM orders"
-    orders = execute_query_fetchall(conn, query)
-    for order in orders:
-        print(order)
-
-def search_orders(conn, keyword):
-    """Search orders by keyword"""
-    query = "SELECT * FROM orders WHERE customer_name LIKE ?"
-    params = (f"%{keyword}%",)
-    orders = execute_query_fetchall(conn, query, params)
-    for order in orders:
-        print(order)
+    if isinstance(conn, WriteBehindQueue):
+        return conn.submit(query, params)
+    return execute_query(conn, query, params).rowcount > 0
+
+def update_orders_status(conn, status, supplier_id=None, start=None, end=None, current_status=None, dry_run=False):
+    """Set the status of every order matching the given filters in one statement.
+
+    Filters left as None are not applied. Returns the number of orders
+    updated, or with dry_run a Preview of them.
+    """
+    where, params = where_clause([
+        ("supplier_id = ?", supplier_id),
+        ("order_date >= ?", normalize_date(start)),
+        ("order_date <= ?", normalize_date(end)),
+        ("status = ?", current_status),
+    ])
+    if dry_run:
+        return preview(conn, 'orders', where, params)
+    return execute_query(conn, f"UPDATE orders SET status = ? WHERE {where}", (status,) + params).rowcount
+
+def get_order(conn, order_id):
+    """Return an order by ID, or None if it does not exist"""
+    query = f"SELECT {columns(Order)} FROM orders WHERE id = ?"
+    row = execute_query_fetchone(conn, query, (order_id,), cached=True)
+    return Order._make(row) if row else None
+
+def iter_orders(conn, after_id=0, limit=None):
+    """Stream orders in id order, starting after after_id"""
+    query, params = keyset_page(f"SELECT {columns(Order)} FROM orders", after_id, limit)
+    return iter_query(conn, query, params, row_type=Order)
+
+def list_orders(conn, after_id=0, limit=None):
+    """Return all orders as a list"""
+    return list(iter_orders(conn, after_id, limit))
+
+def iter_orders_between(conn, start, end, limit=None):
+    """Stream orders placed between two dates (inclusive), oldest first"""
+    query = f"SELECT {columns(Order)} FROM orders WHERE order_date BETWEEN ? AND ? ORDER BY order_date, id LIMIT ?"
+    params = (normalize_date(start), normalize_date(end), limit if limit else -1)
+    return iter_query(conn, query, params, row_type=Order)
+
+def list_orders_between(conn, start, end, limit=None):
+    """Return the orders placed between two dates as a list"""
+    return list(iter_orders_between(conn, start, end, limit))
+
+def iter_search_orders(conn, keyword, limit=None):
+    """Stream orders matching keyword, best matches first"""
+    query, params = build_search(conn, 'orders', keyword, limit, columns(Order))
+    return iter_query(conn, query, params, row_type=Order)
+
+def search_orders(conn, keyword, limit=None):
+    """Return the orders matching keyword as a list"""
+    return list(iter_search_orders(conn, keyword, limit))
 
 def delete_order(conn, order_id):
-    """Delete an order"""
+    """Delete an order, returning False if it does not exist"""
     query = "DELETE FROM orders WHERE id = ?"
     params = (order_id,)
-    if execute_query(conn, query, params):
-        print("Order deleted successfully.")
-    else:
-        print("Failed to delete order.")
-
+    return execute_query(conn, query, params).rowcount > 0
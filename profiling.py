@@ -0,0 +1,69 @@
+import json
+import sqlite3
+import time
+from datetime import datetime
+from database import SLOW_QUERY_MS, add_query_hook, remove_query_hook
+
+
+def normalize_query(query):
+    """Collapse whitespace so the same statement is grouped together"""
+    return ' '.join(query.split())
+
+
+class QueryStats:
+    """Query hook collecting call counts, latency and rows per statement"""
+
+    def __init__(self):
+        self.stats = {}
+        self.started = time.perf_counter()
+
+    def __call__(self, conn, query, params, elapsed, rows):
+        entry = self.stats.setdefault(normalize_query(query), [0, 0.0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] = max(entry[2], elapsed)
+        entry[3] += rows if rows and rows > 0 else 0
+
+    def report(self):
+        """Return report lines, slowest statements first"""
+        wall = time.perf_counter() - self.started
+        total = sum(entry[1] for entry in self.stats.values())
+        calls = sum(entry[0] for entry in self.stats.values())
+        lines = [f"Total {wall * 1000:.2f} ms, {calls} queries taking {total * 1000:.2f} ms"]
+        ordered = sorted(self.stats.items(), key=lambda item: item[1][1], reverse=True)
+        for query, (count, elapsed, slowest, rows) in ordered:
+            lines.append(f"{elapsed * 1000:9.2f} ms {count:6d} calls {slowest * 1000:9.2f} ms max "
+                         f"{rows:8d} rows  {query}")
+        return lines
+
+
+class SlowQueryLog:
+    """Query hook appending statements slower than a threshold, with their plan, to a JSONL file"""
+
+    def __init__(self, path, threshold_ms=SLOW_QUERY_MS):
+        self.path = path
+        self.threshold = threshold_ms / 1000.0
+
+    def __call__(self, conn, query, params, elapsed, rows):
+        if elapsed < self.threshold:
+            return
+        try:
+            plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+        except sqlite3.Error as e:
+            plan = [f"error: {e}"]
+        entry = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'elapsed_ms': round(elapsed * 1000, 3),
+            'rows': rows,
+            'query': normalize_query(query),
+            'params': [p if isinstance(p, (int, float, str)) or p is None else repr(p) for p in params],
+            'plan': plan,
+        }
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+
+
+def install(hook):
+    """Register a hook and return a callable that removes it"""
+    add_query_hook(hook)
+    return lambda: remove_query_hook(hook)
@@ -0,0 +1,46 @@
+from database import iter_query, transaction
+from migrations import ROLLUP_REBUILD, ROLLUPS
+from rows import DailySales, SupplierRevenue
+
+# Revenue differences below this are floating point drift, not errors
+REVENUE_TOLERANCE = 0.005
+
+def iter_supplier_revenue(conn, limit=None):
+    """Stream SupplierRevenue rows, highest revenue first"""
+    query = ("SELECT r.supplier_id, s.name, r.order_count, r.revenue FROM supplier_revenue r "
+             "LEFT JOIN suppliers s ON s.id = r.supplier_id ORDER BY r.revenue DESC, r.supplier_id LIMIT ?")
+    return iter_query(conn, query, (limit if limit else -1,), row_type=SupplierRevenue)
+
+def iter_daily_sales(conn, start=None, end=None, limit=None):
+    """Stream DailySales rows between two dates, oldest first"""
+    query = ("SELECT order_date, order_count, revenue FROM daily_sales "
+             "WHERE order_date BETWEEN ? AND ? ORDER BY order_date LIMIT ?")
+    return iter_query(conn, query, (start or '', end or '9999-12-31', limit if limit else -1), row_type=DailySales)
+
+def _recompute(conn, key):
+    query = (f"SELECT {key}, COUNT(*), COALESCE(SUM(total_amount), 0) FROM orders "
+             f"WHERE {key} IS NOT NULL GROUP BY {key}")
+    return {row[0]: (row[1], row[2]) for row in conn.execute(query)}
+
+def verify_rollups(conn):
+    """Compare the rollups with a full recompute and return the differences.
+
+    Each difference is (table, key, rollup, recomputed) where rollup and
+    recomputed are (order_count, revenue) tuples or None when missing.
+    """
+    differences = []
+    for table, key in ROLLUPS:
+        expected = _recompute(conn, key)
+        actual = {row[0]: (row[1], row[2]) for row in conn.execute(f"SELECT {key}, order_count, revenue FROM {table}")}
+        for value in sorted(set(expected) | set(actual), key=str):
+            rollup, recomputed = actual.get(value), expected.get(value)
+            if (rollup is None or recomputed is None or rollup[0] != recomputed[0]
+                    or abs(rollup[1] - recomputed[1]) > REVENUE_TOLERANCE):
+                differences.append((table, value, rollup, recomputed))
+    return differences
+
+def rebuild_rollups(conn):
+    """Recompute the rollups from the orders table in one transaction"""
+    with transaction(conn):
+        for statement in ROLLUP_REBUILD:
+            conn.execute(statement)
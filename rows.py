@@ -0,0 +1,30 @@
+from collections import namedtuple
+
+# Row types returned by the data-access functions. Namedtuples keep the
+# positional access of plain rows, add attribute access, and take no more
+# memory than a tuple.
+Supplier = namedtuple('Supplier', ['id', 'name', 'contact_name', 'contact_phone', 'address'])
+Item = namedtuple('Item', ['id', 'name', 'price', 'supplier_id'])
+Order = namedtuple('Order', ['id', 'customer_name', 'order_date', 'total_amount', 'supplier_id', 'status'])
+Logistics = namedtuple('Logistics', ['id', 'order_id', 'supplier_id', 'dispatch_date', 'arrival_date', 'status'])
+SupplierRevenue = namedtuple('SupplierRevenue', ['supplier_id', 'name', 'order_count', 'revenue'])
+DailySales = namedtuple('DailySales', ['order_date', 'order_count', 'revenue'])
+SupplierTotal = namedtuple('SupplierTotal', ['name', 'order_count', 'revenue'])
+StockLevel = namedtuple('StockLevel', ['item_id', 'name', 'quantity'])
+PricePoint = namedtuple('PricePoint', ['id', 'item_id', 'price', 'effective_from'])
+StockMovement = namedtuple('StockMovement', ['id', 'item_id', 'order_id', 'quantity', 'reason', 'note', 'created_at'])
+
+# Row type of each domain table
+ROW_TYPES = {'suppliers': Supplier, 'items': Item, 'orders': Order, 'logistics': Logistics}
+
+
+def columns(row_type, table=None):
+    """Comma-separated column list selecting the fields of row_type in order"""
+    prefix = f"{table}." if table else ''
+    return ', '.join(prefix + field for field in row_type._fields)
+
+
+def row_factory(row_type):
+    """Cursor row_factory building row_type instances from raw rows"""
+    make = row_type._make
+    return lambda cursor, row: make(row)
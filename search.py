@@ -0,0 +1,75 @@
+import re
+from migrations import SEARCH_COLUMNS, TRIGRAM_COLUMNS, trigrams_sql
+
+_TERM = re.compile(r'\w+', re.UNICODE)
+
+# Least share of the keyword's trigrams a fuzzy match must contain
+FUZZY_THRESHOLD = 0.5
+
+
+def fts_query(keyword):
+    """Turn free text into an FTS5 query matching every term as a prefix.
+
+    "jameson 750" becomes '"jameson"* "750"*', so each term must match the
+    start of a word in the indexed columns.
+    """
+    return ' '.join(f'"{term}"*' for term in _TERM.findall(keyword))
+
+
+def has_search_index(conn, table):
+    """True if the FTS5 shadow table for a table exists"""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{table}_fts",)).fetchone()
+    return row is not None
+
+
+def build_search(conn, table, keyword, limit=None, columns='*', offset=0, rank=False):
+    """Return (query, params) searching a table's text columns for keyword.
+
+    Uses the ranked FTS5 index when present and falls back to LIKE when the
+    local sqlite build has no FTS5 or the keyword has no searchable terms.
+    columns is the select list, written without a table prefix. With rank
+    the first column is the match rank, lower is better (0 for LIKE).
+    """
+    match = fts_query(keyword)
+    if match and has_search_index(conn, table):
+        select = ', '.join(f"{table}.{column.strip()}" for column in columns.split(','))
+        if rank:
+            select = f"{table}_fts.rank, {select}"
+        query = (f"SELECT {select} FROM {table}_fts JOIN {table} ON {table}.id = {table}_fts.rowid "
+                 f"WHERE {table}_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?")
+        return query, (match, limit if limit else -1, offset)
+    searched = SEARCH_COLUMNS[table]
+    where = ' OR '.join(f"{column} LIKE ?" for column in searched)
+    params = tuple(f"%{keyword}%" for _ in searched) + (limit if limit else -1, offset)
+    select = f"0.0, {columns}" if rank else columns
+    return f"SELECT {select} FROM {table} WHERE {where} ORDER BY id LIMIT ? OFFSET ?", params
+
+
+def build_fuzzy_search(conn, table, keyword, limit=None, columns='*', offset=0, rank=False,
+                       threshold=FUZZY_THRESHOLD):
+    """Return (query, params) finding rows whose name is similar to keyword, most similar first.
+
+    Similarity is the share of the keyword's trigrams found in the name, so
+    a short keyword can match a long catalogue name; ties go to the name
+    with fewer other trigrams. Only the postings of the keyword's trigrams
+    are read from the inverted index, so the cost follows the number of
+    matching trigrams, not the table size. With rank the first column is the
+    similarity, higher is better.
+    """
+    if table not in TRIGRAM_COLUMNS:
+        raise ValueError(f"No trigram index on {table}.")
+    select = ', '.join(f"{table}.{column.strip()}" for column in columns.split(','))
+    if rank:
+        select = f"similarity, {select}"
+    query = (f"WITH k(keyword) AS (SELECT ?), q AS ({trigrams_sql('(SELECT keyword FROM k)')}), "
+             f"total(n) AS (SELECT COUNT(*) FROM q), "
+             # CROSS JOIN fixes the join order: postings of the keyword's trigrams, then the
+             # counts of the rows they hit, never a scan of every count of the table
+             f"hits AS (SELECT row_id, COUNT(*) AS shared FROM q CROSS JOIN name_trigrams "
+             f"ON name_trigrams.table_name = ? AND name_trigrams.trigram = q.trigram GROUP BY row_id), "
+             f"scored AS (SELECT hits.row_id, shared * 1.0 / n AS similarity, "
+             f"shared * 1.0 / (trigrams + n - shared) AS jaccard FROM hits CROSS JOIN total "
+             f"CROSS JOIN name_trigram_counts c ON c.table_name = ? AND c.row_id = hits.row_id) "
+             f"SELECT {select} FROM scored JOIN {table} ON {table}.id = scored.row_id WHERE similarity >= ? "
+             f"ORDER BY similarity DESC, jaccard DESC, {table}.id LIMIT ? OFFSET ?")
+    return query, (keyword, table, table, threshold, limit if limit else -1, offset)
@@ -0,0 +1,148 @@
+import heapq
+import itertools
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from database import FETCH_SIZE, get_read_connection, keyset_page
+from rows import ROW_TYPES, DailySales, SupplierTotal, columns
+from search import build_search
+
+# Queries across several store databases ("shards"). Every shard is read by
+# a worker in pages; the first page of every shard is requested up front so
+# the shards are queried in parallel, and the next page of a shard only when
+# the merge has consumed its current one. Rows stay in each shard's order
+# and are merged lazily, so memory is bounded by the page size.
+
+_local = threading.local()
+
+
+def _connection(store):
+    # One read-only connection per store and worker, reused across pages
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    if store not in connections:
+        connections[store] = get_read_connection(store)
+    return connections[store]
+
+
+def _list_page(table, store, after, size):
+    query, params = keyset_page(f"SELECT {columns(ROW_TYPES[table])} FROM {table}", after, size)
+    return _connection(store).execute(query, params).fetchall()
+
+
+def _search_page(table, keyword, store, after, size):
+    conn = _connection(store)
+    query, params = build_search(conn, table, keyword, size, columns(ROW_TYPES[table]), offset=after, rank=True)
+    return conn.execute(query, params).fetchall()
+
+
+def _supplier_revenue_page(store, after, size):
+    query = ("SELECT s.name, SUM(r.order_count), SUM(r.revenue) FROM supplier_revenue r "
+             "JOIN suppliers s ON s.id = r.supplier_id WHERE s.name > ? GROUP BY s.name ORDER BY s.name LIMIT ?")
+    return _connection(store).execute(query, (after, size)).fetchall()
+
+
+def _daily_sales_page(start, end, store, after, size):
+    query = ("SELECT order_date, order_count, revenue FROM daily_sales "
+             "WHERE order_date > ? AND order_date BETWEEN ? AND ? ORDER BY order_date LIMIT ?")
+    return _connection(store).execute(query, (after, start, end, size)).fetchall()
+
+
+@contextmanager
+def store_executor(stores, workers=None):
+    """Executor for shard queries: a process pool, or one thread for a single store"""
+    workers = workers if workers is not None else min(len(stores), os.cpu_count() or 1)
+    if workers <= 1 or len(stores) == 1:
+        executor = ThreadPoolExecutor(1)
+    else:
+        executor = ProcessPoolExecutor(workers)
+    try:
+        yield executor
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _page_size(stores, page_size):
+    return max(1, page_size // len(stores))
+
+
+def _after_last_key(rows, after):
+    return rows[-1][0]
+
+
+def _after_offset(rows, after):
+    return after + len(rows)
+
+
+def _shard_rows(executor, future, store, fetch, after, next_after, size):
+    while True:
+        rows = future.result()
+        future = None
+        if len(rows) == size:
+            # Prefetch the next page while this one is being merged
+            after = next_after(rows, after)
+            future = executor.submit(fetch, store, after, size)
+        for row in rows:
+            yield store, row
+        if future is None:
+            return
+
+
+def _merge(executor, stores, fetch, start, next_after, key, page_size):
+    size = _page_size(stores, page_size)
+    futures = [executor.submit(fetch, store, start, size) for store in stores]
+    shards = [_shard_rows(executor, future, store, fetch, start, next_after, size)
+              for store, future in zip(stores, futures)]
+    return heapq.merge(*shards, key=key)
+
+
+def iter_store_rows(executor, stores, table, limit=None, page_size=FETCH_SIZE):
+    """Stream (store, row) pairs of a table from every store, in id order"""
+    row_type = ROW_TYPES[table]
+    position = {store: i for i, store in enumerate(stores)}
+    merged = _merge(executor, stores, partial(_list_page, table), 0, _after_last_key,
+                    lambda pair: (pair[1][0], position[pair[0]]), page_size)
+    return ((store, row_type._make(row)) for store, row in itertools.islice(merged, limit))
+
+
+def iter_store_search(executor, stores, table, keyword, limit=None, page_size=FETCH_SIZE):
+    """Stream (store, row) pairs matching keyword in every store, best matches first"""
+    row_type = ROW_TYPES[table]
+    position = {store: i for i, store in enumerate(stores)}
+    # Matches are ordered by rank, so shards page by offset rather than by key
+    merged = _merge(executor, stores, partial(_search_page, table, keyword), 0, _after_offset,
+                    lambda pair: (pair[1][0], pair[1][1], position[pair[0]]), page_size)
+    return ((store, row_type._make(row[1:])) for store, row in itertools.islice(merged, limit))
+
+
+def _sum_groups(merged, row_type):
+    # Rows with the same key arrive next to each other from the merge
+    for key, group in itertools.groupby(merged, key=lambda pair: pair[1][0]):
+        count = revenue = 0
+        for _, row in group:
+            count += row[1]
+            revenue += row[2]
+        yield row_type(key, count, revenue)
+
+
+def store_supplier_revenue(executor, stores, limit=None, page_size=FETCH_SIZE):
+    """Return SupplierTotal rows summed over every store by supplier name, highest revenue first.
+
+    Suppliers have their own IDs in every store, so they are matched by name.
+    """
+    merged = _merge(executor, stores, _supplier_revenue_page, '', _after_last_key,
+                    lambda pair: pair[1][0], page_size)
+    key = lambda row: (row.revenue, row.name)
+    if limit:
+        return heapq.nlargest(limit, _sum_groups(merged, SupplierTotal), key=key)
+    return sorted(_sum_groups(merged, SupplierTotal), key=key, reverse=True)
+
+
+def iter_store_daily_sales(executor, stores, start=None, end=None, limit=None, page_size=FETCH_SIZE):
+    """Stream DailySales rows summed over every store, oldest first"""
+    fetch = partial(_daily_sales_page, start or '', end or '9999-12-31')
+    merged = _merge(executor, stores, fetch, '', _after_last_key, lambda pair: pair[1][0], page_size)
+    return itertools.islice(_sum_groups(merged, DailySales), limit)
@@ -1,44 +1,100 @@
-from database import execute_query, execute_query_fetchall
+from bulk import preview
+from database import execute_query, execute_query_fetchone, iter_query, keyset_page, transaction
+from rows import Supplier, columns
+from search import build_fuzzy_search, build_search
 
 def add_supplier(conn, name, contact_name, contact_phone, address):
-    """Add a new supplier"""
+    """Add a new supplier and return its ID"""
     query = "INSERT INTO suppliers (name, contact_name, contact_phone, address) VALUES (?, ?, ?, ?)"
     params = (name, contact_name, contact_phone, address)
-    if execute_query(conn, query, params):
-        print("Supplier added successfully.")
-    else:
-        print("Failed to add supplier.")
+    return execute_query(conn, query, params).lastrowid
 
 def update_supplier(conn, supplier_id, name, contact_name, contact_phone, address):
-    """Update a supplier"""
+    """Update a supplier, returning False if it does not exist"""
     query = "UPDATE suppliers SET name = ?, contact_name = ?, contact_phone = ?, address = ? WHERE id = ?"
     params = (name, contact_name, contact_phone, address, supplier_id)
-    if execute_query(conn, query, params):
-        print("Supplier updated successfully.")
-    else:
-        print("Failed to update supplier.")
-
-def list_suppliers(conn):
-    """List all suppliers"""
-    query = "SELECT * FROM suppliers"
-    suppliers = execute_query_fetchall(conn, query)
-    for supplier in suppliers:
-        print(supplier)
-
-def search_suppliers(conn, keyword):
-    """Search suppliers by keyword"""
-    query = "SELECT * FROM suppliers WHERE name LIKE ? OR contact_name LIKE ?"
-    params = (f"%{keyword}%", f"%{keyword}%")
-    suppliers = execute_query_fetchall(conn, query, params)
-    for supplier in suppliers:
-        print(supplier)
-
-def delete_supplier(conn, supplier_id):
-    """Delete a supplier"""
-    query = "DELETE FROM suppliers WHERE id = ?"
-    params = (supplier_id,)
-    if execute_query(conn, query, params):
-        print("Supplier deleted successfully.")
-    else:
-        print("Failed to delete supplier.")
+    return execute_query(conn, query, params).rowcount > 0
 
+def get_supplier(conn, supplier_id):
+    """Return a supplier by ID, or None if it does not exist"""
+    query = f"SELECT {columns(Supplier)} FROM suppliers WHERE id = ?"
+    row = execute_query_fetchone(conn, query, (supplier_id,), cached=True)
+    return Supplier._make(row) if row else None
+
+def iter_suppliers(conn, after_id=0, limit=None):
+    """Stream suppliers in id order, starting after after_id"""
+    query, params = keyset_page(f"SELECT {columns(Supplier)} FROM suppliers", after_id, limit)
+    return iter_query(conn, query, params, row_type=Supplier)
+
+def list_suppliers(conn, after_id=0, limit=None):
+    """Return all suppliers as a list"""
+    return list(iter_suppliers(conn, after_id, limit))
+
+def iter_search_suppliers(conn, keyword, limit=None, fuzzy=False):
+    """Stream suppliers matching keyword, best matches first; fuzzy matches misspelt names by trigrams"""
+    build = build_fuzzy_search if fuzzy else build_search
+    query, params = build(conn, 'suppliers', keyword, limit, columns(Supplier))
+    return iter_query(conn, query, params, row_type=Supplier)
+
+def search_suppliers(conn, keyword, limit=None, fuzzy=False):
+    """Return the suppliers matching keyword as a list"""
+    return list(iter_search_suppliers(conn, keyword, limit, fuzzy))
+
+# What delete_supplier does with the items, orders and shipments of a supplier:
+# refuse to delete it, delete them too, or keep them without a supplier
+DELETE_POLICIES = ('block', 'cascade', 'detach')
+
+# Rows depending on a supplier per table, as (where, number of supplier_id parameters)
+_DEPENDENTS = {
+    'items': ("supplier_id = ?", 1),
+    'orders': ("supplier_id = ?", 1),
+    'logistics': ("supplier_id = ? OR order_id IN (SELECT id FROM orders WHERE supplier_id = ?)", 2),
+}
+
+def supplier_dependents(conn, supplier_id):
+    """Return {table: row count} of the items, orders and shipments tied to a supplier"""
+    return {table: conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", (supplier_id,) * count).fetchone()[0]
+            for table, (where, count) in _DEPENDENTS.items()}
+
+def _policy_dependents(policy):
+    # The rows each policy changes: detach only touches rows carrying the supplier itself
+    if policy == 'detach':
+        return {table: ("supplier_id = ?", 1) for table in _DEPENDENTS}
+    return _DEPENDENTS
+
+def preview_dependents(conn, supplier_id, policy='cascade'):
+    """Return {table: Preview} of the items, orders and shipments a delete policy would change"""
+    return {table: preview(conn, table, where, (supplier_id,) * count)
+            for table, (where, count) in _policy_dependents(policy).items()}
+
+def delete_supplier(conn, supplier_id, policy='block'):
+    """Delete a supplier and handle its dependent rows by policy, in one transaction.
+
+    'block' raises ValueError if the supplier has items, orders or shipments,
+    'cascade' deletes them (refused when the stock ledger refers to them) and
+    'detach' clears their supplier. Returns False if the supplier does not
+    exist.
+    """
+    if policy not in DELETE_POLICIES:
+        raise ValueError(f"Unknown delete policy {policy!r}.")
+    with transaction(conn):
+        dependents = {table: count for table, count in supplier_dependents(conn, supplier_id).items() if count}
+        if dependents and policy == 'block':
+            raise ValueError(f"Supplier {supplier_id} still has "
+                             + ', '.join(f"{count} {table}" for table, count in dependents.items()) + ".")
+        if dependents and policy == 'cascade':
+            held = conn.execute("SELECT COUNT(*) FROM stock_movements WHERE item_id IN "
+                                "(SELECT id FROM items WHERE supplier_id = ?) OR order_id IN "
+                                "(SELECT id FROM orders WHERE supplier_id = ?)", (supplier_id, supplier_id)).fetchone()[0]
+            if held:
+                raise ValueError(f"{held} stock movements refer to the items or orders of supplier {supplier_id} "
+                                 f"and the stock ledger is never deleted, detach them instead.")
+            # Shipments first, then what they reference
+            for table in ('logistics', 'orders', 'items'):
+                where, count = _policy_dependents(policy)[table]
+                execute_query(conn, f"DELETE FROM {table} WHERE {where}", (supplier_id,) * count)
+        elif dependents and policy == 'detach':
+            for table in ('logistics', 'orders', 'items'):
+                where, count = _policy_dependents(policy)[table]
+                execute_query(conn, f"UPDATE {table} SET supplier_id = NULL WHERE {where}", (supplier_id,) * count)
+        return execute_query(conn, "DELETE FROM suppliers WHERE id = ?", (supplier_id,)).rowcount > 0
@@ -0,0 +1,62 @@
+import pytest
+from database import initialize_database, get_connection
+
+np = pytest.importorskip('numpy')
+
+from analytics import aggregate_lead_times, load_lead_times, supplier_lead_times
+
+DB_FILE = ':memory:'
+
+@pytest.fixture
+def conn():
+    """Fixture to create a new database connection for each test."""
+    conn = get_connection(DB_FILE)
+    initialize_database(conn)
+    yield conn
+    conn.close()
+
+def test_aggregate_matches_numpy_percentiles():
+    rng = np.random.default_rng(3)
+    suppliers = rng.integers(1, 6, size=5000)
+    leads = rng.gamma(2, 2, size=5000)
+    stats = aggregate_lead_times(suppliers, leads, on_time_days=3)
+    for i, supplier_id in enumerate(stats['supplier_id']):
+        group = leads[suppliers == supplier_id]
+        assert stats['shipments'][i] == len(group)
+        assert stats['mean'][i] == pytest.approx(group.mean())
+        for q in (50, 90, 99):
+            assert stats[f'p{q}'][i] == pytest.approx(np.percentile(group, q))
+        assert stats['on_time_rate'][i] == pytest.approx((group <= 3).mean())
+
+def test_supplier_lead_times_from_logistics(conn):
+    conn.executemany("INSERT INTO suppliers (name) VALUES (?)", [("ABC Liquors",), ("XYZ Distributors",)])
+    conn.execute("INSERT INTO orders (customer_name) VALUES ('XYZ Bar & Grill')")
+    conn.executemany("INSERT INTO logistics (order_id, supplier_id, dispatch_date, arrival_date) VALUES (1, ?, ?, ?)", [
+        (1, "2024-06-01", "2024-06-02"),
+        (1, "2024-06-01", "2024-06-05"),
+        (2, "2024-06-10", "2024-06-20"),
+        (2, "2024-06-10", None),
+    ])
+    suppliers, leads = load_lead_times(conn, chunk_size=1)
+    assert suppliers.tolist() == [1, 1, 2]
+    assert leads.tolist() == [1.0, 4.0, 10.0]
+    abc, xyz = supplier_lead_times(conn, on_time_days=3)
+    assert (abc.name, abc.shipments, abc.mean, abc.p50, abc.on_time_rate) == ("ABC Liquors", 2, 2.5, 2.5, 0.5)
+    assert (xyz.shipments, xyz.p99, xyz.on_time_rate) == (1, 10.0, 0.0)
+    assert [row.supplier_id for row in supplier_lead_times(conn, since="2024-06-05")] == [2]
+
+def test_malformed_legacy_dates_are_skipped(conn):
+    conn.execute("INSERT INTO suppliers (name) VALUES ('ABC Liquors')")
+    conn.execute("INSERT INTO orders (customer_name) VALUES ('XYZ Bar & Grill')")
+    # Rows written before the date checks existed
+    for column in ('dispatch_date', 'arrival_date'):
+        conn.execute(f"DROP TRIGGER logistics_{column}_insert_check")
+    conn.executemany("INSERT INTO logistics (order_id, supplier_id, dispatch_date, arrival_date) VALUES (1, 1, ?, ?)", [
+        ("2024-06-01", "2024-06-03"),
+        ("2024-06-02", "next week"),
+        ("2024-06-0x", "2024-06-05"),
+    ])
+    suppliers, leads = load_lead_times(conn)
+    assert leads.tolist() == [2.0]
+    (abc,) = supplier_lead_times(conn)
+    assert (abc.shipments, abc.mean, abc.p99) == (1, 2.0, 2.0)
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import pytest
+from api import MAX_BODY, APIServer
+from database import initialize_database
+
+@pytest.fixture
+def api(tmp_path):
+    """Fixture to create an API server over a new database."""
+    db_file = str(tmp_path / 'liquor_supply.db')
+    initialize_database(db_file)
+    api = APIServer(db_file, readers=2)
+    yield api
+    api.close()
+
+def request(api, method, target, body=None):
+    return asyncio.run(api.handle(method, target, json.dumps(body).encode() if body is not None else b''))
+
+def test_crud_round_trip(api):
+    assert request(api, 'POST', '/suppliers', {'name': 'ABC Liquors'}) == (201, {'id': 1})
+    assert request(api, 'POST', '/items', {'name': 'Jameson 1L', 'price': 30.0, 'supplier_id': 1}) == (201, {'id': 1})
+    status, rows = request(api, 'GET', '/items/search?q=jamieson&fuzzy=1')
+    assert status == 200 and [row['name'] for row in rows] == ['Jameson 1L']
+    assert request(api, 'PUT', '/items/1', {'name': 'Jameson 1L', 'price': 32.0, 'supplier_id': 1}) == (200, {'id': 1})
+    status, prices = request(api, 'GET', '/items/1/prices')
+    assert [point['price'] for point in prices] == [30.0, 32.0]
+    assert request(api, 'GET', '/items/1') == (200, {'id': 1, 'name': 'Jameson 1L', 'price': 32.0, 'supplier_id': 1})
+    assert request(api, 'DELETE', '/items/1') == (200, {'id': 1})
+    assert request(api, 'GET', '/items/1')[0] == 404
+    assert request(api, 'GET', '/items')[1] == []
+
+def test_errors(api):
+    assert request(api, 'PUT', '/orders/7', {'status': 'Shipped'})[0] == 404
+    assert request(api, 'POST', '/orders', {'customer_name': 'Bar', 'order_date': 'soon'})[0] == 400
+    assert request(api, 'POST', '/suppliers', {})[0] == 400
+    assert request(api, 'POST', '/items', {'name': 'Gin', 'supplier_id': 9})[0] == 409
+    assert request(api, 'PATCH', '/items/1')[0] == 405
+    assert request(api, 'GET', '/nowhere')[0] == 404
+    metrics = request(api, 'GET', '/metrics')[1]['routes']
+    assert metrics['PUT /orders/{id}']['errors'] == 1
+    assert metrics['unmatched']['count'] == 2
+
+@pytest.mark.parametrize('length, status', [(b'abc', b'400'), (b'-5', b'400'), (b'%d' % (MAX_BODY + 1), b'413')])
+def test_bad_content_length_is_answered_and_closed(api, length, status):
+    async def main():
+        server = await asyncio.start_server(api._client, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b"POST /orders HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n{}")
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+    head, _, body = asyncio.run(main()).partition(b'\r\n\r\n')
+    assert head.split()[1] == status
+    assert b'Connection: close' in head
+    assert 'error' in json.loads(body)
+
+
+@pytest.mark.parametrize('request_head', [
+    b"GET /suppliers?q=" + b"x" * 70000 + b" HTTP/1.1\r\n\r\n",
+    b"GET /suppliers HTTP/1.1\r\nX-Padding: " + b"x" * 70000 + b"\r\n\r\n",
+])
+def test_overlong_lines_are_answered_and_closed(api, request_head):
+    async def main():
+        server = await asyncio.start_server(api._client, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(request_head)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+    head, _, body = asyncio.run(main()).partition(b'\r\n\r\n')
+    assert head.split()[1] == b'431'
+    assert b'Connection: close' in head
+    assert 'error' in json.loads(body)
+
+def test_concurrent_writes_over_http(api):
+    async def main():
+        server = await asyncio.start_server(api._client, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async def client(n):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            statuses = []
+            for i in range(5):
+                body = json.dumps({'customer_name': f"Bar {n}-{i}", 'order_date': '2024-06-01'}).encode()
+                writer.write(b"POST /orders HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+                await writer.drain()
+                statuses.append((await reader.readline()).split()[1])
+                headers = {}
+                while (line := await reader.readline()) != b'\r\n':
+                    name, _, value = line.decode().partition(':')
+                    headers[name.lower()] = value.strip()
+                await reader.readexactly(int(headers['content-length']))
+            writer.close()
+            return statuses
+        results = await asyncio.gather(*(client(n) for n in range(8)))
+        server.close()
+        await server.wait_closed()
+        return results
+    results = asyncio.run(main())
+    assert all(status == b'201' for statuses in results for status in statuses)
+    status, orders = request(api, 'GET', '/orders?start=2024-06-01&end=2024-06-01')
+    assert len(orders) == 40
+    assert request(api, 'GET', '/metrics')[1]['routes']['POST /orders']['count'] == 40
@@ -0,0 +1,65 @@
+import pytest
+from backup import backup_database, foreign_key_orphans, restore_database, verify_database
+from database import initialize_database, get_connection
+
+@pytest.fixture
+def conn(tmp_path):
+    """Fixture to create a database with a few hundred suppliers."""
+    conn = get_connection(str(tmp_path / 'liquor_supply.db'))
+    initialize_database(conn)
+    conn.executemany("INSERT INTO suppliers (name, address) VALUES (?, ?)",
+                     [(f"Supplier {n}", "x" * 200) for n in range(500)])
+    conn.commit()
+    yield conn
+    conn.close()
+
+def test_backup_is_a_consistent_snapshot_while_writes_go_on(conn, tmp_path):
+    target = str(tmp_path / 'backup.db')
+    writer = get_connection(conn.execute("PRAGMA database_list").fetchone()[2])
+    steps = []
+    def progress(copied, total):
+        steps.append((copied, total))
+        # Commit from another connection between steps
+        if len(steps) == 2:
+            writer.execute("INSERT INTO suppliers (name) VALUES ('Late')")
+            writer.commit()
+    result = backup_database(conn, target, pages=4, pause=0, progress=progress)
+    assert len(steps) > 2 and steps[-1] == (result.pages, result.pages)
+    assert all(a[0] <= b[0] for a, b in zip(steps, steps[1:]))
+    assert verify_database(target) == []
+    backup = get_connection(target)
+    assert backup.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 500
+    backup.close()
+    assert conn.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 501
+    writer.close()
+
+def test_restore_replaces_the_database(conn, tmp_path):
+    target = str(tmp_path / 'backup.db')
+    backup_database(conn, target, pause=0)
+    conn.execute("DELETE FROM suppliers")
+    conn.commit()
+    restore_database(conn, target)
+    assert conn.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 500
+
+def test_restore_refuses_a_damaged_backup(conn, tmp_path):
+    target = tmp_path / 'backup.db'
+    target.write_bytes(b"not a database" * 100)
+    assert verify_database(str(target))
+    with pytest.raises(ValueError):
+        restore_database(conn, str(target))
+    assert conn.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 500
+
+def test_backup_keeps_orphaned_rows(conn, tmp_path):
+    target = str(tmp_path / 'backup.db')
+    conn.execute("INSERT INTO items (name, supplier_id) VALUES ('Whiskey', 1)")
+    conn.commit()
+    # Left behind by deletes made before the delete policies
+    conn.execute("PRAGMA foreign_keys=OFF")
+    conn.execute("DELETE FROM suppliers WHERE id = 1")
+    conn.commit()
+    conn.execute("PRAGMA foreign_keys=ON")
+    backup_database(conn, target, pause=0)
+    assert verify_database(target) == []
+    assert foreign_key_orphans(target) == ["Row 1 of items refers to a missing row of suppliers"]
+    restore_database(conn, target)
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
@@ -0,0 +1,32 @@
+import random
+from benchmark import compare, run_benchmarks
+from database import initialize_database, get_connection
+from datagen import generate_items, populate, scale_counts
+
+def test_generator_is_deterministic():
+    first = list(generate_items(random.Random(42), 20, 5))
+    second = list(generate_items(random.Random(42), 20, 5))
+    assert first == second
+    assert all(1 <= supplier_id <= 5 for _, _, supplier_id in first)
+
+def test_populate_scale_counts():
+    conn = get_connection(':memory:')
+    initialize_database(conn)
+    counts = populate(conn, 300, seed=1)
+    assert counts == scale_counts(300)
+    for table, count in counts.items():
+        assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == count
+    conn.close()
+
+def test_run_benchmarks_report():
+    report = run_benchmarks([50], repeat=2, operations=('add_item', 'search_items', 'delete_order'))
+    operations = [result['operation'] for result in report['results']]
+    assert operations == ['populate', 'add_item', 'search_items', 'delete_order']
+    assert all(result['median_s'] >= 0 for result in report['results'])
+
+def test_compare_flags_regressions():
+    baseline = {'results': [{'operation': 'search_items', 'scale': 1000, 'median_s': 0.010}]}
+    report = {'results': [{'operation': 'search_items', 'scale': 1000, 'median_s': 0.020},
+                          {'operation': 'add_item', 'scale': 1000, 'median_s': 0.001}]}
+    assert compare(report, baseline, tolerance=0.25) == [('search_items', 1000, 0.010, 0.020)]
+    assert compare(report, baseline, tolerance=1.5) == []
@@ -0,0 +1,80 @@
+import pytest
+from database import initialize_database, get_connection
+from inventory import receive_stock
+from items import reprice_items
+from logistics import update_order_logistics
+from orders import update_orders_status
+from suppliers import delete_supplier, preview_dependents, supplier_dependents
+
+@pytest.fixture
+def conn(tmp_path):
+    """Fixture to create a database with two suppliers, their items, orders and shipments."""
+    db_file = str(tmp_path / 'liquor_supply.db')
+    initialize_database(db_file)
+    conn = get_connection(db_file)
+    conn.executemany("INSERT INTO suppliers (name) VALUES (?)", [("Supplier A",), ("Supplier B",)])
+    conn.executemany("INSERT INTO items (name, price, supplier_id) VALUES (?, ?, ?)",
+                     [("Whiskey", 20.0, 1), ("Gin", 10.0, 1), ("Rum", 15.0, 2)])
+    conn.executemany("INSERT INTO orders (customer_name, order_date, supplier_id, status) VALUES (?, ?, ?, ?)",
+                     [("Bar 1", "2024-01-05", 1, "Pending"), ("Bar 2", "2024-02-05", 1, "Pending"),
+                      ("Bar 3", "2024-01-10", 2, "Pending")])
+    conn.executemany("INSERT INTO logistics (order_id, supplier_id, status) VALUES (?, ?, ?)",
+                     [(1, 1, "In Transit"), (1, 1, "Delivered"), (3, 2, "In Transit")])
+    conn.commit()
+    yield conn
+    conn.close()
+
+def test_reprice_items(conn):
+    preview = reprice_items(conn, 1, 10, dry_run=True)
+    assert preview.count == 2
+    assert [row.name for row in preview.rows] == ["Whiskey", "Gin"]
+    assert reprice_items(conn, 1, 10) == 2
+    assert [row[0] for row in conn.execute("SELECT price FROM items ORDER BY id")] == [22.0, 11.0, 15.0]
+
+def test_update_orders_status_applies_only_given_filters(conn):
+    assert update_orders_status(conn, "Archived", end="2024-01-31", dry_run=True).count == 2
+    assert update_orders_status(conn, "Archived", supplier_id=1, end="2024-01-31") == 1
+    assert update_orders_status(conn, "Closed", current_status="Pending") == 2
+    statuses = [row[0] for row in conn.execute("SELECT status FROM orders ORDER BY id")]
+    assert statuses == ["Archived", "Closed", "Closed"]
+
+def test_update_order_logistics(conn):
+    assert update_order_logistics(conn, 1, "Delivered", current_status="In Transit") == 1
+    assert update_order_logistics(conn, 1, "Returned", dry_run=True).count == 2
+    assert update_order_logistics(conn, 2, "Delivered") == 0
+
+def test_delete_supplier_block(conn):
+    assert supplier_dependents(conn, 1) == {'items': 2, 'orders': 2, 'logistics': 2}
+    with pytest.raises(ValueError):
+        delete_supplier(conn, 1)
+    assert conn.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 2
+    assert delete_supplier(conn, 9) is False
+
+def test_delete_supplier_cascade(conn):
+    assert delete_supplier(conn, 1, 'cascade') is True
+    assert supplier_dependents(conn, 1) == {'items': 0, 'orders': 0, 'logistics': 0}
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM logistics").fetchone()[0] == 1
+
+def test_delete_supplier_detach(conn):
+    assert delete_supplier(conn, 1, 'detach') is True
+    assert conn.execute("SELECT COUNT(*) FROM items WHERE supplier_id IS NULL").fetchone()[0] == 2
+    assert conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == 3
+
+def test_preview_matches_what_each_policy_changes(conn):
+    # A shipment of supplier 1's order carried by supplier 2
+    conn.execute("UPDATE logistics SET supplier_id = 2 WHERE id = 2")
+    conn.commit()
+    detach = preview_dependents(conn, 1, 'detach')
+    assert [row.id for row in detach['logistics'].rows] == [1]
+    cascade = preview_dependents(conn, 1, 'cascade')
+    assert [row.id for row in cascade['logistics'].rows] == [1, 2]
+    delete_supplier(conn, 1, 'detach')
+    assert conn.execute("SELECT supplier_id FROM logistics ORDER BY id").fetchall() == [(None,), (2,), (2,)]
+
+def test_cascade_refuses_to_remove_stock_ledger_rows(conn):
+    receive_stock(conn, 1, 5)
+    with pytest.raises(ValueError):
+        delete_supplier(conn, 1, 'cascade')
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 3
+    assert delete_supplier(conn, 1, 'detach') is True
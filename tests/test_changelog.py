@@ -0,0 +1,68 @@
+import io
+import json
+import pytest
+from database import initialize_database, get_connection
+from changelog import compact_changelog, export_changes, iter_changes, latest_seq
+from orders import create_order, update_order, delete_order
+from suppliers import add_supplier
+
+DB_FILE = ':memory:'
+
+@pytest.fixture
+def conn():
+    """Fixture to create a new database connection for each test."""
+    conn = get_connection(DB_FILE)
+    initialize_database(conn)
+    yield conn
+    conn.close()
+
+def export(conn, since=0, limit=None):
+    out = io.StringIO()
+    count, last_seq = export_changes(conn, out, since, limit)
+    return [json.loads(line) for line in out.getvalue().splitlines()], last_seq
+
+def test_triggers_record_every_write(conn):
+    add_supplier(conn, "ABC Liquors", "John Doe", "123-456-7890", "123 Main Street")
+    create_order(conn, "XYZ Bar & Grill", "2024-06-15", 500.00, 1)
+    update_order(conn, 1, "Completed")
+    delete_order(conn, 1)
+    assert conn.execute("SELECT table_name, row_id, operation FROM changelog ORDER BY seq").fetchall() == [
+        ("suppliers", 1, "insert"), ("orders", 1, "insert"), ("orders", 1, "update"), ("orders", 1, "delete")]
+
+def test_export_streams_latest_change_per_row(conn):
+    add_supplier(conn, "ABC Liquors", "John Doe", "123-456-7890", "123 Main Street")
+    create_order(conn, "XYZ Bar & Grill", "2024-06-15", 500.00, 1)
+    create_order(conn, "Otieno Pub", "2024-06-16", 200.00, 1)
+    changes, last_seq = export(conn)
+    assert [(change['table'], change['id']) for change in changes] == [("suppliers", 1), ("orders", 1), ("orders", 2)]
+    assert changes[1]['row']['customer_name'] == "XYZ Bar & Grill"
+    assert last_seq == 3
+    update_order(conn, 1, "Completed")
+    update_order(conn, 1, "Shipped")
+    delete_order(conn, 2)
+    changes, last_seq = export(conn, since=last_seq)
+    assert [(change['id'], change['op']) for change in changes] == [(1, "update"), (2, "delete")]
+    assert changes[0]['row']['status'] == "Shipped"
+    assert changes[1]['row'] is None
+    assert export(conn, since=last_seq) == ([], last_seq)
+
+def test_export_limit_resumes(conn):
+    for i in range(5):
+        add_supplier(conn, f"Supplier {i}", None, None, None)
+    first, last_seq = export(conn, limit=2)
+    rest, _ = export(conn, since=last_seq)
+    assert [change['id'] for change in first + rest] == [1, 2, 3, 4, 5]
+
+def test_compaction_keeps_latest_entries(conn):
+    add_supplier(conn, "ABC Liquors", "John Doe", "123-456-7890", "123 Main Street")
+    create_order(conn, "XYZ Bar & Grill", "2024-06-15", 500.00, 1)
+    update_order(conn, 1, "Completed")
+    create_order(conn, "Otieno Pub", "2024-06-16", 200.00, 1)
+    delete_order(conn, 2)
+    before, _ = export(conn)
+    assert compact_changelog(conn, latest_seq(conn)) == 2
+    assert export(conn) == (before, 5)
+    assert compact_changelog(conn, 100, drop_deletes=True) == 1
+    with pytest.raises(ValueError):
+        list(iter_changes(conn, since=0))
+    assert export(conn, since=5) == ([], 5)
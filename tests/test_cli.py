@@ -0,0 +1,112 @@
+import pytest
+from click.testing import CliRunner
+from cli import cli
+from commands.common import fetch_picker_page
+from database import ConnectionManager, get_connection, initialize_database
+
+@pytest.fixture
+def db(tmp_path):
+    """Fixture to create a connection manager on a fresh database file."""
+    manager = ConnectionManager(str(tmp_path / 'liquor_supply.db'))
+    initialize_database(manager.connection)
+    yield manager
+    manager.close()
+
+def invoke(db, args, input=None):
+    result = CliRunner().invoke(cli, ['--quiet'] + args, input=input, obj=db)
+    assert result.exception is None, result.output
+    return result
+
+def add_suppliers(db, names):
+    db.connection.executemany("INSERT INTO suppliers (name) VALUES (?)", [(name,) for name in names])
+    db.connection.commit()
+
+def test_picker_pages_by_prefix(db):
+    add_suppliers(db, [f"Supplier {i:02d}" for i in range(25)] + ["ABC Liquors", "abc_special"])
+    page, more = fetch_picker_page(db.connection, 'suppliers', 'name', 'supplier')
+    assert [name for _, name in page] == [f"Supplier {i:02d}" for i in range(10)]
+    assert more
+    page, more = fetch_picker_page(db.connection, 'suppliers', 'name', 'supplier', after=(page[-1][1], page[-1][0]))
+    assert page[0][1] == "Supplier 10"
+    page, _ = fetch_picker_page(db.connection, 'suppliers', 'name', 'abc_')
+    assert [name for _, name in page] == ["abc_special"]
+
+def test_item_add_accepts_supplier_id(db):
+    add_suppliers(db, ["ABC Liquors", "XYZ Distributors"])
+    invoke(db, ['items', 'add', '--name', 'Whiskey', '--price', '50'], input='2\n')
+    assert db.connection.execute("SELECT name, supplier_id FROM items").fetchall() == [("Whiskey", 2)]
+
+def test_item_add_filters_then_picks(db):
+    add_suppliers(db, ["ABC Liquors", "XYZ Distributors"])
+    result = invoke(db, ['items', 'add', '--name', 'Whiskey', '--price', '50'], input='xyz\n9\ncancel\n')
+    assert "2 - XYZ Distributors" in result.output
+    assert "No entry with ID 9" in result.output
+    assert db.connection.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+def test_quiet_hides_banner(db):
+    add_suppliers(db, ["ABC Liquors"])
+    assert "Welcome to Liquor Supply Pro" not in invoke(db, ['suppliers', 'list']).output
+    result = CliRunner().invoke(cli, ['suppliers', 'list'], obj=db)
+    assert "Welcome to Liquor Supply Pro" in result.output
+    assert "ID: 1, Name: ABC Liquors" in result.output
+
+def test_subcommand_groups_load_lazily():
+    assert cli.list_commands(None) == ['db', 'export', 'inventory', 'items', 'logistics', 'orders', 'reports', 'run', 'serve', 'shell', 'stores', 'suppliers', 'sync']
+    assert cli.get_command(None, 'items').name == 'items'
+    assert cli.get_command(None, 'nope') is None
+
+def test_run_script_reuses_connection(db, tmp_path):
+    script = tmp_path / 'script.txt'
+    script.write_text("# load suppliers\n" + "".join(
+        f'suppliers add --name "Supplier {i}" --contact_name X --contact_phone 1 --address Y\n' for i in range(50)))
+    conn = db.connection
+    invoke(db, ['run', str(script), '--transaction'])
+    assert db.connection is conn
+    assert conn.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 50
+
+def test_run_script_transaction_rolls_back_on_failure(db, tmp_path):
+    script = tmp_path / 'script.txt'
+    script.write_text('suppliers add --name A --contact_name X --contact_phone 1 --address Y\n'
+                      'items delete --item_id not-a-number\n')
+    result = CliRunner().invoke(cli, ['--quiet', 'run', str(script), '--transaction'], obj=db)
+    assert result.exit_code != 0
+    assert "line 2 failed" in result.output
+    assert db.connection.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 0
+
+def test_search_and_missing_rows(db):
+    add_suppliers(db, ["ABC Liquors", "XYZ Distributors"])
+    result = invoke(db, ['suppliers', 'search', 'xyz'])
+    assert "ID: 2, Name: XYZ Distributors" in result.output
+    assert "ABC Liquors" not in result.output
+    result = CliRunner().invoke(cli, ['--quiet', 'suppliers', 'delete', '--supplier_id', '9'], obj=db)
+    assert result.exit_code == 1
+    assert "No supplier with ID '9'" in result.output
+
+def test_delete_supplier_lists_the_rows_it_touches(db):
+    add_suppliers(db, ["ABC Liquors"])
+    db.connection.executemany("INSERT INTO items (name, supplier_id) VALUES (?, 1)", [(f"Item {i:02d}",) for i in range(12)])
+    db.connection.execute("INSERT INTO orders (customer_name, supplier_id) VALUES ('XYZ Bar & Grill', 1)")
+    db.connection.commit()
+    result = CliRunner().invoke(cli, ['--quiet', 'suppliers', 'delete', '--supplier_id', '1', '--policy', 'cascade'],
+                                input='n\n', obj=db)
+    assert result.exit_code == 1
+    lines = result.output.splitlines()
+    assert lines[0] == "Delete 12 items, 1 orders:"
+    assert lines[1:4] == ["  items:", "    ID: 1, Name: Item 00", "    ID: 2, Name: Item 01"]
+    assert "    ... and 2 more." in lines
+    assert "  orders:" in lines and "    ID: 1, Customer Name: XYZ Bar & Grill" in lines
+    assert lines.index("    ... and 2 more.") < lines.index("  orders:")
+    assert "Aborted" in result.output
+    assert db.connection.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 12
+
+def test_shell_releases_the_write_lock_after_a_failed_command(db):
+    result = invoke(db, ['shell'], input='inventory receive --item_id 999 --quantity 5\nsuppliers list\nexit\n')
+    assert "Integrity Error" in result.output
+    assert not db.connection.in_transaction
+    other = get_connection(db.db_file)
+    try:
+        other.execute("PRAGMA busy_timeout=0")
+        other.execute("INSERT INTO suppliers (name) VALUES ('ABC Liquors')")
+        other.commit()
+    finally:
+        other.close()
@@ -0,0 +1,74 @@
+import json
+import os
+import pytest
+from columnar import export_columnar, load_columnar
+from database import initialize_database, get_connection
+
+@pytest.fixture
+def conn(tmp_path):
+    """Fixture to create a database with orders and shipments, some fields NULL."""
+    conn = get_connection(str(tmp_path / 'liquor_supply.db'))
+    initialize_database(conn)
+    conn.execute("INSERT INTO suppliers (name) VALUES ('ABC Liquors')")
+    conn.executemany("INSERT INTO orders (customer_name, order_date, total_amount, supplier_id, status) "
+                     "VALUES (?, ?, ?, ?, ?)",
+                     [("Bar 1", "2024-01-05", 100.5, 1, "Pending"), ("Bar 2", None, None, None, None),
+                      ("Bar 1", "2024-02-01", 20.0, 1, "Delivered")])
+    conn.execute("INSERT INTO logistics (order_id, supplier_id, dispatch_date, arrival_date, status) "
+                 "VALUES (1, 1, '2024-01-06', '2024-01-09', 'Delivered')")
+    conn.commit()
+    yield conn
+    conn.close()
+
+def test_export_writes_fixed_width_columns(conn, tmp_path):
+    out = str(tmp_path / 'snapshot')
+    assert export_columnar(conn, out) == {'orders': 3, 'logistics': 1}
+    with open(os.path.join(out, 'manifest.json')) as f:
+        columns = json.load(f)['tables']['orders']['columns']
+    assert os.path.getsize(os.path.join(out, columns['total_amount']['file'])) == 3 * 8
+    assert os.path.getsize(os.path.join(out, columns['status']['file'])) == 3 * 4
+    with open(os.path.join(out, columns['status']['dictionary'])) as f:
+        assert json.load(f) == ["Pending", "Delivered"]
+    assert not os.path.exists(os.path.join(out, 'manifest.json.partial'))
+
+def test_load_memory_maps_the_columns(conn, tmp_path):
+    np = pytest.importorskip('numpy')
+    out = str(tmp_path / 'snapshot')
+    export_columnar(conn, out, chunk_size=2)
+    orders = load_columnar(out)['orders']
+    assert isinstance(orders.columns['id'], np.memmap)
+    assert orders.columns['id'].tolist() == [1, 2, 3]
+    assert orders.columns['supplier_id'].tolist() == [1, -1, 1]
+    assert np.nansum(orders.columns['total_amount']) == 120.5
+    assert str(orders.columns['order_date'][0]) == '2024-01-05'
+    assert np.isnat(orders.columns['order_date'][1])
+    names = orders.dictionaries['customer_name']
+    assert [names[code] for code in orders.columns['customer_name']] == ["Bar 1", "Bar 2", "Bar 1"]
+    assert orders.columns['status'][1] == -1
+    shipments = load_columnar(out, tables=['logistics'])
+    lead_days = shipments['logistics'].columns['arrival_date'] - shipments['logistics'].columns['dispatch_date']
+    assert lead_days.astype(int).tolist() == [3]
+
+def test_load_empty_table(conn, tmp_path):
+    pytest.importorskip('numpy')
+    conn.execute("DELETE FROM logistics")
+    conn.commit()
+    out = str(tmp_path / 'snapshot')
+    export_columnar(conn, out, tables=('logistics',))
+    assert load_columnar(out)['logistics'].columns['id'].shape == (0,)
+
+def test_reexport_leaves_mapped_files_alone(conn, tmp_path):
+    pytest.importorskip('numpy')
+    out = str(tmp_path / 'snapshot')
+    export_columnar(conn, out)
+    first = load_columnar(out)['orders']
+    first_export = [name for name in os.listdir(out) if name.startswith('export-')]
+    conn.execute("DELETE FROM logistics")
+    conn.execute("DELETE FROM orders WHERE id = 3")
+    conn.commit()
+    export_columnar(conn, out)
+    assert first.columns['id'].tolist() == [1, 2, 3]
+    assert load_columnar(out)['orders'].columns['id'].tolist() == [1, 2]
+    export_columnar(conn, out)
+    exports = [name for name in os.listdir(out) if name.startswith('export-')]
+    assert len(exports) == 2 and first_export[0] not in exports
@@ -0,0 +1,196 @@
+import sqlite3
+import pytest
+import database
+from database import ConnectionManager, WriteBehindQueue, initialize_database, run_with_retry, iter_query, keyset_page
+from migrations import MIGRATIONS, SCHEMA_VERSION, explain, get_schema_version, migrate, plan_migration
+
+@pytest.fixture
+def db_file(tmp_path):
+    """Fixture to create an initialized database file for each test."""
+    db_file = str(tmp_path / 'liquor_supply.db')
+    initialize_database(db_file)
+    return db_file
+
+def test_connection_manager_tunes_connection(db_file):
+    manager = ConnectionManager(db_file)
+    conn = manager.connection
+    assert manager.connection is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == int(database.BUSY_TIMEOUT * 1000)
+    manager.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+def test_connection_manager_context_commits(db_file):
+    with ConnectionManager(db_file) as conn:
+        conn.execute("INSERT INTO suppliers (name) VALUES ('ABC Liquors')")
+    with ConnectionManager(db_file) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 1
+
+def test_run_with_retry_backs_off_on_locked(monkeypatch):
+    monkeypatch.setattr(database, 'RETRY_BACKOFF', 0)
+    attempts = []
+    def operation():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise sqlite3.OperationalError("database is locked")
+        return 'done'
+    assert run_with_retry(operation) == 'done'
+    assert len(attempts) == 3
+
+def test_run_with_retry_reraises_other_errors():
+    def operation():
+        raise sqlite3.OperationalError("no such table: nope")
+    with pytest.raises(sqlite3.OperationalError):
+        run_with_retry(operation)
+
+def test_initialize_database_sets_schema_version(db_file):
+    conn = sqlite3.connect(db_file)
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    assert initialize_database(conn) == []
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(orders)")]
+    assert 'status' in columns
+
+def test_migrate_upgrades_legacy_database(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'legacy.db'))
+    conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY AUTOINCREMENT, customer_name TEXT NOT NULL, "
+                 "order_date TEXT, total_amount REAL, supplier_id INTEGER)")
+    conn.execute("INSERT INTO orders (customer_name) VALUES ('XYZ Bar & Grill')")
+    conn.commit()
+    applied = migrate(conn)
+    assert [migration[0] for migration in applied] == [version for version, _, _ in MIGRATIONS]
+    assert conn.execute("SELECT customer_name, status FROM orders").fetchall() == [('XYZ Bar & Grill', None)]
+    assert 'USING INDEX idx_orders_supplier_id' in explain(conn, "SELECT * FROM orders WHERE supplier_id = ?", (1,))[0]
+
+def test_plan_migration_does_not_change_database(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'empty.db'))
+    pending, before, after = plan_migration(conn)
+    assert len(pending) == len(MIGRATIONS)
+    assert before['logistics by status'][0].startswith('error')
+    assert 'idx_logistics_status' in after['logistics by status'][0]
+    assert get_schema_version(conn) == 0
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+
+def test_iter_query_streams_in_chunks(db_file):
+    conn = sqlite3.connect(db_file)
+    conn.executemany("INSERT INTO suppliers (name) VALUES (?)", [(f"Supplier {i}",) for i in range(7)])
+    rows = iter_query(conn, "SELECT id FROM suppliers ORDER BY id", size=3)
+    assert next(rows) == (1,)
+    assert [row[0] for row in rows] == [2, 3, 4, 5, 6, 7]
+
+def test_keyset_page():
+    assert keyset_page("SELECT * FROM items", 10, 5) == ("SELECT * FROM items WHERE id > ? ORDER BY id LIMIT ?", (10, 5))
+    assert keyset_page("SELECT * FROM items")[1] == (0, -1)
+
+def test_transaction_defers_commits(db_file):
+    conn = database.get_connection(db_file)
+    other = database.get_connection(db_file)
+    with database.transaction(conn):
+        database.execute_query(conn, "INSERT INTO suppliers (name) VALUES ('ABC Liquors')")
+        with database.transaction(conn):
+            database.execute_query(conn, "INSERT INTO suppliers (name) VALUES ('XYZ Distributors')")
+        assert other.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 0
+    assert other.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 2
+    with pytest.raises(RuntimeError):
+        with database.transaction(conn):
+            database.execute_query(conn, "INSERT INTO suppliers (name) VALUES ('Rolled Back')")
+            raise RuntimeError("boom")
+    assert conn.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 2
+
+def test_migrate_normalizes_legacy_dates(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'legacy.db'))
+    for version, _, steps in MIGRATIONS[:5]:
+        for step in steps:
+            step(conn) if callable(step) else conn.execute(step)
+    conn.execute("PRAGMA user_version = 5")
+    conn.executemany("INSERT INTO orders (customer_name, order_date) VALUES ('XYZ Bar & Grill', ?)",
+                     [("15/06/2024",), ("2024-06-16",), ("next tuesday",), (None,)])
+    conn.commit()
+    migrate(conn)
+    dates = [row[0] for row in conn.execute("SELECT order_date FROM orders ORDER BY id")]
+    assert dates == ["2024-06-15", "2024-06-16", "next tuesday", None]
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO orders (customer_name, order_date) VALUES ('XYZ Bar & Grill', '06/15/2024')")
+    conn.execute("UPDATE orders SET status = 'Completed' WHERE order_date = 'next tuesday'")
+
+def test_write_behind_queue_groups_commits(db_file):
+    from orders import create_order, update_order
+    with WriteBehindQueue(db_file, max_delay=0.5) as writer:
+        futures = [create_order(writer, f"Customer {i}", "2024-06-15", 10.0, None) for i in range(200)]
+        futures.append(update_order(writer, 1, "Shipped"))
+        futures.append(writer.submit("INSERT INTO orders (customer_name) VALUES (NULL)"))
+    assert [future.result().lastrowid for future in futures[:3]] == [1, 2, 3]
+    assert futures[200].result().rowcount == 1
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[-1].result()
+    assert writer.writes == 201
+    assert writer.commits < 10
+    with pytest.raises(RuntimeError):
+        writer.submit("DELETE FROM orders")
+    with ConnectionManager(db_file) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == 200
+        assert conn.execute("SELECT status FROM orders WHERE id = 1").fetchone()[0] == "Shipped"
+
+def test_lookup_cache_hits_until_the_database_changes(db_file):
+    from suppliers import add_supplier, get_supplier
+    conn = database.get_connection(db_file)
+    other = database.get_connection(db_file)
+    cache = database.enable_lookup_cache(conn)
+    add_supplier(conn, "ABC Liquors", None, None, None)
+    conn.commit()
+    assert get_supplier(conn, 1).name == "ABC Liquors"
+    assert get_supplier(conn, 1).name == "ABC Liquors"
+    assert get_supplier(conn, 2) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    # A commit from another connection is seen through data_version
+    other.execute("UPDATE suppliers SET name = 'ABC Wines' WHERE id = 1")
+    other.commit()
+    assert get_supplier(conn, 1).name == "ABC Wines"
+    # A write on the same connection is seen through total_changes, even before it commits
+    conn.execute("UPDATE suppliers SET name = 'ABC Spirits' WHERE id = 1")
+    assert get_supplier(conn, 1).name == "ABC Spirits"
+    assert cache.invalidations == 2
+    conn.close()
+    other.close()
+
+def test_lookup_cache_evicts_least_recently_used(db_file):
+    conn = database.get_connection(db_file)
+    cache = database.enable_lookup_cache(conn, max_size=2)
+    for query in ("SELECT 1", "SELECT 2", "SELECT 1", "SELECT 3"):
+        database.execute_query_fetchone(conn, query, cached=True)
+    assert len(cache) == 2
+    database.execute_query_fetchone(conn, "SELECT 1", cached=True)
+    database.execute_query_fetchone(conn, "SELECT 2", cached=True)
+    assert (cache.hits, cache.misses) == (2, 4)
+    conn.close()
+
+def test_lookup_cache_forgets_rolled_back_rows(db_file):
+    from suppliers import add_supplier, get_supplier
+    conn = database.get_connection(db_file)
+    database.enable_lookup_cache(conn)
+    with pytest.raises(RuntimeError):
+        with database.transaction(conn):
+            add_supplier(conn, "ABC Liquors", None, None, None)
+            assert get_supplier(conn, 1).name == "ABC Liquors"
+            raise RuntimeError("abort")
+    assert get_supplier(conn, 1) is None
+    conn.execute("INSERT INTO suppliers (name) VALUES ('XYZ Wines')")
+    get_supplier(conn, 2)
+    conn.rollback()
+    assert get_supplier(conn, 2) is None
+    conn.close()
+
+def test_lookup_cache_is_emptied_by_a_restore(db_file, tmp_path):
+    from backup import backup_database, restore_database
+    from suppliers import add_supplier, get_supplier
+    conn = database.get_connection(db_file)
+    database.enable_lookup_cache(conn)
+    backup_database(conn, str(tmp_path / 'backup.db'), pause=0)
+    add_supplier(conn, "ABC Liquors", None, None, None)
+    conn.commit()
+    assert get_supplier(conn, 1).name == "ABC Liquors"
+    restore_database(conn, str(tmp_path / 'backup.db'))
+    assert get_supplier(conn, 1) is None
+    conn.close()
@@ -0,0 +1,45 @@
+import pytest
+from datetime import date, datetime
+from dates import normalize_date, normalize_timestamp
+
+TODAY = date(2024, 6, 15)
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024-06-15', '2024-06-15'),
+    ('2024-06-15T09:30:00', '2024-06-15'),
+    ('2024-6-5', '2024-06-05'),
+    ('2024/06/15', '2024-06-15'),
+    ('15/06/2024', '2024-06-15'),
+    ('15.06.2024', '2024-06-15'),
+    ('15 Jun 2024', '2024-06-15'),
+    ('June 15, 2024', '2024-06-15'),
+    ('today', '2024-06-15'),
+    ('Tomorrow', '2024-06-16'),
+    ('7 days ago', '2024-06-08'),
+    ('in 3 days', '2024-06-18'),
+    (date(2024, 1, 2), '2024-01-02'),
+    ('', None),
+    (None, None),
+])
+def test_normalize_date(value, expected):
+    assert normalize_date(value, today=TODAY) == expected
+
+@pytest.mark.parametrize('value', ['2024-13-01', 'soon', '2024-06-15 garbage', '31/02/2024'])
+def test_normalize_date_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        normalize_date(value, today=TODAY)
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024-06-15 09:30', '2024-06-15 09:30:00.000'),
+    ('2024-06-15T09:30:12.5', '2024-06-15 09:30:12.500'),
+    (datetime(2024, 6, 15, 9, 30), '2024-06-15 09:30:00.000'),
+    ('15/06/2024', '2024-06-15 23:59:59.999'),
+    ('today', '2024-06-15 23:59:59.999'),
+    ('', None),
+])
+def test_normalize_timestamp(value, expected):
+    assert normalize_timestamp(value, today=TODAY) == expected
+
+def test_normalize_timestamp_rejects_invalid():
+    with pytest.raises(ValueError):
+        normalize_timestamp('2024-06-15 25:00', today=TODAY)
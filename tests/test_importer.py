@@ -0,0 +1,76 @@
+import json
+import sqlite3
+import pytest
+from database import initialize_database, get_connection, execute_query_fetchall
+from importer import import_file, import_rows, validate_row
+
+@pytest.fixture
+def conn(tmp_path):
+    """Fixture to create a file-backed database for each test."""
+    db_file = str(tmp_path / 'import.db')
+    initialize_database(db_file)
+    conn = get_connection(db_file)
+    yield conn
+    conn.close()
+
+def test_validate_row_converts_types():
+    assert validate_row('items', {'name': ' Whiskey ', 'price': '50.5', 'supplier_id': '2'}) == ('Whiskey', 50.5, 2)
+    assert validate_row('items', {'name': 'Gin', 'price': '', 'supplier_id': None}) == ('Gin', None, None)
+
+def test_validate_row_rejects_bad_rows():
+    with pytest.raises(ValueError):
+        validate_row('items', {'price': '10'})
+    with pytest.raises(ValueError):
+        validate_row('items', {'name': 'Rum', 'price': 'cheap'})
+
+def test_import_csv_in_batches(conn, tmp_path):
+    conn.execute("INSERT INTO suppliers (name) VALUES ('ABC Liquors')")
+    path = tmp_path / 'items.csv'
+    lines = ['name,price,supplier_id'] + [f'Item {i},{i}.5,1' for i in range(25)] + ['Broken,abc,1']
+    path.write_text('\n'.join(lines) + '\n')
+    result = import_file(conn, 'items', str(path), batch_size=10)
+    assert result.inserted == 25
+    assert result.rejected == 1
+    assert execute_query_fetchall(conn, "SELECT COUNT(*) FROM items")[0][0] == 25
+    rejects = [json.loads(line) for line in open(str(path) + '.rejects.jsonl')]
+    assert rejects[0]['line'] == 27
+    assert rejects[0]['row']['name'] == 'Broken'
+
+def test_import_jsonl(conn, tmp_path):
+    path = tmp_path / 'suppliers.jsonl'
+    path.write_text('{"name": "ABC Liquors", "contact_name": "John Doe"}\nnot json\n{"contact_name": "No Name"}\n')
+    result = import_file(conn, 'suppliers', str(path), rejects_path=str(tmp_path / 'rejects.jsonl'))
+    assert (result.inserted, result.rejected) == (1, 2)
+    assert execute_query_fetchall(conn, "SELECT name, contact_name FROM suppliers") == [("ABC Liquors", "John Doe")]
+
+def test_import_isolates_failing_rows_in_batch(conn):
+    conn.execute("CREATE TRIGGER no_bad_items BEFORE INSERT ON items WHEN NEW.name = 'bad' "
+                 "BEGIN SELECT RAISE(ABORT, 'bad item'); END")
+    rejected = []
+    rows = enumerate([{'name': 'good'}, {'name': 'bad'}, {'name': 'also good'}], 2)
+    result = import_rows(conn, 'items', rows, batch_size=100, reject=lambda *r: rejected.append(r))
+    assert result.inserted == 2
+    assert rejected[0][0] == 3
+    assert rejected[0][2] == 'bad item'
+
+def test_import_stops_on_errors_other_than_constraints(conn):
+    def fail(name):
+        raise RuntimeError("disk on fire")
+    conn.create_function('fail', 1, fail)
+    conn.execute("CREATE TRIGGER failing_items BEFORE INSERT ON items WHEN NEW.name = 'bad' "
+                 "BEGIN SELECT fail(NEW.name); END")
+    rejected = []
+    rows = enumerate([{'name': 'good'}, {'name': 'bad'}], 2)
+    with pytest.raises(sqlite3.OperationalError):
+        import_rows(conn, 'items', rows, batch_size=100, reject=lambda *r: rejected.append(r))
+    assert rejected == []
+    assert not conn.in_transaction
+    assert execute_query_fetchall(conn, "SELECT name FROM items") == []
+
+def test_import_leaves_an_enclosing_transaction_open(conn):
+    conn.execute("BEGIN")
+    conn.execute("INSERT INTO suppliers (name) VALUES ('ABC Liquors')")
+    import_rows(conn, 'items', enumerate([{'name': 'good'}], 2))
+    assert conn.in_transaction
+    conn.rollback()
+    assert execute_query_fetchall(conn, "SELECT COUNT(*) FROM items") == [(0,)]
@@ -0,0 +1,94 @@
+import sqlite3
+import threading
+import pytest
+from database import initialize_database, get_connection, transaction
+from inventory import (adjust_stock, receive_stock, release_stock, reserve_stock, stock_as_of, stock_on_hand,
+                       take_snapshot, verify_stock, iter_stock_levels)
+
+@pytest.fixture
+def db_file(tmp_path):
+    """Fixture to create a database file with two items and an order."""
+    db_file = str(tmp_path / 'liquor_supply.db')
+    initialize_database(db_file)
+    conn = get_connection(db_file)
+    conn.executemany("INSERT INTO items (name) VALUES (?)", [("Whiskey",), ("Gin",)])
+    conn.execute("INSERT INTO orders (customer_name) VALUES ('XYZ Bar & Grill')")
+    conn.commit()
+    conn.close()
+    return db_file
+
+@pytest.fixture
+def conn(db_file):
+    conn = get_connection(db_file)
+    yield conn
+    conn.close()
+
+def test_stock_on_hand_follows_the_ledger(conn):
+    receive_stock(conn, 1, 10)
+    adjust_stock(conn, 1, -2, "broken bottles")
+    assert stock_on_hand(conn, 1) == 8
+    assert stock_on_hand(conn, 2) == 0
+    assert [(row.name, row.quantity) for row in iter_stock_levels(conn)] == [("Whiskey", 8), ("Gin", 0)]
+    with pytest.raises(ValueError):
+        adjust_stock(conn, 1, -9)
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("DELETE FROM stock_movements")
+    assert verify_stock(conn) == []
+
+def test_reserve_is_all_or_nothing(conn):
+    receive_stock(conn, 1, 5)
+    receive_stock(conn, 2, 1)
+    with pytest.raises(ValueError, match="Only 1 of item 2"):
+        reserve_stock(conn, 1, [(1, 3), (2, 2)])
+    assert (stock_on_hand(conn, 1), stock_on_hand(conn, 2)) == (5, 1)
+    reserve_stock(conn, 1, [(1, 3), (2, 1)])
+    assert (stock_on_hand(conn, 1), stock_on_hand(conn, 2)) == (2, 0)
+    assert release_stock(conn, 1) == 2
+    assert release_stock(conn, 1) == 0
+    assert (stock_on_hand(conn, 1), stock_on_hand(conn, 2)) == (5, 1)
+
+def test_reserve_inside_a_transaction_is_all_or_nothing(conn):
+    receive_stock(conn, 1, 10)
+    receive_stock(conn, 2, 1)
+    with transaction(conn):
+        receive_stock(conn, 2, 1)
+        with pytest.raises(ValueError, match="Only 2 of item 2"):
+            reserve_stock(conn, 1, [(1, 5), (2, 3)])
+        assert (stock_on_hand(conn, 1), stock_on_hand(conn, 2)) == (10, 2)
+    assert (stock_on_hand(conn, 1), stock_on_hand(conn, 2)) == (10, 2)
+
+def test_concurrent_reservations_never_oversell(db_file, conn):
+    receive_stock(conn, 1, 50)
+    reserved = []
+
+    def worker():
+        worker_conn = get_connection(db_file)
+        for _ in range(20):
+            try:
+                reserve_stock(worker_conn, 1, [(1, 1)])
+                reserved.append(1)
+            except ValueError:
+                pass
+        worker_conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(reserved) == 50
+    assert stock_on_hand(conn, 1) == 0
+
+def test_snapshots_bound_replay(conn):
+    first = receive_stock(conn, 1, 10)
+    take_snapshot(conn)
+    second = adjust_stock(conn, 1, -4)
+    receive_stock(conn, 2, 3)
+    take_snapshot(conn)
+    receive_stock(conn, 1, 1)
+    assert stock_as_of(conn, 1, first) == 10
+    assert stock_as_of(conn, 1, second) == 6
+    assert stock_as_of(conn, 2, second) == 0
+    assert verify_stock(conn) == []
+    conn.execute("UPDATE stock_on_hand SET quantity = 99 WHERE item_id = 2")
+    assert verify_stock(conn) == [(2, 99, 3)]
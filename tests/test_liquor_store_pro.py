@@ -1,10 +1,11 @@
 import pytest
 import sqlite3
 from suppliers import add_supplier, update_supplier, list_suppliers, search_suppliers, delete_supplier
-from orders import create_order, update_order, list_orders, search_orders, delete_order
-from logistics import record_logistics, update_logistics, list_logistics, search_logistics, delete_logistics
-from items import add_item, update_item, list_items, search_items, delete_item
+from orders import create_order, update_order, list_orders, search_orders, delete_order, iter_orders_between
+from logistics import record_logistics, update_logistics, list_logistics, search_logistics, delete_logistics, iter_logistics_arriving_between
+from items import add_item, update_item, list_items, search_items, delete_item, iter_items, iter_search_items
 from database import initialize_database, get_connection
+from rows import Order, Supplier
 
 DB_FILE = ':memory:'
 
@@ -59,7 +60,7 @@ def test_update_order(conn):
     order_id = list_orders(conn)[0][0]
     update_order(conn, order_id, "Completed")
     orders = list_orders(conn)
-    assert orders[0][2] == "Completed"
+    assert orders[0].status == "Completed"
 
 def test_delete_order(conn):
     add_supplier(conn, "ABC Liquors", "John Doe", "123-456-7890", "123 Main Street")
@@ -87,7 +88,7 @@ def test_record_logistics(conn):
     record_logistics(conn, order_id, supplier_id, "2024-06-16", "2024-06-18", "In transit")
     logistics = list_logistics(conn)
     assert len(logistics) == 1
-    assert logistics[0][3] == "In transit"
+    assert logistics[0].status == "In transit"
 
 def test_update_logistics(conn):
     add_supplier(conn, "ABC Liquors", "John Doe", "123-456-7890", "123 Main Street")
@@ -98,7 +99,7 @@ def test_update_logistics(conn):
     logistics_id = list_logistics(conn)[0][0]
     update_logistics(conn, logistics_id, "Delivered")
     logistics = list_logistics(conn)
-    assert logistics[0][3] == "Delivered"
+    assert logistics[0].status == "Delivered"
 
 def test_delete_logistics(conn):
     add_supplier(conn, "ABC Liquors", "John Doe", "123-456-7890", "123 Main Street")
@@ -119,7 +120,7 @@ def test_search_logistics(conn):
     record_logistics(conn, order_id, supplier_id, "2024-06-16", "2024-06-18", "In transit")
     logistics = search_logistics(conn, "transit")
     assert len(logistics) == 1
-    assert logistics[0][3] == "In transit"
+    assert logistics[0].status == "In transit"
 
 # Item Tests
 def test_add_item(conn):
@@ -157,3 +158,57 @@ def test_search_item(conn):
     assert len(items) == 1
     assert items[0][1] == "Whiskey"
 
+
+def test_iter_items_keyset_pages(conn):
+    add_supplier(conn, "ABC Liquors", "John Doe", "123-456-7890", "123 Main Street")
+    for i in range(5):
+        add_item(conn, f"Whiskey {i}", 50.00, 1)
+    first_page = [item[0] for item in iter_items(conn, limit=2)]
+    assert first_page == [1, 2]
+    assert [item[0] for item in iter_items(conn, after_id=first_page[-1], limit=2)] == [3, 4]
+    assert [item[0] for item in iter_items(conn, after_id=4)] == [5]
+
+def test_iter_search_items_limit(conn):
+    add_supplier(conn, "ABC Liquors", "John Doe", "123-456-7890", "123 Main Street")
+    for i in range(5):
+        add_item(conn, f"Whiskey {i}", 50.00, 1)
+    assert len([item for item in iter_search_items(conn, "whiskey", limit=3)]) == 3
+
+def test_orders_between_dates(conn):
+    add_supplier(conn, "ABC Liquors", "John Doe", "123-456-7890", "123 Main Street")
+    for order_date in ("2024-06-01", "15/06/2024", "2024-07-01"):
+        create_order(conn, "XYZ Bar & Grill", order_date, 500.00, 1)
+    orders = list(iter_orders_between(conn, "2024-06-01", "June 30, 2024"))
+    assert [order[2] for order in orders] == ["2024-06-01", "2024-06-15"]
+
+def test_create_order_rejects_invalid_date(conn):
+    add_supplier(conn, "ABC Liquors", "John Doe", "123-456-7890", "123 Main Street")
+    with pytest.raises(ValueError):
+        create_order(conn, "XYZ Bar & Grill", "someday", 500.00, 1)
+    assert conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == 0
+
+def test_logistics_arriving_between_dates(conn):
+    add_supplier(conn, "ABC Liquors", "John Doe", "123-456-7890", "123 Main Street")
+    create_order(conn, "XYZ Bar & Grill", "2024-06-15", 500.00, 1)
+    record_logistics(conn, 1, 1, "2024-06-16", "2024-06-18", "In transit")
+    record_logistics(conn, 1, 1, "2024-06-16", "2024-06-25", "In transit")
+    entries = list(iter_logistics_arriving_between(conn, "2024-06-17", "2024-06-20"))
+    assert [entry[4] for entry in entries] == ["2024-06-18"]
+
+def test_rows_are_typed_and_streamed_lazily(conn):
+    supplier_id = add_supplier(conn, "ABC Liquors", "John Doe", "123-456-7890", "123 Main Street")
+    order_id = create_order(conn, "XYZ Bar & Grill", "2024-06-15", 500.00, supplier_id)
+    assert (supplier_id, order_id) == (1, 1)
+    rows = iter_orders_between(conn, "2024-06-01", "2024-06-30")
+    assert not isinstance(rows, list)
+    order = next(rows)
+    assert type(order) is Order
+    assert (order.id, order.customer_name, order.total_amount, order.supplier_id) == (1, "XYZ Bar & Grill", 500.00, 1)
+    assert order == (1, "XYZ Bar & Grill", "2024-06-15", 500.00, 1, None)
+    assert type(search_suppliers(conn, "abc")[0]) is Supplier
+
+def test_write_functions_report_missing_rows(conn):
+    assert update_item(conn, 42, "Whiskey", 50.00, None) is False
+    assert delete_order(conn, 42) is False
+    with pytest.raises(sqlite3.IntegrityError):
+        add_item(conn, "Whiskey", 50.00, 42)
@@ -0,0 +1,53 @@
+import pytest
+from database import initialize_database, get_connection
+from inventory import receive_stock, reserve_stock
+from items import add_item, iter_price_history, order_prices, price_as_of, prices_as_of, update_item
+from profiling import QueryStats, install
+
+@pytest.fixture
+def conn(tmp_path):
+    """Fixture to create a database with two items whose prices change over time."""
+    conn = get_connection(str(tmp_path / 'liquor_supply.db'))
+    initialize_database(conn)
+    add_item(conn, "Whiskey", 20.0, None)
+    add_item(conn, "Gin", None, None)
+    update_item(conn, 2, "Gin", 10.0, None)
+    # Date the prices so the lookups below have a known history
+    conn.execute("UPDATE item_prices SET effective_from = '2024-01-01 08:00:00.000'")
+    conn.execute("INSERT INTO item_prices (item_id, price, effective_from) VALUES (1, 25.0, '2024-03-01 12:00:00.000')")
+    conn.commit()
+    yield conn
+    conn.close()
+
+def test_price_changes_are_recorded(conn):
+    update_item(conn, 1, "Whiskey", 30.0, None)
+    update_item(conn, 1, "Whiskey 1L", 30.0, None)
+    assert [row.price for row in iter_price_history(conn, 1)] == [20.0, 25.0, 30.0]
+    assert [row.price for row in iter_price_history(conn, 2)] == [10.0]
+
+def test_price_as_of(conn):
+    assert price_as_of(conn, 1, '2023-12-31') is None
+    assert price_as_of(conn, 1, '2024-03-01 11:59') == 20.0
+    assert price_as_of(conn, 1, '2024-03-01') == 25.0
+    assert prices_as_of(conn, [1, 2, 1, 3], '2024-02-01') == {1: 20.0, 2: 10.0, 3: None}
+
+def test_order_prices_use_each_order_date(conn):
+    conn.executemany("INSERT INTO orders (customer_name, order_date) VALUES (?, ?)",
+                     [("Bar 1", "2024-02-10"), ("Bar 2", "2024-03-05"), ("Bar 3", "2024-03-06")])
+    receive_stock(conn, 1, 10)
+    receive_stock(conn, 2, 10)
+    reserve_stock(conn, 1, [(1, 1), (2, 2)])
+    reserve_stock(conn, 2, [(1, 1)])
+    assert order_prices(conn, [1, 2, 3]) == {(1, 1): 20.0, (1, 2): 10.0, (2, 1): 25.0}
+
+def test_price_lookups_reach_the_query_hooks(conn):
+    stats = QueryStats()
+    uninstall = install(stats)
+    try:
+        price_as_of(conn, 1, '2024-03-01')
+        prices_as_of(conn, [1, 2], '2024-03-01')
+        order_prices(conn, [1])
+    finally:
+        uninstall()
+    assert sum(entry[0] for entry in stats.stats.values()) == 3
+    assert all('item_prices' in query for query in stats.stats)
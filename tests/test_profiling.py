@@ -0,0 +1,43 @@
+import json
+import pytest
+from database import initialize_database, get_connection, execute_query, execute_query_fetchall, iter_query
+from profiling import QueryStats, SlowQueryLog, install
+
+DB_FILE = ':memory:'
+
+@pytest.fixture
+def conn():
+    """Fixture to create a new database connection for each test."""
+    conn = get_connection(DB_FILE)
+    initialize_database(conn)
+    yield conn
+    conn.close()
+
+def test_query_stats_counts_calls_and_rows(conn):
+    stats = QueryStats()
+    uninstall = install(stats)
+    try:
+        for name in ("ABC Liquors", "XYZ Distributors"):
+            execute_query(conn, "INSERT INTO suppliers (name) VALUES (?)", (name,))
+        execute_query_fetchall(conn, "SELECT * FROM suppliers")
+        assert len(list(iter_query(conn, "SELECT id FROM suppliers", size=1))) == 2
+    finally:
+        uninstall()
+    execute_query_fetchall(conn, "SELECT * FROM suppliers")
+    assert stats.stats["INSERT INTO suppliers (name) VALUES (?)"][0] == 2
+    assert stats.stats["SELECT * FROM suppliers"][0] == 1
+    assert stats.stats["SELECT * FROM suppliers"][3] == 2
+    assert stats.stats["SELECT id FROM suppliers"][3] == 2
+    assert "4 queries" in stats.report()[0]
+
+def test_slow_query_log_captures_plan(conn, tmp_path):
+    path = tmp_path / 'slow.jsonl'
+    uninstall = install(SlowQueryLog(str(path), threshold_ms=0))
+    try:
+        execute_query_fetchall(conn, "SELECT * FROM orders WHERE supplier_id = ?", (1,))
+    finally:
+        uninstall()
+    entry = json.loads(path.read_text().splitlines()[0])
+    assert entry['query'] == "SELECT * FROM orders WHERE supplier_id = ?"
+    assert entry['params'] == [1]
+    assert 'idx_orders_supplier_id' in entry['plan'][0]
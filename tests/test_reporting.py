@@ -0,0 +1,38 @@
+import pytest
+from database import initialize_database, get_connection
+from orders import create_order, update_order, delete_order
+from reporting import iter_daily_sales, iter_supplier_revenue, rebuild_rollups, verify_rollups
+
+DB_FILE = ':memory:'
+
+@pytest.fixture
+def conn():
+    """Fixture to create a new database connection with two suppliers."""
+    conn = get_connection(DB_FILE)
+    initialize_database(conn)
+    conn.executemany("INSERT INTO suppliers (name) VALUES (?)", [("ABC Liquors",), ("XYZ Distributors",)])
+    conn.commit()
+    yield conn
+    conn.close()
+
+def test_rollups_follow_inserts_updates_and_deletes(conn):
+    create_order(conn, "XYZ Bar & Grill", "2024-06-15", 500.00, 1)
+    create_order(conn, "Otieno Pub", "2024-06-15", 200.00, 2)
+    create_order(conn, "Kamau Lounge", "2024-06-16", 100.00, 1)
+    assert list(iter_supplier_revenue(conn)) == [(1, "ABC Liquors", 2, 600.0), (2, "XYZ Distributors", 1, 200.0)]
+    conn.execute("UPDATE orders SET total_amount = 50, supplier_id = 2, order_date = '2024-06-17' WHERE id = 3")
+    delete_order(conn, 1)
+    update_order(conn, 2, "Completed")
+    assert list(iter_supplier_revenue(conn)) == [(2, "XYZ Distributors", 2, 250.0)]
+    assert list(iter_daily_sales(conn)) == [("2024-06-15", 1, 200.0), ("2024-06-17", 1, 50.0)]
+    assert list(iter_daily_sales(conn, start="2024-06-16")) == [("2024-06-17", 1, 50.0)]
+    assert verify_rollups(conn) == []
+
+def test_rebuild_repairs_drifted_rollups(conn):
+    create_order(conn, "XYZ Bar & Grill", "2024-06-15", 500.00, 1)
+    conn.execute("UPDATE supplier_revenue SET revenue = 1")
+    conn.execute("DELETE FROM daily_sales")
+    differences = verify_rollups(conn)
+    assert [(table, key) for table, key, _, _ in differences] == [("supplier_revenue", 1), ("daily_sales", "2024-06-15")]
+    rebuild_rollups(conn)
+    assert verify_rollups(conn) == []
@@ -0,0 +1,86 @@
+import pytest
+import migrations
+from database import initialize_database, get_connection
+from search import build_fuzzy_search, build_search, fts_query
+
+DB_FILE = ':memory:'
+
+@pytest.fixture
+def conn():
+    """Fixture to create a new database connection for each test."""
+    conn = get_connection(DB_FILE)
+    initialize_database(conn)
+    conn.execute("INSERT INTO suppliers (name, contact_name) VALUES ('ABC Liquors', 'John Doe')")
+    conn.executemany("INSERT INTO items (name, price, supplier_id) VALUES (?, 30.0, 1)",
+                     [("Jameson Irish Whiskey 750ml",), ("Jameson Irish Whiskey 1L",), ("Smirnoff Vodka 750ml",)])
+    conn.commit()
+    yield conn
+    conn.close()
+
+def search(conn, table, keyword):
+    query, params = build_search(conn, table, keyword)
+    return [row[1] for row in conn.execute(query, params)]
+
+def test_fts_query_prefixes_terms():
+    assert fts_query('jameson 750') == '"jameson"* "750"*'
+    assert fts_query('"; DROP') == '"DROP"*'
+    assert fts_query('%') == ''
+
+def test_multi_term_prefix_search(conn):
+    assert search(conn, 'items', 'jameson 750') == ["Jameson Irish Whiskey 750ml"]
+    assert search(conn, 'items', 'jam') == ["Jameson Irish Whiskey 750ml", "Jameson Irish Whiskey 1L"]
+    assert search(conn, 'suppliers', 'john') == ["ABC Liquors"]
+
+def test_index_follows_updates_and_deletes(conn):
+    conn.execute("UPDATE items SET name = 'Absolut Vodka 750ml' WHERE name LIKE 'Smirnoff%'")
+    conn.execute("DELETE FROM items WHERE name = 'Jameson Irish Whiskey 1L'")
+    assert search(conn, 'items', 'smirnoff') == []
+    assert search(conn, 'items', 'absolut') == ["Absolut Vodka 750ml"]
+    assert search(conn, 'items', 'jameson') == ["Jameson Irish Whiskey 750ml"]
+
+def test_falls_back_to_like_without_fts(conn):
+    conn.execute("DROP TABLE items_fts")
+    query, _ = build_search(conn, 'items', 'whisk')
+    assert 'LIKE' in query
+    assert search(conn, 'items', 'whisk') == ["Jameson Irish Whiskey 750ml", "Jameson Irish Whiskey 1L"]
+
+def test_indexes_are_built_once_fts_is_available(conn, monkeypatch):
+    # As migrated by a sqlite without FTS5
+    for table in migrations.SEARCH_COLUMNS:
+        conn.execute(f"DROP TABLE {table}_fts")
+        for action in ('insert', 'delete', 'update'):
+            conn.execute(f"DROP TRIGGER {table}_fts_{action}")
+    conn.commit()
+    monkeypatch.setattr(migrations, 'fts5_available', lambda conn: False)
+    initialize_database(conn)
+    assert 'LIKE' in build_search(conn, 'items', 'whisk')[0]
+    monkeypatch.undo()
+    initialize_database(conn)
+    assert 'MATCH' in build_search(conn, 'items', 'whisk')[0]
+    assert search(conn, 'items', 'jameson 750') == ["Jameson Irish Whiskey 750ml"]
+
+def fuzzy_search(conn, table, keyword):
+    query, params = build_fuzzy_search(conn, table, keyword, columns='id, name')
+    return [row[1] for row in conn.execute(query, params)]
+
+def test_fuzzy_search_matches_misspelt_names(conn):
+    assert fuzzy_search(conn, 'items', 'Jamieson 1L') == ["Jameson Irish Whiskey 1L", "Jameson Irish Whiskey 750ml"]
+    assert fuzzy_search(conn, 'items', 'smirnof') == ["Smirnoff Vodka 750ml"]
+    assert fuzzy_search(conn, 'suppliers', 'ABC Liquers') == ["ABC Liquors"]
+    assert fuzzy_search(conn, 'items', 'xyzzy') == []
+
+def test_trigram_index_follows_updates_and_deletes(conn):
+    conn.execute("UPDATE items SET name = 'Absolut Vodka 750ml' WHERE name LIKE 'Smirnoff%'")
+    conn.execute("DELETE FROM items WHERE name = 'Jameson Irish Whiskey 1L'")
+    assert fuzzy_search(conn, 'items', 'smirnof') == []
+    assert fuzzy_search(conn, 'items', 'absolute') == ["Absolut Vodka 750ml"]
+    assert fuzzy_search(conn, 'items', 'jamesen') == ["Jameson Irish Whiskey 750ml"]
+    postings = conn.execute("SELECT COUNT(DISTINCT row_id) FROM name_trigrams WHERE table_name = 'items'").fetchone()[0]
+    assert postings == 2
+
+def test_fuzzy_search_reads_only_the_hit_rows(conn):
+    query, params = build_fuzzy_search(conn, 'items', 'jamieson')
+    plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+    assert "SEARCH c USING PRIMARY KEY (table_name=? AND row_id=?)" in plan
+    assert "SEARCH name_trigrams USING PRIMARY KEY (table_name=? AND trigram=?)" in plan
+    assert not [step for step in plan if step.startswith(('SCAN c', 'SCAN name_trigram'))]
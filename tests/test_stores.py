@@ -0,0 +1,45 @@
+import pytest
+from database import initialize_database, get_connection
+from orders import create_order
+from stores import iter_store_daily_sales, iter_store_rows, iter_store_search, store_executor, store_supplier_revenue
+
+@pytest.fixture
+def stores(tmp_path):
+    """Fixture to create three store databases with overlapping suppliers and days."""
+    paths = []
+    for store in range(3):
+        path = str(tmp_path / f'store{store}.db')
+        initialize_database(path)
+        conn = get_connection(path)
+        conn.executemany("INSERT INTO suppliers (name) VALUES (?)", [("ABC Liquors",), (f"Local Supplier {store}",)])
+        for day in range(1, 6):
+            create_order(conn, f"Customer {store}-{day}", f"2024-06-{day:02d}", 100.0 * (store + 1), 1 + day % 2)
+        conn.close()
+        paths.append(path)
+    return paths
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_rows_merge_in_id_order_across_pages(stores, workers):
+    with store_executor(stores, workers) as executor:
+        rows = list(iter_store_rows(executor, stores, 'orders', page_size=4))
+        assert len(rows) == 15
+        assert [(row.id, store) for store, row in rows[:4]] == [(1, stores[0]), (1, stores[1]), (1, stores[2]),
+                                                                (2, stores[0])]
+        assert len(list(iter_store_rows(executor, stores, 'orders', limit=7, page_size=3))) == 7
+
+def test_search_covers_every_store(stores):
+    with store_executor(stores) as executor:
+        matches = list(iter_store_search(executor, stores, 'orders', 'customer', page_size=2))
+    assert sorted(row.customer_name for _, row in matches) == sorted(
+        f"Customer {store}-{day}" for store in range(3) for day in range(1, 6))
+
+def test_reports_sum_over_stores(stores):
+    with store_executor(stores, 2) as executor:
+        days = list(iter_store_daily_sales(executor, stores, "2024-06-02", "2024-06-04", page_size=2))
+        totals = store_supplier_revenue(executor, stores, page_size=2)
+        top = store_supplier_revenue(executor, stores, limit=1)
+    assert [(day.order_date, day.order_count, day.revenue) for day in days] == [
+        ("2024-06-02", 3, 600.0), ("2024-06-03", 3, 600.0), ("2024-06-04", 3, 600.0)]
+    assert totals[0] == ("ABC Liquors", 6, 1200.0)
+    assert [row.name for row in totals[1:]] == ["Local Supplier 2", "Local Supplier 1", "Local Supplier 0"]
+    assert top == totals[:1]